@@ -0,0 +1,5 @@
+"""Benchmarks for codiet_shared.
+
+Run the whole suite with `python -m benchmarks`, or a single module with
+`python -m benchmarks.<name>`.
+"""
@@ -0,0 +1,76 @@
+"""Run the benchmark suite and write the results as JSON.
+
+    python -m benchmarks --scale 10k --seed 1 --output results.json
+
+Results are grouped by benchmark module and carry enough metadata (package
+version, interpreter, platform, seed and scale) to compare runs.
+"""
+from __future__ import annotations
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Any, Callable
+import argparse
+import json
+import platform
+import sys
+
+from . import conformance, footprint, import_time, micro, replay
+from .catalog import SCALES, CatalogSpec
+
+_SUITES: dict[str, Callable[[CatalogSpec, int], Any]] = {
+    "micro": lambda spec, repeat: micro.run(spec, repeat=repeat),
+    "conformance": lambda spec, repeat: conformance.run(),
+    "import_time": lambda spec, repeat: import_time.run(repeat),
+    "replay": lambda spec, repeat: replay.run(spec),
+    "footprint": lambda spec, repeat: footprint.run(spec),
+}
+
+
+def get_metadata(spec: CatalogSpec, scale: str) -> dict[str, Any]:
+    try:
+        version = metadata.version("codiet-shared")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    return {
+        "package_version": version,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "scale": scale,
+        "seed": spec.seed,
+        "n_ingredients": spec.n_ingredients,
+        "n_recipes": spec.n_recipes,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--scale", choices=list(SCALES), default="1k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--only", action="append", choices=list(_SUITES), help="may be repeated"
+    )
+    parser.add_argument("--output", help="file to write; defaults to stdout")
+    args = parser.parse_args(argv)
+
+    spec = CatalogSpec.from_scale(args.scale, seed=args.seed)
+    report = {
+        "meta": get_metadata(spec, args.scale),
+        "results": {
+            name: suite(spec, args.repeat)
+            for name, suite in _SUITES.items()
+            if not args.only or name in args.only
+        },
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Seeded synthetic catalog generator.
+
+Produces DTOs shaped like a real catalog: a nutrient tree with aliases, a
+tag hierarchy, units and unit conversions, ingredients with nutrient
+ratios, flags and costs, and recipes (some nesting others). The same seed
+and scale always give the same catalog. Ingredients and recipes are
+generated lazily so million-entity catalogs can be streamed.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterator
+import random
+
+from codiet_shared.constants import GRAM_NAME
+from codiet_shared.dtos import (
+    IngredientDTO,
+    IngredientQuantityDTO,
+    NutrientDTO,
+    RecipeDTO,
+    TagDTO,
+    UnitConversionDTO,
+    UnitDTO,
+)
+
+SCALES = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+# Parent nutrients with calories per gram and their named children.
+_NUTRIENT_TREE = {
+    "carbohydrate": (4.0, ["sugar", "starch", "fibre"]),
+    "fat": (9.0, ["saturated_fat", "monounsaturated_fat", "polyunsaturated_fat"]),
+    "protein": (4.0, []),
+    "alcohol": (7.0, []),
+    "minerals": (0.0, ["sodium", "potassium", "calcium", "iron", "magnesium", "zinc"]),
+    "vitamins": (0.0, ["vitamin_a", "vitamin_b12", "vitamin_c", "vitamin_d"]),
+}
+_SUB_CHILDREN = {
+    "sugar": ["glucose", "fructose", "sucrose", "lactose"],
+    "polyunsaturated_fat": ["omega_3", "omega_6"],
+}
+_FLAGS = ["vegan", "vegetarian", "gluten_free", "dairy_free", "nut_free", "halal"]
+_MASS_UNITS = {GRAM_NAME: 1.0, "kilogram": 1000.0, "milligram": 0.001}
+_VOLUME_UNITS = {"millilitre": 1.0, "litre": 1000.0, "teaspoon": 5.0, "cup": 240.0}
+_COUNT_UNITS = ["piece", "slice", "clove"]
+_FOODS = [
+    "tomato", "onion", "lentil", "chickpea", "rice", "oat", "potato", "carrot",
+    "spinach", "apple", "banana", "chicken", "salmon", "tofu", "egg", "milk",
+    "yoghurt", "cheddar", "almond", "walnut", "flour", "butter", "olive oil",
+    "garlic", "pepper", "mushroom", "bean", "pea", "pasta", "bread",
+]
+_QUALIFIERS = [
+    "raw", "cooked", "tinned", "dried", "smoked", "organic", "red", "green",
+    "wholemeal", "low fat", "frozen", "roasted",
+]
+_TAG_ROOTS = ["meal", "cuisine", "diet", "course", "occasion"]
+
+
+@dataclass(frozen=True)
+class CatalogSpec:
+    n_ingredients: int
+    n_recipes: int
+    n_tags: int = 200
+    ingredients_per_recipe: int = 8
+    nested_recipe_share: float = 0.1
+    seed: int = 0
+
+    @classmethod
+    def from_scale(cls, scale: str | int, *, seed: int = 0) -> CatalogSpec:
+        """A catalog with `scale` ingredients and as many recipes."""
+        size = SCALES[scale] if isinstance(scale, str) else scale
+        return cls(n_ingredients=size, n_recipes=size, seed=seed)
+
+
+class CatalogGenerator:
+    def __init__(self, spec: CatalogSpec) -> None:
+        self.spec = spec
+        self._nutrient_names = [dto["name"] for dto in self.nutrients()]
+        self._tag_names = [dto["name"] for dto in self.tags()]
+
+    def _rng(self, stream: str) -> random.Random:
+        # An independent stream per section keeps each section reproducible
+        # whatever else is generated first.
+        return random.Random(f"{self.spec.seed}:{stream}")
+
+    def nutrients(self) -> list[NutrientDTO]:
+        rng = self._rng("nutrients")
+        dtos: list[NutrientDTO] = []
+
+        def add(name: str, parent: str | None, cals: float, category: str) -> None:
+            dtos.append(
+                {
+                    "uid": len(dtos) + 1,
+                    "name": name,
+                    "description": f"Synthetic nutrient {name}.",
+                    "category": category,
+                    "parent": parent,
+                    "calories_per_gram": cals,
+                    "aliases": [name.replace("_", " ")]
+                    + ([name[:4] + str(len(dtos))] if rng.random() < 0.3 else []),
+                }
+            )
+
+        for parent, (cals, children) in _NUTRIENT_TREE.items():
+            add(parent, None, cals, parent)
+            for child in children:
+                add(child, parent, cals, parent)
+                for grandchild in _SUB_CHILDREN.get(child, ()):
+                    add(grandchild, child, cals, parent)
+        return dtos
+
+    def tags(self) -> list[TagDTO]:
+        """A layered tag graph; each tag has one or two earlier parents."""
+        rng = self._rng("tags")
+        dtos: list[TagDTO] = [
+            {"uid": i + 1, "name": root, "parents": []}
+            for i, root in enumerate(_TAG_ROOTS)
+        ]
+        for i in range(len(dtos), self.spec.n_tags):
+            earlier = [dto["name"] for dto in dtos]
+            n_parents = 1 if rng.random() < 0.8 else 2
+            dtos.append(
+                {
+                    "uid": i + 1,
+                    "name": f"tag_{i:05d}",
+                    "parents": rng.sample(earlier, min(n_parents, len(earlier))),
+                }
+            )
+        return dtos
+
+    def units(self) -> list[UnitDTO]:
+        dtos: list[UnitDTO] = []
+        for names, unit_type in (
+            (list(_MASS_UNITS), "mass"),
+            (list(_VOLUME_UNITS), "volume"),
+            (_COUNT_UNITS, "count"),
+        ):
+            for name in names:
+                dtos.append(
+                    {
+                        "uid": len(dtos) + 1,
+                        "name": name,
+                        "unit_type": unit_type,
+                        "unit_system": "metric",
+                        "singular_abbreviation": name[:3],
+                        "plural_abbreviation": name[:3] + "s",
+                        "aliases": [name + "s"],
+                    }
+                )
+        return dtos
+
+    def unit_conversions(self) -> list[UnitConversionDTO]:
+        """Global conversions within the mass and volume systems."""
+        dtos: list[UnitConversionDTO] = []
+        for base, units in ((GRAM_NAME, _MASS_UNITS), ("millilitre", _VOLUME_UNITS)):
+            for name, size in units.items():
+                if name != base:
+                    dtos.append(
+                        {
+                            "uid": len(dtos) + 1,
+                            "from_unit_name": name,
+                            "from_unit_value": 1.0,
+                            "to_unit_name": base,
+                            "to_unit_value": size,
+                        }
+                    )
+        return dtos
+
+    def ingredient_name(self, index: int) -> str:
+        food = _FOODS[index % len(_FOODS)]
+        qualifier = _QUALIFIERS[(index // len(_FOODS)) % len(_QUALIFIERS)]
+        return f"{qualifier} {food} {index:07d}"
+
+    def recipe_name(self, index: int) -> str:
+        return f"recipe {index:07d}"
+
+    def iter_ingredients(self) -> Iterator[IngredientDTO]:
+        rng = self._rng("ingredients")
+        review_start = date(2020, 1, 1)
+        for i in range(self.spec.n_ingredients):
+            yield {
+                "uid": i + 1,
+                "name": self.ingredient_name(i),
+                "description": "Synthetic ingredient.",
+                "last_review_date": (
+                    review_start + timedelta(days=rng.randrange(1500))
+                ).isoformat(),
+                "standard_unit_name": GRAM_NAME,
+                "unit_conversions": self._ingredient_conversions(rng),
+                "cost_ratio": {
+                    "host_quantity_unit": GRAM_NAME,
+                    "host_quantity_value": 100.0,
+                    "cost": round(rng.uniform(0.05, 4.0), 2),
+                },
+                "gi": round(rng.uniform(10, 100)) if rng.random() < 0.6 else None,
+                "nutrient_flags": [
+                    {"flag_name": flag, "flag_value": rng.random() < 0.7}
+                    for flag in _FLAGS
+                    if rng.random() < 0.8
+                ],
+                "nutrient_ratios": [
+                    {
+                        "nutrient_name": name,
+                        "nutrient_mass_unit": GRAM_NAME,
+                        "nutrient_mass_value": round(rng.uniform(0.0, 30.0), 3),
+                        "host_quantity_unit": GRAM_NAME,
+                        "host_quantity_value": 100.0,
+                    }
+                    for name in rng.sample(self._nutrient_names, rng.randint(5, 20))
+                ],
+                "use_as_recipe": False,
+            }
+
+    def iter_recipes(self) -> Iterator[RecipeDTO]:
+        rng = self._rng("recipes")
+        spec = self.spec
+        for i in range(spec.n_recipes):
+            composition: list[IngredientQuantityDTO] = [
+                {
+                    "ingredient_name": self.ingredient_name(
+                        rng.randrange(spec.n_ingredients)
+                    ),
+                    "quantity_unit_name": GRAM_NAME,
+                    "quantity_value": round(rng.uniform(5.0, 250.0), 1),
+                }
+                for _ in range(spec.ingredients_per_recipe)
+            ]
+            # Only earlier recipes are nested, so the catalog stays acyclic.
+            if i and rng.random() < spec.nested_recipe_share:
+                composition.append(
+                    {
+                        "ingredient_name": self.recipe_name(rng.randrange(i)),
+                        "quantity_unit_name": GRAM_NAME,
+                        "quantity_value": round(rng.uniform(20.0, 200.0), 1),
+                    }
+                )
+            yield {
+                "uid": i + 1,
+                "name": self.recipe_name(i),
+                "use_as_ingredient": rng.random() < 0.2,
+                "description": "Synthetic recipe.",
+                "last_review_date": "2024-01-01",
+                "servings": rng.randint(1, 6),
+                "cooking_time": rng.randint(5, 180),
+                "instructions": ["Combine.", "Cook.", "Serve."],
+                "standard_unit_name": GRAM_NAME,
+                "preparation_ingredient_quantities": list(composition),
+                "composition_ingredient_quantities": composition,
+                "unit_conversions": [],
+                "tags": rng.sample(self._tag_names, rng.randint(1, 4)),
+            }
+
+    def _ingredient_conversions(self, rng: random.Random) -> list[UnitConversionDTO]:
+        conversions: list[UnitConversionDTO] = []
+        if rng.random() < 0.5:
+            conversions.append(
+                {
+                    "uid": None,
+                    "from_unit_name": "millilitre",
+                    "from_unit_value": 1.0,
+                    "to_unit_name": GRAM_NAME,
+                    "to_unit_value": round(rng.uniform(0.5, 1.5), 3),
+                }
+            )
+        if rng.random() < 0.4:
+            conversions.append(
+                {
+                    "uid": None,
+                    "from_unit_name": rng.choice(_COUNT_UNITS),
+                    "from_unit_value": 1.0,
+                    "to_unit_name": GRAM_NAME,
+                    "to_unit_value": round(rng.uniform(2.0, 300.0), 1),
+                }
+            )
+        return conversions
@@ -0,0 +1,90 @@
+"""Equality-heavy workloads with cached protocol conformance checks.
+
+Compares a plain structural `isinstance` against `conforms`, and times set
+building and dict lookups over protocol objects whose `__eq__` goes through
+either check. Run with `python -m benchmarks.conformance`.
+"""
+from __future__ import annotations
+from timeit import repeat as repeat_timeit, timeit
+
+from codiet_shared.constants import GRAM_NAME
+from codiet_shared.dtos.calories import CaloriesRatioDTO
+from codiet_shared.protocols import CaloriesRatio, Recipe, conforms
+
+
+class _CaloriesRatio:
+    def __init__(self, cals_per_gram: float) -> None:
+        self._cals_per_gram = cals_per_gram
+
+    @property
+    def cals_per_gram(self) -> float:
+        return self._cals_per_gram
+
+    def to_dto(self) -> CaloriesRatioDTO:
+        return {
+            "host_quantity": {"unit_name": GRAM_NAME, "value": 1.0},
+            "calories": self._cals_per_gram,
+        }
+
+    # Equality goes through the protocol implementation under test.
+    __hash__ = CaloriesRatio.__hash__
+    __eq__ = CaloriesRatio.__eq__
+
+
+class _IsinstanceCaloriesRatio(_CaloriesRatio):
+    """Baseline whose `__eq__` uses the uncached structural check."""
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CaloriesRatio):
+            return NotImplemented
+        return hash(self) == hash(other)
+
+    __hash__ = CaloriesRatio.__hash__
+
+
+def _make_wide_object() -> object:
+    """Return an object with every member of the `Recipe` protocol."""
+    members = {name: None for name in dir(Recipe) if not name.startswith("_")}
+    return type("_Recipe", (), members)()
+
+
+def run(repeat: int = 100_000, rounds: int = 10) -> dict[str, float]:
+    """Return seconds per operation (per element for the collections)."""
+    ratio = _CaloriesRatio(1.0)
+    recipe = _make_wide_object()
+    results = {
+        "isinstance_narrow": timeit(
+            lambda: isinstance(ratio, CaloriesRatio), number=repeat
+        ),
+        "conforms_narrow": timeit(lambda: conforms(ratio, CaloriesRatio), number=repeat),
+        "isinstance_wide": timeit(lambda: isinstance(recipe, Recipe), number=repeat),
+        "conforms_wide": timeit(lambda: conforms(recipe, Recipe), number=repeat),
+    }
+    for name in results:
+        results[name] /= repeat
+
+    for check, cls in (
+        ("isinstance", _IsinstanceCaloriesRatio),
+        ("conforms", _CaloriesRatio),
+    ):
+        # Many equal values force equality comparisons on every insert/lookup.
+        ratios = [cls(float(i % 100)) for i in range(10_000)]
+        lookup = {r: i for i, r in enumerate(ratios[:100])}
+        per_element = rounds * len(ratios)
+        # Best of five, as a single pass is easily skewed by noise.
+        results[f"set_build_{check}"] = min(
+            repeat_timeit(lambda: set(ratios), number=rounds, repeat=5)
+        ) / per_element
+        results[f"dict_lookup_{check}"] = min(
+            repeat_timeit(lambda: [lookup[r] for r in ratios], number=rounds, repeat=5)
+        ) / per_element
+    return results
+
+
+def main() -> None:
+    for name, seconds in run().items():
+        print(f"{name:>22}: {seconds * 1e9:10.1f} ns/op")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Memory footprint of a synthetic catalog, as DTOs and hydrated.
+
+Run with `python -m benchmarks.footprint [scale]`.
+"""
+from __future__ import annotations
+from time import perf_counter
+from typing import Any
+import json
+import sys
+
+from codiet_shared.footprint import measure_footprint
+
+from .catalog import CatalogGenerator, CatalogSpec
+from .models import Catalog
+
+
+def run(spec: CatalogSpec) -> dict[str, dict[str, Any]]:
+    """Return the footprint report of each form, with the time it took."""
+    generator = CatalogGenerator(spec)
+    ingredients = list(generator.iter_ingredients())
+    recipes = list(generator.iter_recipes())
+    catalog = Catalog()
+    for dto in generator.nutrients():
+        catalog.add_nutrient(dto)
+    for dto in ingredients:
+        catalog.add_ingredient(dto)
+    for dto in recipes:
+        catalog.add_recipe(dto)
+
+    results = {}
+    for name, roots in (
+        ("dtos", (ingredients, recipes)),
+        ("hydrated", (catalog.ingredients, catalog.recipes)),
+    ):
+        start = perf_counter()
+        report = measure_footprint(*roots).to_dict()
+        report["seconds"] = perf_counter() - start
+        results[name] = report
+    return results
+
+
+def main() -> None:
+    scale = sys.argv[1] if len(sys.argv) > 1 else "1k"
+    results = run(CatalogSpec.from_scale(scale))
+    sys.stdout.write(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Import cost of the codiet_shared subpackages.
+
+Each statement runs in a fresh interpreter, which reports how long it took
+and whether `pygraph` and `numpy` were loaded. Run with
+`python -m benchmarks.import_time`.
+"""
+from __future__ import annotations
+import json
+import subprocess
+import sys
+
+STATEMENTS = (
+    "import codiet_shared.dtos",
+    "from codiet_shared.dtos import is_recipe_dto",
+    "from codiet_shared.exceptions import RecipeNotFoundError",
+    "from codiet_shared.protocols import Quantity",
+    "from codiet_shared.protocols import Recipe",
+)
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "modules": len(sys.modules),
+    "pygraph": "pygraph" in sys.modules,
+    "numpy": "numpy" in sys.modules,
+}}))
+"""
+
+
+def measure(statement: str, repeat: int = 5) -> dict[str, float | int | bool]:
+    """Return the fastest of `repeat` fresh-interpreter runs of `statement`."""
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(statement=statement)],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        runs.append(json.loads(completed.stdout))
+    return min(runs, key=lambda run: run["seconds"])
+
+
+def run(repeat: int = 5) -> dict[str, dict[str, float | int | bool]]:
+    return {statement: measure(statement, repeat) for statement in STATEMENTS}
+
+
+def main() -> None:
+    for statement, result in run().items():
+        print(
+            f"{statement:<60} {result['seconds'] * 1e3:7.2f} ms  "
+            f"modules={result['modules']:<4} pygraph={result['pygraph']} "
+            f"numpy={result['numpy']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""Micro-benchmarks of the hot paths callers hit per entity.
+
+Times the DTO guards over a synthetic catalog, protocol `__hash__`/`__eq__`,
+`sig_fig_fmt`, `create_pseudo_uid` and exception message building. The
+protocol cases include ingredients and quantities hydrated from the
+generated DTOs, which hash nested mappings. Run with
+`python -m benchmarks.micro [scale]`.
+"""
+from __future__ import annotations
+import sys
+from itertools import islice
+from typing import Mapping
+
+from codiet_shared.dtos import (
+    IngredientDTO,
+    is_ingredient_dto,
+    is_nutrient_dto,
+    is_recipe_dto,
+    is_tag_dto,
+    is_unit_conversion_dto,
+    is_unit_dto,
+)
+from codiet_shared.dtos.cost import CostRatioDTO
+from codiet_shared.dtos.quantities import UnitConversionDTO
+from codiet_shared.exceptions import (
+    CircularRecipeError,
+    IngredientNotFoundError,
+    NegativeQuantityError,
+    NutrientAliasCollisionError,
+    NutrientAliasCollisionsError,
+    RecipeNotFoundError,
+    TagNotFoundError,
+    UndefinedUnitConversionError,
+    UnknownNutrientError,
+    UnknownUnitError,
+)
+from codiet_shared.protocols import (
+    CaloriesRatio,
+    CostRatio,
+    Ingredient,
+    IngredientQuantity,
+    Quantity,
+    RecipeQuantity,
+    UnitConversion,
+    implements,
+)
+from codiet_shared.utils import create_pseudo_uid, sig_fig_fmt
+
+from . import models
+from .catalog import CatalogGenerator, CatalogSpec
+from .timing import measure, measure_each, measure_stream
+
+
+class _CostRatio:
+    def __init__(self, cost_per_gram: float) -> None:
+        self._cost_per_gram = cost_per_gram
+
+    @property
+    def cost_per_gram(self) -> float:
+        return self._cost_per_gram
+
+    def to_dto(self) -> CostRatioDTO:
+        return {
+            "host_quantity_unit": "gram",
+            "host_quantity_value": 1.0,
+            "cost": self._cost_per_gram,
+        }
+
+    __hash__ = CostRatio.__hash__
+    __eq__ = CostRatio.__eq__
+
+
+class _UnitConversion:
+    def __init__(self, dto: UnitConversionDTO) -> None:
+        self._dto = dto
+        self._unit_names = frozenset((dto["from_unit_name"], dto["to_unit_name"]))
+
+    @property
+    def uid(self) -> int | None:
+        return self._dto["uid"]
+
+    @property
+    def name(self) -> frozenset[str]:
+        return self._unit_names
+
+    @property
+    def unit_names(self) -> frozenset[str]:
+        return self._unit_names
+
+    def get_ratio(self, *, from_unit_name: str, to_unit_name: str) -> float:
+        ratio = self._dto["to_unit_value"] / self._dto["from_unit_value"]
+        return ratio if from_unit_name == self._dto["from_unit_name"] else 1 / ratio
+
+    def to_dto(self) -> UnitConversionDTO:
+        return self._dto
+
+    canonical_unit_value_pairs = UnitConversion.canonical_unit_value_pairs
+    __hash__ = UnitConversion.__hash__
+    __eq__ = UnitConversion.__eq__
+
+
+class _CaloriesRatio(models.CaloriesRatio):
+    __slots__ = ()
+    __hash__ = CaloriesRatio.__hash__
+
+
+@implements(Ingredient)
+class _Ingredient(models.Ingredient):
+    """A hydrated ingredient hashed and compared by the protocol."""
+
+    def __init__(
+        self, dto: IngredientDTO, calories_per_gram: Mapping[str, float]
+    ) -> None:
+        super().__init__(dto, calories_per_gram)
+        self.unit_conversions = {
+            key: _UnitConversion(conversion)
+            for key, conversion in self.unit_conversions.items()
+        }
+        self.cost_ratio = _CostRatio(self.cost_ratio.cost_per_gram)
+        self.calories_ratio = _CaloriesRatio(self.calories_ratio.cals_per_gram)
+
+    __hash__ = Ingredient.__hash__
+    __eq__ = Ingredient.__eq__
+
+
+@implements(Quantity)
+class _Quantity:
+    __slots__ = ("unit", "value")
+
+    def __init__(self, unit: str, value: float) -> None:
+        self.unit = unit
+        self.value = value
+
+    __hash__ = Quantity.__hash__
+    __eq__ = Quantity.__eq__
+
+
+@implements(IngredientQuantity)
+class _IngredientQuantity:
+    def __init__(self, ingredient: _Ingredient, quantity: models.Quantity) -> None:
+        grams = quantity.mass_in_grams
+        self.ingredient = ingredient
+        self.quantity = _Quantity(quantity.unit_name, quantity.value)
+        self.nutrient_masses = {
+            name: ratio.nutrient_perc * grams
+            for name, ratio in ingredient.nutrient_ratios.items()
+        }
+        self.total_cost = ingredient.cost_ratio.cost_per_gram * grams
+
+    __hash__ = IngredientQuantity.__hash__
+    __eq__ = IngredientQuantity.__eq__
+
+
+@implements(RecipeQuantity)
+class _RecipeQuantity:
+    def __init__(self, recipe: models.Recipe, servings: float) -> None:
+        self.recipe = recipe
+        self.quantity = _Quantity("serving", servings)
+
+    __hash__ = RecipeQuantity.__hash__
+
+
+def _hydrate(
+    generator: CatalogGenerator, count: int
+) -> tuple[list[_Ingredient], list[_Ingredient], list[models.Recipe]]:
+    """Hydrate up to `count` ingredients (twice, as equal copies) and recipes."""
+    catalog = models.Catalog()
+    for dto in generator.nutrients():
+        catalog.add_nutrient(dto)
+    dtos = list(islice(generator.iter_ingredients(), count))
+    ingredients = [_Ingredient(dto, catalog.calories_per_gram) for dto in dtos]
+    copies = [_Ingredient(dto, catalog.calories_per_gram) for dto in dtos]
+    recipes = [
+        models.Recipe(dto, catalog) for dto in islice(generator.iter_recipes(), count)
+    ]
+    return ingredients, copies, recipes
+
+
+def bench_guards(
+    generator: CatalogGenerator, repeat: int
+) -> dict[str, dict[str, float | int]]:
+    sources = (
+        ("is_ingredient_dto", is_ingredient_dto, generator.iter_ingredients()),
+        ("is_recipe_dto", is_recipe_dto, generator.iter_recipes()),
+        ("is_nutrient_dto", is_nutrient_dto, generator.nutrients()),
+        ("is_tag_dto", is_tag_dto, generator.tags()),
+        ("is_unit_dto", is_unit_dto, generator.units()),
+        (
+            "is_unit_conversion_dto",
+            is_unit_conversion_dto,
+            generator.unit_conversions(),
+        ),
+    )
+    results = {}
+    for name, guard, dtos in sources:
+        results |= measure_stream({name: guard}, dtos, repeat=repeat)
+    # A structurally wrong DTO should be rejected cheaply.
+    results["is_recipe_dto_reject"] = measure(
+        lambda: is_recipe_dto({"name": "broken"}), number=100_000, repeat=repeat
+    )
+    return results
+
+
+def bench_protocols(
+    generator: CatalogGenerator, repeat: int
+) -> dict[str, dict[str, float | int]]:
+    costs = [_CostRatio(i / 1000) for i in range(1000)]
+    conversions = [_UnitConversion(dto) for dto in generator.unit_conversions()]
+    same, other = conversions[0], _UnitConversion(dict(conversions[0].to_dto()))
+    ingredients, copies, recipes = _hydrate(generator, 1000)
+    ingredient_pairs = list(zip(ingredients, copies))
+    quantities = [
+        _IngredientQuantity(ingredient, models.Quantity("gram", 10.0 + i))
+        for i, ingredient in enumerate(ingredients)
+    ]
+    quantity_pairs = list(
+        zip(
+            quantities,
+            (
+                _IngredientQuantity(copy, models.Quantity("gram", 10.0 + i))
+                for i, copy in enumerate(copies)
+            ),
+        )
+    )
+    recipe_quantities = [_RecipeQuantity(recipe, recipe.servings) for recipe in recipes]
+    return {
+        "cost_ratio_hash": measure_each(hash, costs, repeat=repeat),
+        "cost_ratio_eq": measure(
+            lambda: costs[0] == costs[1], number=100_000, repeat=repeat
+        ),
+        "cost_ratio_set": measure_each(set, [costs] * 100, repeat=repeat),
+        "unit_conversion_hash": measure_each(hash, conversions * 100, repeat=repeat),
+        "unit_conversion_eq": measure(
+            lambda: same == other, number=100_000, repeat=repeat
+        ),
+        "ingredient_hash": measure_each(hash, ingredients, repeat=repeat),
+        "ingredient_eq": measure_each(_are_equal, ingredient_pairs, repeat=repeat),
+        "ingredient_quantity_hash": measure_each(hash, quantities, repeat=repeat),
+        "ingredient_quantity_eq": measure_each(
+            _are_equal, quantity_pairs, repeat=repeat
+        ),
+        "recipe_quantity_hash": measure_each(hash, recipe_quantities, repeat=repeat),
+    }
+
+
+def _are_equal(pair: tuple[object, object]) -> bool:
+    return pair[0] == pair[1]
+
+
+def bench_utils(
+    generator: CatalogGenerator, repeat: int
+) -> dict[str, dict[str, float | int]]:
+    names = [generator.ingredient_name(i) for i in range(10_000)]
+    values = [i * 1.2345678 for i in range(10_000)]
+    return {
+        "sig_fig_fmt": measure_each(sig_fig_fmt, values, repeat=repeat),
+        "create_pseudo_uid": measure_each(create_pseudo_uid, names, repeat=repeat),
+    }
+
+
+def bench_exceptions(
+    generator: CatalogGenerator, repeat: int
+) -> dict[str, dict[str, float | int]]:
+    names = [generator.ingredient_name(i) for i in range(5)]
+    errors = {
+        "UnknownUnitError": UnknownUnitError("furlong"),
+        "NegativeQuantityError": NegativeQuantityError(-1.0),
+        "UndefinedUnitConversionError": UndefinedUnitConversionError(
+            frozenset(("cup", "gram"))
+        ),
+        "UnknownNutrientError": UnknownNutrientError(
+            "protien", suggestions=["protein"]
+        ),
+        "NutrientAliasCollisionsError": NutrientAliasCollisionsError(
+            [
+                NutrientAliasCollisionError(
+                    f"alias {i}", nutrient_names=["fat", "sugar"]
+                )
+                for i in range(10)
+            ]
+        ),
+        "IngredientNotFoundError": IngredientNotFoundError(
+            names[0], suggestions=names[1:]
+        ),
+        "RecipeNotFoundError": RecipeNotFoundError(
+            generator.recipe_name(0), suggestions=[generator.recipe_name(1)]
+        ),
+        "TagNotFoundError": TagNotFoundError("tag_x", suggestions=["tag_00001"]),
+        "CircularRecipeError": CircularRecipeError(
+            recipe_names=[generator.recipe_name(i) for i in (0, 1, 2, 0)]
+        ),
+    }
+    return {
+        name: measure(lambda error=error: error.message, number=10_000, repeat=repeat)
+        for name, error in errors.items()
+    }
+
+
+def run(
+    spec: CatalogSpec, *, repeat: int = 5
+) -> dict[str, dict[str, dict[str, float | int]]]:
+    generator = CatalogGenerator(spec)
+    return {
+        "guards": bench_guards(generator, repeat),
+        "protocols": bench_protocols(generator, repeat),
+        "utils": bench_utils(generator, repeat),
+        "exceptions": bench_exceptions(generator, repeat),
+    }
+
+
+def main() -> None:
+    scale = sys.argv[1] if len(sys.argv) > 1 else "1k"
+    for group, results in run(CatalogSpec.from_scale(scale)).items():
+        sys.stdout.write(f"{group}\n")
+        for name, result in results.items():
+            sys.stdout.write(f"  {name:>30}: {result['best_ns']:10.1f} ns/op\n")
+
+
+if __name__ == "__main__":
+    main()
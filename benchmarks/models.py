@@ -0,0 +1,337 @@
+"""Minimal in-memory implementations of the shared protocols.
+
+Just enough of `Ingredient`, `IngredientQuantity` and `Recipe` for the
+engines to run on a hydrated catalog, built from (and exported back to)
+DTOs. Quantity units are resolved through the mass units only; anything
+else counts as grams.
+"""
+from __future__ import annotations
+from typing import Mapping
+
+from codiet_shared.constants import DEFAULT_MASS_UNITS, GRAM_NAME
+from codiet_shared.dtos import (
+    IngredientDTO,
+    IngredientQuantityDTO,
+    NutrientDTO,
+    RecipeDTO,
+)
+
+
+def _to_grams(unit_name: str, value: float) -> float:
+    return value * DEFAULT_MASS_UNITS.get(unit_name, 1.0)
+
+
+class Quantity:
+    __slots__ = ("unit_name", "value", "mass_in_grams")
+
+    def __init__(self, unit_name: str, value: float) -> None:
+        self.unit_name = unit_name
+        self.value = value
+        self.mass_in_grams = _to_grams(unit_name, value)
+
+
+class NutrientRatio:
+    __slots__ = ("nutrient_name", "nutrient_perc")
+
+    def __init__(self, nutrient_name: str, nutrient_perc: float) -> None:
+        self.nutrient_name = nutrient_name
+        self.nutrient_perc = nutrient_perc
+
+    def __hash__(self) -> int:
+        return hash((self.nutrient_name, self.nutrient_perc))
+
+
+class NutrientFlag:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name: str, value: bool) -> None:
+        self.name = name
+        self.value = value
+
+    def __hash__(self) -> int:
+        return hash((self.name, self.value))
+
+
+class CostRatio:
+    __slots__ = ("cost_per_gram",)
+
+    def __init__(self, cost_per_gram: float) -> None:
+        self.cost_per_gram = cost_per_gram
+
+
+class CaloriesRatio:
+    __slots__ = ("cals_per_gram",)
+
+    def __init__(self, cals_per_gram: float) -> None:
+        self.cals_per_gram = cals_per_gram
+
+
+class Ingredient:
+    use_as_recipe = False
+
+    def __init__(
+        self, dto: IngredientDTO, calories_per_gram: Mapping[str, float]
+    ) -> None:
+        self.uid = dto["uid"]
+        self.name = dto["name"]
+        self.description = dto["description"]
+        self.last_review_date = dto["last_review_date"]
+        self.standard_unit_name = dto["standard_unit_name"]
+        self.gi = dto["gi"]
+        self.unit_conversions = {
+            frozenset((c["from_unit_name"], c["to_unit_name"])): dict(c)
+            for c in dto["unit_conversions"]
+        }
+        self.nutrient_ratios = {
+            r["nutrient_name"]: NutrientRatio(
+                r["nutrient_name"],
+                _to_grams(r["nutrient_mass_unit"], r["nutrient_mass_value"])
+                / _to_grams(r["host_quantity_unit"], r["host_quantity_value"]),
+            )
+            for r in dto["nutrient_ratios"]
+        }
+        self.nutrient_flags = {
+            f["flag_name"]: NutrientFlag(f["flag_name"], f["flag_value"])
+            for f in dto["nutrient_flags"]
+        }
+        cost = dto["cost_ratio"]
+        self.cost_ratio = CostRatio(
+            cost["cost"]
+            / _to_grams(cost["host_quantity_unit"], cost["host_quantity_value"])
+        )
+        # Calories come from the nutrients that carry energy.
+        self.calories_ratio = CaloriesRatio(
+            sum(
+                ratio.nutrient_perc * calories_per_gram.get(name, 0.0)
+                for name, ratio in self.nutrient_ratios.items()
+            )
+        )
+
+    def to_dto(self) -> IngredientDTO:
+        return {
+            "uid": self.uid,
+            "name": self.name,
+            "description": self.description,
+            "last_review_date": self.last_review_date,
+            "standard_unit_name": self.standard_unit_name,
+            "unit_conversions": [dict(c) for c in self.unit_conversions.values()],
+            "cost_ratio": {
+                "host_quantity_unit": GRAM_NAME,
+                "host_quantity_value": 1.0,
+                "cost": self.cost_ratio.cost_per_gram,
+            },
+            "gi": self.gi,
+            "nutrient_flags": [
+                {"flag_name": flag.name, "flag_value": flag.value}
+                for flag in self.nutrient_flags.values()
+            ],
+            "nutrient_ratios": [
+                {
+                    "nutrient_name": name,
+                    "nutrient_mass_unit": GRAM_NAME,
+                    "nutrient_mass_value": ratio.nutrient_perc,
+                    "host_quantity_unit": GRAM_NAME,
+                    "host_quantity_value": 1.0,
+                }
+                for name, ratio in self.nutrient_ratios.items()
+            ],
+            "calories_ratio": {
+                "host_quantity": {"unit_name": GRAM_NAME, "value": 1.0},
+                "calories": self.calories_ratio.cals_per_gram,
+            },
+            "use_as_recipe": False,
+        }
+
+    def __hash__(self) -> int:
+        return hash(
+            (
+                self.name,
+                self.gi,
+                frozenset(map(hash, self.nutrient_ratios.values())),
+                frozenset(map(hash, self.nutrient_flags.values())),
+                self.cost_ratio.cost_per_gram,
+            )
+        )
+
+
+class RecipeIngredient:
+    """A recipe used as an ingredient of another recipe."""
+
+    __slots__ = ("name",)
+    use_as_recipe = True
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class IngredientQuantity:
+    """Resolves its ingredient through the catalog, so edits are seen."""
+
+    __slots__ = ("_catalog", "ingredient_name", "quantity")
+
+    def __init__(self, catalog: Catalog, ingredient_name: str, quantity: Quantity):
+        self._catalog = catalog
+        self.ingredient_name = ingredient_name
+        self.quantity = quantity
+
+    @property
+    def ingredient(self) -> Ingredient | RecipeIngredient:
+        return self._catalog.get_ingredient(self.ingredient_name)
+
+    def to_dto(self) -> IngredientQuantityDTO:
+        return {
+            "ingredient_name": self.ingredient_name,
+            "quantity_unit_name": self.quantity.unit_name,
+            "quantity_value": self.quantity.value,
+        }
+
+
+class Recipe:
+    """A recipe and, once computed, its per-gram profile."""
+
+    def __init__(self, dto: RecipeDTO, catalog: Catalog) -> None:
+        self._dto = dto
+        self.uid = dto["uid"]
+        self.name = dto["name"]
+        self.use_as_ingredient = dto["use_as_ingredient"]
+        self.servings = dto["servings"]
+        self.tags = list(dto["tags"])
+        self.composition_ingredient_quantities = _hydrate_quantities(
+            catalog, dto["composition_ingredient_quantities"]
+        )
+        self.preparation_ingredient_quantities = _hydrate_quantities(
+            catalog, dto["preparation_ingredient_quantities"]
+        )
+        self.nutrient_g_per_g: dict[str, float] = {}
+        self.cost_per_gram: float | None = None
+        self.cals_per_gram: float | None = None
+        self.nutrient_flags: dict[str, NutrientFlag] = {}
+
+    def to_dto(self) -> RecipeDTO:
+        dto: RecipeDTO = {
+            "uid": self.uid,
+            "name": self.name,
+            "use_as_ingredient": self.use_as_ingredient,
+            "description": self._dto["description"],
+            "last_review_date": self._dto["last_review_date"],
+            "servings": self.servings,
+            "cooking_time": self._dto["cooking_time"],
+            "instructions": list(self._dto["instructions"]),
+            "standard_unit_name": self._dto["standard_unit_name"],
+            "preparation_ingredient_quantities": [
+                iq.to_dto() for iq in self.preparation_ingredient_quantities.values()
+            ],
+            "composition_ingredient_quantities": [
+                iq.to_dto() for iq in self.composition_ingredient_quantities.values()
+            ],
+            "unit_conversions": [dict(c) for c in self._dto["unit_conversions"]],
+            "tags": list(self.tags),
+        }
+        if self.cost_per_gram is not None:
+            dto["cost_ratio"] = {
+                "host_quantity_unit": GRAM_NAME,
+                "host_quantity_value": 1.0,
+                "cost": self.cost_per_gram,
+            }
+        if self.cals_per_gram is not None:
+            dto["calories_ratio"] = {
+                "host_quantity": {"unit_name": GRAM_NAME, "value": 1.0},
+                "calories": self.cals_per_gram,
+            }
+        if self.nutrient_flags:
+            dto["nutrient_flags"] = [
+                {"flag_name": flag.name, "flag_value": flag.value}
+                for flag in self.nutrient_flags.values()
+            ]
+        if self.nutrient_g_per_g:
+            dto["nutrient_ratios"] = [
+                {
+                    "nutrient_name": name,
+                    "nutrient_mass_unit": GRAM_NAME,
+                    "nutrient_mass_value": g_per_g,
+                    "host_quantity_unit": GRAM_NAME,
+                    "host_quantity_value": 1.0,
+                }
+                for name, g_per_g in self.nutrient_g_per_g.items()
+            ]
+        return dto
+
+
+class Catalog:
+    """Hydrated nutrients, ingredients and recipes, keyed by name.
+
+    `users` maps each ingredient or recipe name to the recipes listing it in
+    their composition.
+    """
+
+    def __init__(self) -> None:
+        self.calories_per_gram: dict[str, float] = {}
+        self.ingredients: dict[str, Ingredient] = {}
+        self.recipes: dict[str, Recipe] = {}
+        self.users: dict[str, set[str]] = {}
+        self._recipe_ingredients: dict[str, RecipeIngredient] = {}
+
+    def add_nutrient(self, dto: NutrientDTO) -> None:
+        # Only top-level nutrients count, so energy is not counted twice.
+        if dto["parent"] is None:
+            self.calories_per_gram[dto["name"]] = dto["calories_per_gram"]
+
+    def add_ingredient(self, dto: IngredientDTO) -> Ingredient:
+        ingredient = Ingredient(dto, self.calories_per_gram)
+        self.ingredients[ingredient.name] = ingredient
+        return ingredient
+
+    def add_recipe(self, dto: RecipeDTO) -> Recipe:
+        previous = self.recipes.get(dto["name"])
+        if previous is not None:
+            for name in previous.composition_ingredient_quantities:
+                self.users[name].discard(previous.name)
+        recipe = Recipe(dto, self)
+        self.recipes[recipe.name] = recipe
+        for name in recipe.composition_ingredient_quantities:
+            self.users.setdefault(name, set()).add(recipe.name)
+        return recipe
+
+    def get_ingredient(self, name: str) -> Ingredient | RecipeIngredient:
+        ingredient = self.ingredients.get(name)
+        if ingredient is not None:
+            return ingredient
+        stub = self._recipe_ingredients.get(name)
+        if stub is None:
+            stub = self._recipe_ingredients[name] = RecipeIngredient(name)
+        return stub
+
+    def get_dependent_recipes(self, name: str) -> list[str]:
+        """Return every recipe using `name`, directly or through sub-recipes."""
+        seen: set[str] = set()
+        pending = [name]
+        while pending:
+            for user in self.users.get(pending.pop(), ()):
+                if user not in seen:
+                    seen.add(user)
+                    pending.append(user)
+        return list(seen)
+
+
+def _hydrate_quantities(
+    catalog: Catalog, dtos: list[IngredientQuantityDTO]
+) -> dict[str, IngredientQuantity]:
+    """Key quantities by ingredient, merging repeated lines of one ingredient.
+
+    Lines in one unit are summed in it; lines in different units are summed
+    in grams.
+    """
+    quantities: dict[str, IngredientQuantity] = {}
+    for dto in dtos:
+        name = dto["ingredient_name"]
+        quantity = Quantity(dto["quantity_unit_name"], dto["quantity_value"])
+        previous = quantities.get(name)
+        if previous is not None:
+            if previous.quantity.unit_name == quantity.unit_name:
+                value = previous.quantity.value + quantity.value
+                quantity = Quantity(quantity.unit_name, value)
+            else:
+                grams = previous.quantity.mass_in_grams + quantity.mass_in_grams
+                quantity = Quantity(GRAM_NAME, grams)
+        quantities[name] = IngredientQuantity(catalog, name, quantity)
+    return quantities
@@ -0,0 +1,391 @@
+"""End-to-end replay of catalog workloads.
+
+A workload is a sequence of JSON records, one per line:
+
+    {"op": "import", "nutrients": [...], "ingredients": [...], "recipes": [...]}
+    {"op": "edit_ingredient", "ingredients": [...]}
+    {"op": "menu", "recipes": [RecipeQuantityDTO, ...]}
+
+Every record passes through the same stages as in production: ingest (JSON
+decoding), validate (DTO guards), hydrate (protocol implementations),
+compute (recipe nutrients, cost, calories and flags through
+`RecipeFlattener`) and export (`to_dto`). Throughput, p50/p99 latency and
+peak traced memory are reported per operation and stage. Workloads are
+either synthetic, derived from a seeded catalog, or recorded to a file and
+replayed later:
+
+    python -m benchmarks.replay --scale 10k --record workload.jsonl
+    python -m benchmarks.replay --replay workload.jsonl
+"""
+from __future__ import annotations
+from time import perf_counter_ns
+from typing import Any, Callable, Iterable, Iterator
+import argparse
+import json
+import random
+import sys
+import tracemalloc
+
+import numpy as np
+
+from codiet_shared.constants import GRAM_NAME
+from codiet_shared.dtos import (
+    is_ingredient_dto,
+    is_nutrient_dto,
+    is_recipe_dto,
+    is_recipe_quantity_dto,
+)
+from codiet_shared.engines.flattening import RecipeFlattener
+from codiet_shared.exceptions import InvalidDTOError, RecipeNotFoundError
+from codiet_shared.indexes.names import get_or_raise
+
+from .catalog import SCALES, CatalogGenerator, CatalogSpec
+from .models import Catalog, NutrientFlag, Quantity
+from .timing import chunks
+
+STAGES = ("ingest", "validate", "hydrate", "compute", "export")
+
+_GUARDS = {
+    "nutrients": is_nutrient_dto,
+    "ingredients": is_ingredient_dto,
+    "recipes": is_recipe_dto,
+}
+
+
+def synthetic_workload(
+    spec: CatalogSpec,
+    *,
+    batch_size: int = 1000,
+    n_edits: int = 100,
+    n_menus: int = 100,
+    menu_size: int = 21,
+) -> Iterator[dict[str, Any]]:
+    """Bulk-import a seeded catalog, then interleave edits and menus."""
+    generator = CatalogGenerator(spec)
+    rng = random.Random(f"{spec.seed}:workload")
+    edit_rows = set(
+        rng.sample(range(spec.n_ingredients), min(n_edits, spec.n_ingredients))
+    )
+    edited = []
+
+    yield {"op": "import", "nutrients": generator.nutrients()}
+    row = 0
+    for chunk in chunks(generator.iter_ingredients(), batch_size):
+        for dto in chunk:
+            if row in edit_rows:
+                edited.append(dto)
+            row += 1
+        yield {"op": "import", "ingredients": chunk}
+    for chunk in chunks(generator.iter_recipes(), batch_size):
+        yield {"op": "import", "recipes": chunk}
+
+    rng.shuffle(edited)
+    for i in range(max(len(edited), n_menus)):
+        if i < len(edited):
+            yield {"op": "edit_ingredient", "ingredients": [_perturb(edited[i], rng)]}
+        if i < n_menus:
+            yield {
+                "op": "menu",
+                "recipes": [
+                    {
+                        "recipe_name": generator.recipe_name(
+                            rng.randrange(spec.n_recipes)
+                        ),
+                        "quantity_unit_name": GRAM_NAME,
+                        "quantity_value": round(rng.uniform(100.0, 600.0), 1),
+                    }
+                    for _ in range(menu_size)
+                ],
+            }
+
+
+def _perturb(dto: dict[str, Any], rng: random.Random) -> dict[str, Any]:
+    """Return a copy of an ingredient DTO with a new cost and one ratio changed."""
+    dto = json.loads(json.dumps(dto))
+    dto["cost_ratio"]["cost"] = round(dto["cost_ratio"]["cost"] * 1.1, 2)
+    ratio = rng.choice(dto["nutrient_ratios"])
+    ratio["nutrient_mass_value"] = round(ratio["nutrient_mass_value"] * 0.9, 3)
+    return dto
+
+
+def write_workload(records: Iterable[dict[str, Any]], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        for record in records:
+            file.write(json.dumps(record) + "\n")
+
+
+def read_workload(path: str) -> Iterator[str]:
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield line
+
+
+class StageStats:
+    def __init__(self) -> None:
+        self.latencies_ns: list[int] = []
+        self.items = 0
+        self.peak_bytes = 0
+
+    def add(self, elapsed_ns: int, items: int, peak_bytes: int) -> None:
+        self.latencies_ns.append(elapsed_ns)
+        self.items += items
+        self.peak_bytes = max(self.peak_bytes, peak_bytes)
+
+    def summarise(self) -> dict[str, float | int]:
+        latencies = np.asarray(self.latencies_ns, dtype=np.float64)
+        total_s = float(latencies.sum()) / 1e9
+        p50, p99 = np.percentile(latencies, [50, 99]) / 1e6
+        return {
+            "ops": len(latencies),
+            "items": self.items,
+            "total_s": total_s,
+            "items_per_s": self.items / total_s if total_s else 0.0,
+            "p50_ms": float(p50),
+            "p99_ms": float(p99),
+            "peak_bytes": self.peak_bytes,
+        }
+
+
+class WorkloadReplayer:
+    """Applies workload records to a hydrated catalog, timing every stage.
+
+    With `trace_memory` each stage also records the peak memory it
+    allocated, through `tracemalloc`, which slows everything down; compare
+    timings only between runs with the same setting.
+    """
+
+    def __init__(self, *, trace_memory: bool = True) -> None:
+        self.catalog = Catalog()
+        self.flattener = RecipeFlattener(self.catalog.recipes)
+        self._trace_memory = trace_memory
+        self._stats: dict[str, dict[str, StageStats]] = {}
+        self._handlers: dict[str, Callable[[str, dict[str, Any]], None]] = {
+            "import": self._apply_import,
+            "edit_ingredient": self._apply_import,
+            "menu": self._apply_menu,
+        }
+
+    def replay(self, lines: Iterable[str]) -> dict[str, dict[str, dict[str, Any]]]:
+        started = self._trace_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            for line in lines:
+                self.apply(line)
+        finally:
+            if started:
+                tracemalloc.stop()
+        return self.summarise()
+
+    def apply(self, line: str) -> None:
+        record, elapsed, peak = self._timed(json.loads, line)
+        op = record.get("op")
+        handler = self._handlers.get(op)
+        if handler is None:
+            raise ValueError(f"Unknown workload operation {op!r}.")
+        self._get_stats(op, "ingest").add(elapsed, 1, peak)
+        handler(op, record)
+
+    def summarise(self) -> dict[str, dict[str, dict[str, Any]]]:
+        return {
+            op: {
+                stage: stages[stage].summarise() for stage in STAGES if stage in stages
+            }
+            for op, stages in self._stats.items()
+        }
+
+    def _apply_import(self, op: str, record: dict[str, Any]) -> None:
+        nutrients = record.get("nutrients", [])
+        ingredients = record.get("ingredients", [])
+        recipes = record.get("recipes", [])
+        n_items = len(nutrients) + len(ingredients) + len(recipes)
+
+        def validate() -> None:
+            for key, guard in _GUARDS.items():
+                for dto in record.get(key, ()):
+                    if not guard(dto):
+                        raise InvalidDTOError(dto)
+
+        def hydrate() -> tuple[list[Any], list[Any]]:
+            for dto in nutrients:
+                self.catalog.add_nutrient(dto)
+            return (
+                [self.catalog.add_ingredient(dto) for dto in ingredients],
+                [self.catalog.add_recipe(dto) for dto in recipes],
+            )
+
+        self._stage(op, "validate", n_items, validate)
+        hydrated_ingredients, hydrated_recipes = self._stage(
+            op, "hydrate", n_items, hydrate
+        )
+        changed = {r.name for r in hydrated_recipes}
+        for name in [i.name for i in hydrated_ingredients] + list(changed):
+            changed.update(self.catalog.get_dependent_recipes(name))
+        self._stage(op, "compute", len(changed), self._refresh, changed)
+        self._stage(
+            op,
+            "export",
+            len(hydrated_ingredients) + len(hydrated_recipes),
+            lambda: [x.to_dto() for x in hydrated_ingredients + hydrated_recipes],
+        )
+
+    def _apply_menu(self, op: str, record: dict[str, Any]) -> None:
+        lines = record["recipes"]
+
+        def validate() -> None:
+            for dto in lines:
+                if not is_recipe_quantity_dto(dto):
+                    raise InvalidDTOError(dto)
+                get_or_raise(
+                    self.catalog.recipes, dto["recipe_name"], RecipeNotFoundError
+                )
+
+        def hydrate() -> tuple[list[str], list[float]]:
+            quantities = [
+                Quantity(dto["quantity_unit_name"], dto["quantity_value"])
+                for dto in lines
+            ]
+            return [dto["recipe_name"] for dto in lines], [
+                q.mass_in_grams for q in quantities
+            ]
+
+        def export() -> list[dict[str, Any]]:
+            exported = []
+            for row, name in enumerate(batch.recipe_names):
+                dto: dict[str, Any] = dict(self.catalog.recipes[name].to_dto())
+                dto["quantity"] = {
+                    "unit_name": GRAM_NAME,
+                    "value": float(batch.mass_in_grams[row]),
+                }
+                dto["nutrient_masses"] = [
+                    {
+                        "nutrient_name": nutrient_name,
+                        "quantity": {"unit_name": GRAM_NAME, "value": float(value)},
+                    }
+                    for nutrient_name, value in zip(
+                        batch.nutrient_names, batch.nutrient_masses[row]
+                    )
+                    if value
+                ]
+                exported.append(dto)
+            return exported
+
+        self._stage(op, "validate", len(lines), validate)
+        names, grams = self._stage(op, "hydrate", len(lines), hydrate)
+        batch = self._stage(
+            op,
+            "compute",
+            len(lines),
+            lambda: self.flattener.scale_many(names, masses_in_grams=grams),
+        )
+        self._stage(op, "export", len(lines), export)
+
+    def _refresh(self, recipe_names: Iterable[str]) -> None:
+        """Recompute and store the profile and flags of each recipe."""
+        recipe_names = list(recipe_names)
+        for name in recipe_names:
+            self.flattener.invalidate(name)
+        for name in recipe_names:
+            recipe = self.catalog.recipes[name]
+            profile = self.flattener.get_profile(name)
+            recipe.nutrient_g_per_g = dict(profile.nutrient_g_per_g)
+            recipe.cost_per_gram = profile.cost_per_gram
+            recipe.cals_per_gram = profile.cals_per_gram
+            recipe.nutrient_flags = self._get_flags(profile.base_ingredient_g_per_g)
+
+    def _get_flags(self, ingredient_names: Iterable[str]) -> dict[str, NutrientFlag]:
+        # True only if every ingredient is known true, false as soon as any
+        # is known false, as in `recompute_recipes`.
+        true_counts: dict[str, int] = {}
+        false_flags: set[str] = set()
+        n_ingredients = 0
+        for name in ingredient_names:
+            n_ingredients += 1
+            for flag in self.catalog.ingredients[name].nutrient_flags.values():
+                if flag.value:
+                    true_counts[flag.name] = true_counts.get(flag.name, 0) + 1
+                else:
+                    false_flags.add(flag.name)
+        flags = {name: NutrientFlag(name, False) for name in false_flags}
+        for name, count in true_counts.items():
+            if count == n_ingredients and name not in false_flags:
+                flags[name] = NutrientFlag(name, True)
+        return flags
+
+    def _stage(
+        self, op: str, stage: str, items: int, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        result, elapsed, peak = self._timed(func, *args)
+        self._get_stats(op, stage).add(elapsed, items, peak)
+        return result
+
+    def _timed(self, func: Callable[..., Any], *args: Any) -> tuple[Any, int, int]:
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = perf_counter_ns()
+        result = func(*args)
+        elapsed = perf_counter_ns() - start
+        peak = tracemalloc.get_traced_memory()[1] - baseline if tracing else 0
+        return result, elapsed, peak
+
+    def _get_stats(self, op: str, stage: str) -> StageStats:
+        stages = self._stats.setdefault(op, {})
+        stats = stages.get(stage)
+        if stats is None:
+            stats = stages[stage] = StageStats()
+        return stats
+
+
+def run(
+    spec: CatalogSpec,
+    *,
+    batch_size: int = 1000,
+    n_edits: int = 100,
+    n_menus: int = 100,
+    trace_memory: bool = True,
+) -> dict[str, dict[str, dict[str, Any]]]:
+    """Replay a synthetic workload for `spec`."""
+    records = synthetic_workload(
+        spec, batch_size=batch_size, n_edits=n_edits, n_menus=n_menus
+    )
+    replayer = WorkloadReplayer(trace_memory=trace_memory)
+    return replayer.replay(json.dumps(record) for record in records)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.replay")
+    parser.add_argument("--scale", choices=list(SCALES), default="1k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--edits", type=int, default=100)
+    parser.add_argument("--menus", type=int, default=100)
+    parser.add_argument("--menu-size", type=int, default=21)
+    parser.add_argument("--record", help="write the synthetic workload here and exit")
+    parser.add_argument("--replay", help="replay a recorded workload file")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        lines: Iterable[str] = read_workload(args.replay)
+    else:
+        records = synthetic_workload(
+            CatalogSpec.from_scale(args.scale, seed=args.seed),
+            batch_size=args.batch_size,
+            n_edits=args.edits,
+            n_menus=args.menus,
+            menu_size=args.menu_size,
+        )
+        if args.record:
+            write_workload(records, args.record)
+            return
+        lines = (json.dumps(record) for record in records)
+
+    results = WorkloadReplayer(trace_memory=not args.no_memory).replay(lines)
+    sys.stdout.write(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Small timing helpers shared by the benchmarks."""
+from __future__ import annotations
+from itertools import islice
+from statistics import median
+from time import perf_counter_ns
+from typing import Any, Callable, Iterable, Iterator
+
+_CHUNK_SIZE = 10_000
+
+
+def measure(
+    func: Callable[[], Any], *, number: int, repeat: int = 5
+) -> dict[str, float | int]:
+    """Time `repeat` batches of `number` calls; report nanoseconds per call."""
+    per_call = []
+    for _ in range(repeat):
+        start = perf_counter_ns()
+        for _ in range(number):
+            func()
+        per_call.append((perf_counter_ns() - start) / number)
+    return {
+        "best_ns": min(per_call),
+        "median_ns": median(per_call),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def measure_each(
+    func: Callable[[Any], Any], items: Iterable[Any], *, repeat: int = 5
+) -> dict[str, float | int]:
+    """Time one pass of `func` over `items`; report nanoseconds per item."""
+    items = list(items)
+    per_item = []
+    for _ in range(repeat):
+        start = perf_counter_ns()
+        for item in items:
+            func(item)
+        per_item.append((perf_counter_ns() - start) / max(len(items), 1))
+    return {
+        "best_ns": min(per_item),
+        "median_ns": median(per_item),
+        "number": len(items),
+        "repeat": repeat,
+    }
+
+
+def chunks(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def measure_stream(
+    funcs: dict[str, Callable[[Any], Any]], items: Iterable[Any], *, repeat: int = 5
+) -> dict[str, dict[str, float | int]]:
+    """Time each of `funcs` over `items`, materialising a chunk at a time.
+
+    Generation is kept out of the timings, and memory stays bounded however
+    large the catalog is. Each chunk is timed `repeat` times; the best and
+    median times of each chunk are summed, so the result has the same keys
+    as `measure_each`.
+    """
+    best = dict.fromkeys(funcs, 0)
+    middle = dict.fromkeys(funcs, 0.0)
+    count = 0
+    for chunk in chunks(items, _CHUNK_SIZE):
+        count += len(chunk)
+        for name, func in funcs.items():
+            elapsed = []
+            for _ in range(repeat):
+                start = perf_counter_ns()
+                for item in chunk:
+                    func(item)
+                elapsed.append(perf_counter_ns() - start)
+            best[name] += min(elapsed)
+            middle[name] += median(elapsed)
+    return {
+        name: {
+            "best_ns": best[name] / max(count, 1),
+            "median_ns": middle[name] / max(count, 1),
+            "number": count,
+            "repeat": repeat,
+        }
+        for name in funcs
+    }
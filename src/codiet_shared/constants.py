@@ -1,4 +1,10 @@
 from __future__ import annotations
-from typing import Final
+from typing import Final, Mapping
 
 GRAM_NAME: Final[str] = "gram"
+DEFAULT_MASS_UNITS: Final[Mapping[str, float]] = {
+    GRAM_NAME: 1.0,
+    "milligram": 1e-3,
+    "microgram": 1e-6,
+    "kilogram": 1e3,
+}
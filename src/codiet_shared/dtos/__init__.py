@@ -1,7 +1,79 @@
-from .calories import *
-from .cost import *
-from .nutrients import *
-from .ingredients import *
-from .recipes import *
-from .tags import *
-from .quantities import *
+from typing import TYPE_CHECKING
+
+from ..utils import lazy_exports
+
+# Public names by submodule; each submodule is imported on first access.
+_EXPORTS = {
+    "calories": (
+        "CaloriesRatioDTO",
+        "is_calories_ratio_dto",
+    ),
+    "cost": (
+        "CostRatioDTO",
+        "is_cost_ratio_dto",
+    ),
+    "nutrients": (
+        "NutrientDTO",
+        "is_nutrient_dto",
+        "NutrientFlagDTO",
+        "is_nutrient_flag_dto",
+        "NutrientFlagDefDTO",
+        "is_nutrient_flag_def_dto",
+        "NutrientRatioDTO",
+        "is_nutrient_ratio_dto",
+        "NutrientRatiosDTO",
+        "NutrientFlagsDTO",
+        "NutrientAttrsDTO",
+        "NutrientMassDTO",
+        "is_nutrient_mass_dto",
+    ),
+    "ingredients": (
+        "IngredientDTO",
+        "is_ingredient_dto",
+        "IngredientQuantityDTO",
+        "is_ingredient_quantity_dto",
+    ),
+    "recipes": (
+        "RecipeIngredientQuantitiesDTO",
+        "RecipeDTO",
+        "is_recipe_dto",
+        "RecipeQuantityDTO",
+        "is_recipe_quantity_dto",
+    ),
+    "tags": (
+        "TagDTO",
+        "is_tag_dto",
+    ),
+    "quantities": (
+        "UnitDTO",
+        "is_unit_dto",
+        "UnitConversionDTO",
+        "UnitConversionKey",
+        "UnitConversionsDTO",
+        "get_conversion_keys_from_uc_dtos",
+        "is_unit_conversion_dto",
+        "QuantityDTO",
+        "is_quantity_dto",
+    ),
+    "meal_plans": (
+        "MealSlotDTO",
+        "is_meal_slot_dto",
+        "MealPlanDTO",
+        "is_meal_plan_dto",
+    ),
+    "utils": (
+        "has_only_keys",
+    ),
+}
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .calories import *
+    from .cost import *
+    from .nutrients import *
+    from .ingredients import *
+    from .recipes import *
+    from .tags import *
+    from .quantities import *
+    from .meal_plans import *
@@ -3,6 +3,7 @@ from typing import Any, TypeGuard, TypedDict
 import numbers
 
 
+from ..instrumentation import instrumented
 from .utils import has_only_keys
 from .quantities import QuantityDTO, is_quantity_dto
 
@@ -12,6 +13,7 @@ class CaloriesRatioDTO(TypedDict):
     calories: float
 
 
+@instrumented
 def is_calories_ratio_dto(obj: Any) -> TypeGuard[CaloriesRatioDTO]:
     if not isinstance(obj, dict):
         return False
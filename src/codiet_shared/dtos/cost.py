@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import Any, TypeGuard, TypedDict
 import numbers
 
+from ..instrumentation import instrumented
 from .utils import has_only_keys
 
 
@@ -11,6 +12,7 @@ class CostRatioDTO(TypedDict):
     cost: float
 
 
+@instrumented
 def is_cost_ratio_dto(obj: Any) -> TypeGuard[CostRatioDTO]:
     return (
         isinstance(obj, dict)
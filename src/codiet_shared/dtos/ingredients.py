@@ -3,6 +3,7 @@ from typing import Any, NotRequired, TypeGuard, TypedDict
 from datetime import date
 import numbers
 
+from ..instrumentation import instrumented
 from .utils import has_only_keys
 from .quantities import is_unit_conversion_dto, UnitConversionDTO
 from .cost import is_cost_ratio_dto, CostRatioDTO
@@ -30,6 +31,7 @@ class IngredientDTO(TypedDict):
     use_as_recipe: bool
 
 
+@instrumented
 def is_ingredient_dto(obj: Any) -> TypeGuard[IngredientDTO]:
     if not isinstance(obj, dict):
         return False
@@ -114,6 +116,7 @@ class IngredientQuantityDTO(TypedDict):
     quantity_value: float
 
 
+@instrumented
 def is_ingredient_quantity_dto(obj: Any) -> TypeGuard[IngredientQuantityDTO]:
     return (
         isinstance(obj, dict)
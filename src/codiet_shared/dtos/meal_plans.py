@@ -0,0 +1,77 @@
+from __future__ import annotations
+from typing import Any, TypeGuard, TypedDict
+
+from ..instrumentation import instrumented
+from .utils import has_only_keys
+from .recipes import RecipeQuantityDTO, is_recipe_quantity_dto
+
+
+class MealSlotDTO(TypedDict):
+    day: int
+    meal_name: str
+    recipe_quantity: RecipeQuantityDTO
+
+
+@instrumented
+def is_meal_slot_dto(obj: Any) -> TypeGuard[MealSlotDTO]:
+    return (
+        isinstance(obj, dict)
+        and has_only_keys(obj, ("day", "meal_name", "recipe_quantity"))
+        and isinstance(obj.get("day"), int)
+        and obj["day"] >= 0
+        and isinstance(obj.get("meal_name"), str)
+        and is_recipe_quantity_dto(obj.get("recipe_quantity"))
+    )
+
+
+class MealPlanDTO(TypedDict):
+    uid: int | None
+    name: str
+    num_days: int
+    meal_names: list[str]
+    slots: list[MealSlotDTO]
+
+
+@instrumented
+def is_meal_plan_dto(obj: Any) -> TypeGuard[MealPlanDTO]:
+    if not isinstance(obj, dict):
+        return False
+
+    if not has_only_keys(obj, ("uid", "name", "num_days", "meal_names", "slots")):
+        return False
+
+    if not isinstance(obj.get("name"), str):
+        return False
+
+    num_days = obj.get("num_days")
+    if not isinstance(num_days, int) or num_days <= 0:
+        return False
+
+    meal_names = obj.get("meal_names")
+    if not isinstance(meal_names, list):
+        return False
+    if not all(isinstance(name, str) for name in meal_names):
+        return False
+
+    slots = obj.get("slots")
+    if not isinstance(slots, list):
+        return False
+    for slot in slots:
+        if not is_meal_slot_dto(slot):
+            return False
+        if slot["day"] >= num_days or slot["meal_name"] not in meal_names:
+            return False
+
+    uid_val = obj.get("uid")
+    if not (isinstance(uid_val, int) or uid_val is None):
+        return False
+
+    return True
+
+
+__all__ = [
+    "MealSlotDTO",
+    "is_meal_slot_dto",
+    "MealPlanDTO",
+    "is_meal_plan_dto",
+]
@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import TypedDict, TypeGuard, Any, Collection, Optional
 import numbers
 
+from ..instrumentation import instrumented
 from .utils import has_only_keys
 from .quantities import QuantityDTO, is_quantity_dto
 
@@ -16,6 +17,7 @@ class NutrientDTO(TypedDict):
     aliases: list[str]
 
 
+@instrumented
 def is_nutrient_dto(obj: Any) -> TypeGuard[NutrientDTO]:
     if not isinstance(obj, dict):
         return False
@@ -59,6 +61,7 @@ class NutrientFlagDTO(TypedDict):
     flag_value: bool
 
 
+@instrumented
 def is_nutrient_flag_dto(obj: Any) -> TypeGuard[NutrientFlagDTO]:
     return (
         isinstance(obj, dict)
@@ -75,6 +78,7 @@ class NutrientFlagDefDTO(TypedDict):
     directly_excludes_nutrients: list[str]
 
 
+@instrumented
 def is_nutrient_flag_def_dto(obj: Any) -> TypeGuard[NutrientFlagDefDTO]:
     if not isinstance(obj, dict):
         return False
@@ -112,6 +116,7 @@ class NutrientRatioDTO(TypedDict):
     host_quantity_value: float
 
 
+@instrumented
 def is_nutrient_ratio_dto(obj: Any) -> TypeGuard[NutrientRatioDTO]:
     return (
         isinstance(obj, dict)
@@ -147,6 +152,7 @@ class NutrientMassDTO(TypedDict):
     quantity: QuantityDTO
 
 
+@instrumented
 def is_nutrient_mass_dto(obj: Any) -> TypeGuard[NutrientMassDTO]:
     if not isinstance(obj, dict):
         return False
@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import Any, TypeGuard, TypedDict, Collection
 import numbers
 
+from ..instrumentation import instrumented
 from .utils import has_only_keys
 
 
@@ -15,6 +16,7 @@ class UnitDTO(TypedDict):
     aliases: Collection[str]
 
 
+@instrumented
 def is_unit_dto(obj: Any) -> TypeGuard[UnitDTO]:
     if not isinstance(obj, dict):
         return False
@@ -68,6 +70,7 @@ def get_conversion_keys_from_uc_dtos(
     return {frozenset((uc["from_unit_name"], uc["to_unit_name"])) for uc in conversions}
 
 
+@instrumented
 def is_unit_conversion_dto(obj: Any) -> TypeGuard[UnitConversionDTO]:
     if not isinstance(obj, dict):
         return False
@@ -95,6 +98,7 @@ class QuantityDTO(TypedDict):
     value: float
 
 
+@instrumented
 def is_quantity_dto(obj: Any) -> TypeGuard[QuantityDTO]:
     if not isinstance(obj, dict):
         return False
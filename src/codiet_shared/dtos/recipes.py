@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from datetime import date
 from typing import Any, NotRequired, TypeGuard, TypedDict
 
+from ..instrumentation import instrumented
 from .utils import has_only_keys
 from .quantities import (
     is_unit_conversion_dto,
@@ -54,6 +55,7 @@ class RecipeDTO(TypedDict):
     nutrient_masses: NotRequired[list[NutrientMassDTO]]
 
 
+@instrumented
 def is_recipe_dto(obj: Any) -> TypeGuard[RecipeDTO]:
     if not isinstance(obj, dict):
         return False
@@ -197,6 +199,7 @@ class RecipeQuantityDTO(TypedDict):
     quantity_value: float
 
 
+@instrumented
 def is_recipe_quantity_dto(obj: Any) -> TypeGuard[RecipeQuantityDTO]:
     return (
         isinstance(obj, dict)
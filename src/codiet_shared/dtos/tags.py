@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import TypedDict, Any, TypeGuard
 
+from ..instrumentation import instrumented
 from .utils import has_only_keys
 
 
@@ -10,6 +11,7 @@ class TagDTO(TypedDict):
     parents: list[str]
 
 
+@instrumented
 def is_tag_dto(obj: Any) -> TypeGuard[TagDTO]:
     if not isinstance(obj, dict):
         return False
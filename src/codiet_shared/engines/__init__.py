@@ -0,0 +1,13 @@
+from .columns import *
+from .flattening import *
+from .recompute import *
+from .ranking import *
+from .similarity import *
+from .substitution import *
+from .dedup import *
+from .solver import *
+from .compatibility import *
+from .gaps import *
+from .meal_plans import *
+from .shopping import *
+from .glycemic import *
@@ -0,0 +1,136 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Iterator, Mapping
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ..indexes.names import FuzzyNameIndex
+    from ..protocols.ingredients import IngredientMap
+
+
+class NameIndex(Mapping[str, int]):
+    """Dense, append-only mapping between names and array positions."""
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self._names: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._fuzzy: FuzzyNameIndex | None = None
+        for name in names:
+            self.add(name)
+
+    @property
+    def names(self) -> list[str]:
+        return self._names
+
+    def add(self, name: str) -> int:
+        position = self._positions.get(name)
+        if position is None:
+            position = len(self._names)
+            self._positions[name] = position
+            self._names.append(name)
+            if self._fuzzy is not None:
+                self._fuzzy.add(name)
+        return position
+
+    def get_fuzzy_index(self) -> FuzzyNameIndex:
+        """Return a fuzzy index of the names, built on first use and kept current."""
+        if self._fuzzy is None:
+            from ..indexes.names import FuzzyNameIndex
+
+            self._fuzzy = FuzzyNameIndex.from_names(self._names)
+        return self._fuzzy
+
+    def get_position(self, name: str) -> int:
+        return self._positions[name]
+
+    def get_positions(self, names: Iterable[str]) -> np.ndarray:
+        return np.fromiter(
+            (self._positions[name] for name in names), dtype=np.intp
+        )
+
+    def __getitem__(self, name: str) -> int:
+        return self._positions[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._positions
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+
+@dataclass(frozen=True)
+class ProfileColumns:
+    """Columnar per-gram nutrient, cost, calorie and flag data.
+
+    Row `i` describes the entity `names.names[i]`. A flag is tri-state: it is
+    known true, known false, or (when neither mask is set) undefined.
+    """
+
+    names: NameIndex
+    nutrient_names: NameIndex
+    flag_names: NameIndex
+    nutrient_g_per_g: np.ndarray
+    cost_per_gram: np.ndarray
+    cals_per_gram: np.ndarray
+    flags_true: np.ndarray
+    flags_false: np.ndarray
+
+    @classmethod
+    def from_ingredients(
+        cls,
+        ingredients: IngredientMap,
+        *,
+        nutrient_names: NameIndex | None = None,
+        flag_names: NameIndex | None = None,
+    ) -> ProfileColumns:
+        ingredient_names = NameIndex(ingredients.keys())
+        nutrient_names = nutrient_names if nutrient_names is not None else NameIndex()
+        flag_names = flag_names if flag_names is not None else NameIndex()
+
+        ratio_entries: list[tuple[int, int, float]] = []
+        flag_entries: list[tuple[int, int, bool]] = []
+        cost = np.empty(len(ingredient_names), dtype=np.float64)
+        cals = np.empty(len(ingredient_names), dtype=np.float64)
+        for row, ingredient in enumerate(ingredients.values()):
+            for nutrient_name, ratio in ingredient.nutrient_ratios.items():
+                col = nutrient_names.add(nutrient_name)
+                ratio_entries.append((row, col, ratio.nutrient_perc))
+            for flag_name, flag in ingredient.nutrient_flags.items():
+                flag_entries.append((row, flag_names.add(flag_name), flag.value))
+            cost[row] = ingredient.cost_ratio.cost_per_gram
+            cals[row] = ingredient.calories_ratio.cals_per_gram
+
+        shape = (len(ingredient_names), len(nutrient_names))
+        nutrient_g_per_g = np.zeros(shape, dtype=np.float64)
+        for row, col, value in ratio_entries:
+            nutrient_g_per_g[row, col] = value
+
+        flag_shape = (len(ingredient_names), len(flag_names))
+        flags_true = np.zeros(flag_shape, dtype=bool)
+        flags_false = np.zeros(flag_shape, dtype=bool)
+        for row, col, value in flag_entries:
+            if value:
+                flags_true[row, col] = True
+            else:
+                flags_false[row, col] = True
+
+        return cls(
+            names=ingredient_names,
+            nutrient_names=nutrient_names,
+            flag_names=flag_names,
+            nutrient_g_per_g=nutrient_g_per_g,
+            cost_per_gram=cost,
+            cals_per_gram=cals,
+            flags_true=flags_true,
+            flags_false=flags_false,
+        )
+
+
+__all__ = [
+    "NameIndex",
+    "ProfileColumns",
+]
@@ -0,0 +1,267 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Collection, Hashable, Iterable
+
+import numpy as np
+
+from ..exceptions.recipes import RecipeNotFoundError
+from ..exceptions.users import UserNotFoundError
+from ..indexes.names import get_or_raise
+from .columns import NameIndex
+
+if TYPE_CHECKING:
+    from ..indexes.tags import TagClosure
+    from ..protocols.recipes import Recipe
+
+_WORD_BITS = 64
+
+
+@dataclass(frozen=True)
+class DietaryRestriction:
+    """What a user requires of, or refuses in, a recipe.
+
+    A recipe is compatible when it is known true for every required flag,
+    carries none of the excluded tags and uses none of the excluded
+    ingredients.
+    """
+
+    required_flags: Collection[str] = ()
+    excluded_tags: Collection[str] = ()
+    excluded_ingredients: Collection[str] = ()
+
+
+class CompatibilityMatrix:
+    """Packed users x recipes dietary-compatibility bit-matrix.
+
+    Recipe attributes (true flags, tags and ingredients) and user
+    restrictions are encoded as bitmasks over one shared feature vocabulary,
+    stored as rows of 64-bit words. A user is compatible with a recipe when,
+    word by word, the recipe covers the user's required bits and shares none
+    of their excluded bits. Users with identical restrictions are evaluated
+    once. The result is kept bit-packed (little-endian bit order along the
+    recipe axis), and single recipe or user changes only recompute their
+    own column or row.
+
+    When a `TagClosure` is given, a recipe also carries the ancestors of each
+    of its tags, so excluding "meat" excludes recipes tagged "beef". The
+    ancestors are expanded when a recipe is added or updated, so after
+    changing the closure, pass the affected recipes to `update_recipe` again.
+    """
+
+    def __init__(
+        self,
+        *,
+        closure: TagClosure | None = None,
+        chunk_size: int = 1 << 24,
+    ) -> None:
+        self._closure = closure
+        self._chunk_size = chunk_size
+        self._features: dict[Hashable, int] = {}
+        self._recipe_names = NameIndex()
+        self._user_names = NameIndex()
+        self._recipe_bits = np.zeros((0, 1), dtype=np.uint64)
+        self._required_bits = np.zeros((0, 1), dtype=np.uint64)
+        self._excluded_bits = np.zeros((0, 1), dtype=np.uint64)
+        self._live = np.zeros(0, dtype=bool)
+        self._matrix: np.ndarray | None = None
+
+    @classmethod
+    def from_recipes(
+        cls,
+        recipes: Iterable[Recipe],
+        *,
+        closure: TagClosure | None = None,
+    ) -> CompatibilityMatrix:
+        matrix = cls(closure=closure)
+        for recipe in recipes:
+            matrix.update_recipe(recipe)
+        return matrix
+
+    @property
+    def recipe_names(self) -> list[str]:
+        return self._recipe_names.names
+
+    @property
+    def user_names(self) -> list[str]:
+        return self._user_names.names
+
+    def update_recipe(self, recipe: Recipe) -> None:
+        """Add or replace a recipe, refreshing only its matrix column."""
+        features = self._get_feature_ids(_get_recipe_features(recipe, self._closure))
+        row = self._recipe_names.add(recipe.name)
+        self._grow_recipes(row + 1)
+        self._recipe_bits[row] = self._encode(features)
+        self._live[row] = True
+        self._refresh_column(row)
+
+    def remove_recipe(self, recipe_name: str) -> None:
+        """Mark a recipe incompatible with everyone; its position is kept."""
+        row = get_or_raise(self._recipe_names, recipe_name, RecipeNotFoundError)
+        self._recipe_bits[row] = 0
+        self._live[row] = False
+        self._refresh_column(row)
+
+    def set_restriction(
+        self, user_name: str, restriction: DietaryRestriction
+    ) -> None:
+        """Add or replace a user's restriction, refreshing only their row."""
+        required = self._get_feature_ids(
+            ("flag", name, True) for name in restriction.required_flags
+        )
+        excluded = self._get_feature_ids(
+            [("tag", name) for name in restriction.excluded_tags]
+            + [("ingredient", name) for name in restriction.excluded_ingredients]
+        )
+        row = self._user_names.add(user_name)
+        self._grow_users(row + 1)
+        self._required_bits[row] = self._encode(required)
+        self._excluded_bits[row] = self._encode(excluded)
+        if self._matrix is not None:
+            self._matrix[row] = self._compute(
+                self._required_bits[row : row + 1],
+                self._excluded_bits[row : row + 1],
+            )[0]
+
+    def get_matrix(self) -> np.ndarray:
+        """Return the packed matrix, one row of bytes per user."""
+        if self._matrix is None:
+            n_users = len(self._user_names)
+            self._matrix = self._compute(
+                self._required_bits[:n_users], self._excluded_bits[:n_users]
+            )
+        return self._matrix
+
+    def get_compatible_mask(self, user_name: str) -> np.ndarray:
+        row = get_or_raise(self._user_names, user_name, UserNotFoundError)
+        return np.unpackbits(
+            self.get_matrix()[row],
+            count=len(self._recipe_names),
+            bitorder="little",
+        ).view(bool)
+
+    def get_compatible_names(self, user_name: str) -> list[str]:
+        names = self._recipe_names.names
+        return [names[i] for i in np.flatnonzero(self.get_compatible_mask(user_name))]
+
+    def is_compatible(self, user_name: str, recipe_name: str) -> bool:
+        recipe = get_or_raise(self._recipe_names, recipe_name, RecipeNotFoundError)
+        user = get_or_raise(self._user_names, user_name, UserNotFoundError)
+        return bool(self.get_matrix()[user, recipe >> 3] >> (recipe & 7) & 1)
+
+    def _compute(self, required: np.ndarray, excluded: np.ndarray) -> np.ndarray:
+        """Return packed compatibility rows for the given user bitmasks."""
+        n_recipes = len(self._recipe_names)
+        packed = np.zeros((len(required), (n_recipes + 7) // 8), dtype=np.uint8)
+        if not len(required) or not n_recipes:
+            return packed
+
+        # Many users share a restriction, so only distinct ones are evaluated.
+        restrictions, inverse = np.unique(
+            np.concatenate([required, excluded], axis=1),
+            axis=0,
+            return_inverse=True,
+        )
+        n_words = required.shape[1]
+        recipe_bits = self._recipe_bits[:n_recipes]
+        live = self._live[:n_recipes]
+        step = max(1, self._chunk_size // n_recipes)
+        unique_packed = np.empty(
+            (len(restrictions), packed.shape[1]), dtype=np.uint8
+        )
+        for start in range(0, len(restrictions), step):
+            chunk = restrictions[start : start + step]
+            compatible = np.broadcast_to(live, (len(chunk), n_recipes)).copy()
+            for word in range(n_words):
+                need = chunk[:, word, None]
+                avoid = chunk[:, n_words + word, None]
+                if need.any():
+                    compatible &= (recipe_bits[:, word] & need) == need
+                if avoid.any():
+                    compatible &= (recipe_bits[:, word] & avoid) == 0
+            unique_packed[start : start + step] = np.packbits(
+                compatible, axis=1, bitorder="little"
+            )
+        packed[:] = unique_packed[inverse.ravel()]
+        return packed
+
+    def _refresh_column(self, row: int) -> None:
+        if self._matrix is None:
+            return
+        n_bytes = (len(self._recipe_names) + 7) // 8
+        if self._matrix.shape[1] < n_bytes:
+            self._matrix = np.pad(
+                self._matrix, ((0, 0), (0, n_bytes - self._matrix.shape[1]))
+            )
+        bits = self._recipe_bits[row]
+        required = self._required_bits[: len(self._user_names)]
+        excluded = self._excluded_bits[: len(self._user_names)]
+        compatible = np.all((required & bits) == required, axis=1)
+        compatible &= np.all((excluded & bits) == 0, axis=1)
+        compatible &= self._live[row]
+        bit = np.uint8(1 << (row & 7))
+        column = self._matrix[:, row >> 3]
+        column &= ~bit
+        column |= compatible.astype(np.uint8) << np.uint8(row & 7)
+
+    def _get_feature_ids(self, features: Iterable[Hashable]) -> list[int]:
+        ids = [self._features.setdefault(f, len(self._features)) for f in features]
+        n_words = (len(self._features) + _WORD_BITS - 1) // _WORD_BITS
+        if n_words > self._recipe_bits.shape[1]:
+            extra = ((0, 0), (0, n_words - self._recipe_bits.shape[1]))
+            self._recipe_bits = np.pad(self._recipe_bits, extra)
+            self._required_bits = np.pad(self._required_bits, extra)
+            self._excluded_bits = np.pad(self._excluded_bits, extra)
+        return ids
+
+    def _encode(self, feature_ids: list[int]) -> np.ndarray:
+        words = np.zeros(self._recipe_bits.shape[1], dtype=np.uint64)
+        for feature_id in feature_ids:
+            words[feature_id // _WORD_BITS] |= np.uint64(1 << feature_id % _WORD_BITS)
+        return words
+
+    def _grow_recipes(self, n_rows: int) -> None:
+        if n_rows > len(self._recipe_bits):
+            extra = max(n_rows, 2 * len(self._recipe_bits)) - len(self._recipe_bits)
+            self._recipe_bits = np.pad(self._recipe_bits, ((0, extra), (0, 0)))
+            self._live = np.pad(self._live, (0, extra))
+
+    def _grow_users(self, n_rows: int) -> None:
+        if n_rows > len(self._required_bits):
+            extra = max(n_rows, 2 * len(self._required_bits)) - len(
+                self._required_bits
+            )
+            self._required_bits = np.pad(self._required_bits, ((0, extra), (0, 0)))
+            self._excluded_bits = np.pad(self._excluded_bits, ((0, extra), (0, 0)))
+        if self._matrix is not None and n_rows > len(self._matrix):
+            self._matrix = np.pad(
+                self._matrix, ((0, n_rows - len(self._matrix)), (0, 0))
+            )
+
+
+def _get_recipe_features(
+    recipe: Recipe, closure: TagClosure | None
+) -> set[Hashable]:
+    features: set[Hashable] = set()
+    for tag_name in recipe.tags:
+        if closure is not None and tag_name in closure:
+            features.update(("tag", name) for name in closure.get_ancestors(tag_name))
+        else:
+            features.add(("tag", tag_name))
+    features.update(
+        ("ingredient", name) for name in recipe.preparation_ingredient_quantities
+    )
+    features.update(
+        ("ingredient", name) for name in recipe.composition_ingredient_quantities
+    )
+    features.update(
+        ("flag", flag_name, True)
+        for flag_name, flag in recipe.nutrient_flags.items()
+        if flag.value
+    )
+    return features
+
+
+__all__ = [
+    "DietaryRestriction",
+    "CompatibilityMatrix",
+]
@@ -0,0 +1,341 @@
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping, Sequence
+import re
+
+import numpy as np
+
+from ..constants import DEFAULT_MASS_UNITS
+from ..exceptions.ingredients import UndefinedIngredientUnitConvError
+from ..utils import create_pseudo_uid
+from .columns import NameIndex
+
+if TYPE_CHECKING:
+    from ..dtos.ingredients import IngredientDTO
+    from ..dtos.quantities import UnitConversionDTO
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+@dataclass(frozen=True)
+class DuplicatePair:
+    first_name: str
+    second_name: str
+    name_similarity: float
+    nutrient_similarity: float
+    score: float
+
+
+@dataclass(frozen=True)
+class DuplicateCluster:
+    names: tuple[str, ...]
+    pairs: tuple[DuplicatePair, ...]
+
+    @property
+    def score(self) -> float:
+        return sum(pair.score for pair in self.pairs) / len(self.pairs)
+
+
+@dataclass(frozen=True)
+class DuplicateReport:
+    """Duplicate clusters found in a catalog.
+
+    `errors` lists each ingredient and unit that could not be converted to
+    grams; the nutrient ratios using them are left out of the comparison.
+    """
+
+    clusters: list[DuplicateCluster]
+    errors: list[UndefinedIngredientUnitConvError]
+
+
+def get_name_shingles(name: str, n: int = 3) -> set[str]:
+    """Return the character n-grams of each word of a casefolded name.
+
+    Words are shingled separately with boundary markers, so word order and
+    punctuation do not matter ("Tomatoes, raw" and "Raw tomato" overlap).
+    """
+    shingles: set[str] = set()
+    for word in _NON_WORD.sub(" ", name.casefold()).split():
+        padded = f"^{word}$"
+        if len(padded) <= n:
+            shingles.add(padded)
+        else:
+            shingles.update(padded[i : i + n] for i in range(len(padded) - n + 1))
+    return shingles
+
+
+class IngredientDeduplicator:
+    """Finds clusters of near-duplicate ingredients in sub-quadratic time.
+
+    Candidate pairs come from two sources: MinHash/LSH bands over name
+    shingles, and buckets of identical quantised per-100g nutrient vectors.
+    Only candidates are scored: a pair is a duplicate when its estimated name
+    Jaccard similarity reaches `name_threshold` and its nutrient cosine
+    similarity reaches `nutrient_threshold`. Duplicate pairs are joined into
+    clusters, scored by the mean of the two similarities. Nutrient ratios
+    given per non-mass unit (per millilitre, say) are converted to grams
+    through the ingredient's own unit conversions.
+    """
+
+    def __init__(
+        self,
+        *,
+        num_perm: int = 64,
+        bands: int = 16,
+        name_threshold: float = 0.5,
+        nutrient_threshold: float = 0.98,
+        nutrient_resolution: float = 0.5,
+        max_bucket_size: int = 64,
+        mass_units: Mapping[str, float] = DEFAULT_MASS_UNITS,
+        seed: int = 0,
+        chunk_size: int = 1 << 16,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = np.random.default_rng(seed)
+        self._perm_a = rng.integers(1, _MERSENNE_PRIME, num_perm, dtype=np.int64)
+        self._perm_b = rng.integers(0, _MERSENNE_PRIME, num_perm, dtype=np.int64)
+        band_mult = rng.integers(1, 1 << 62, num_perm, dtype=np.int64)
+        self._band_mult = band_mult.astype(np.uint64)
+        self._bands = bands
+        self._name_threshold = name_threshold
+        self._nutrient_threshold = nutrient_threshold
+        self._nutrient_resolution = nutrient_resolution
+        self._max_bucket_size = max_bucket_size
+        self._mass_units = mass_units
+        self._seed = seed
+        self._chunk_size = chunk_size
+
+    def find_clusters(
+        self, ingredient_dtos: Sequence[IngredientDTO]
+    ) -> DuplicateReport:
+        names = [dto["name"] for dto in ingredient_dtos]
+        if not names:
+            return DuplicateReport(clusters=[], errors=[])
+        signatures = self.get_signatures(names)
+        vectors, errors = self._get_unit_nutrient_vectors(ingredient_dtos)
+
+        candidates = np.concatenate(
+            [
+                self._get_lsh_candidates(signatures),
+                self._get_nutrient_candidates(vectors),
+            ]
+        )
+        # Encode each (i, j) pair as one integer so duplicates drop cheaply.
+        codes = np.unique(candidates[:, 0] * len(names) + candidates[:, 1])
+        pairs = np.stack([codes // len(names), codes % len(names)], axis=1)
+        clusters = self._cluster(names, signatures, vectors, pairs)
+        return DuplicateReport(clusters=clusters, errors=errors)
+
+    def get_signatures(self, names: Sequence[str]) -> np.ndarray:
+        """Return the MinHash signature of each name, one row per name."""
+        vocab: dict[str, int] = {}
+        shingle_ids: list[int] = []
+        indptr = np.zeros(len(names) + 1, dtype=np.intp)
+        for i, name in enumerate(names):
+            for shingle in get_name_shingles(name) or {name}:
+                shingle_ids.append(vocab.setdefault(shingle, len(vocab)))
+            indptr[i + 1] = len(shingle_ids)
+
+        vocab_hashes = np.fromiter(
+            (create_pseudo_uid(shingle) for shingle in vocab),
+            dtype=np.int64,
+            count=len(vocab),
+        )
+        hashes = vocab_hashes[np.asarray(shingle_ids, dtype=np.intp)]
+        signatures = np.empty((len(names), len(self._perm_a)), dtype=np.int64)
+        starts = indptr[:-1]
+        for p, (a, b) in enumerate(zip(self._perm_a, self._perm_b)):
+            permuted = (a * hashes + b) % _MERSENNE_PRIME
+            signatures[:, p] = np.minimum.reduceat(permuted, starts)
+        return signatures
+
+    def _get_unit_nutrient_vectors(
+        self, ingredient_dtos: Sequence[IngredientDTO]
+    ) -> tuple[np.ndarray, list[UndefinedIngredientUnitConvError]]:
+        nutrient_names = NameIndex()
+        entries: list[tuple[int, int, float]] = []
+        errors: list[UndefinedIngredientUnitConvError] = []
+        for row, dto in enumerate(ingredient_dtos):
+            grams_per_unit = self._mass_units
+            failed: set[str] = set()
+            for ratio in dto["nutrient_ratios"]:
+                units = (ratio["nutrient_mass_unit"], ratio["host_quantity_unit"])
+                if grams_per_unit is self._mass_units and not all(
+                    unit_name in grams_per_unit for unit_name in units
+                ):
+                    grams_per_unit = self._get_grams_per_unit(dto)
+                missing = [u for u in units if u not in grams_per_unit]
+                if missing:
+                    for unit_name in missing:
+                        if unit_name not in failed:
+                            failed.add(unit_name)
+                            errors.append(
+                                UndefinedIngredientUnitConvError(dto["name"], unit_name)
+                            )
+                    continue
+                mass = ratio["nutrient_mass_value"] * grams_per_unit[units[0]]
+                host = ratio["host_quantity_value"] * grams_per_unit[units[1]]
+                if host > 0:
+                    col = nutrient_names.add(ratio["nutrient_name"])
+                    entries.append((row, col, 100.0 * mass / host))
+
+        vectors = np.zeros((len(ingredient_dtos), len(nutrient_names)))
+        if entries:
+            rows, cols, values = zip(*entries)
+            vectors[np.asarray(rows), np.asarray(cols)] = values
+        return vectors, errors
+
+    def _get_grams_per_unit(self, dto: IngredientDTO) -> dict[str, float]:
+        """Extend the mass units through the ingredient's unit conversions."""
+        grams_per_unit = dict(self._mass_units)
+        neighbours: dict[str, list[UnitConversionDTO]] = {}
+        for conversion in dto["unit_conversions"]:
+            neighbours.setdefault(conversion["from_unit_name"], []).append(conversion)
+            neighbours.setdefault(conversion["to_unit_name"], []).append(conversion)
+
+        # Breadth-first from every mass unit through the conversion graph.
+        queue = deque(grams_per_unit)
+        while queue:
+            unit_name = queue.popleft()
+            for conversion in neighbours.get(unit_name, ()):
+                if conversion["from_unit_name"] == unit_name:
+                    other = conversion["to_unit_name"]
+                    ratio = conversion["from_unit_value"] / conversion["to_unit_value"]
+                else:
+                    other = conversion["from_unit_name"]
+                    ratio = conversion["to_unit_value"] / conversion["from_unit_value"]
+                if other not in grams_per_unit and ratio > 0:
+                    grams_per_unit[other] = ratio * grams_per_unit[unit_name]
+                    queue.append(other)
+        return grams_per_unit
+
+    def _get_lsh_candidates(self, signatures: np.ndarray) -> np.ndarray:
+        rows_per_band = signatures.shape[1] // self._bands
+        band_pairs = []
+        unsigned = signatures.astype(np.uint64)
+        for band in range(self._bands):
+            cols = slice(band * rows_per_band, (band + 1) * rows_per_band)
+            keys = unsigned[:, cols] @ self._band_mult[cols]
+            band_pairs.append(self._get_bucket_pairs(keys))
+        return np.concatenate(band_pairs)
+
+    def _get_nutrient_candidates(self, vectors: np.ndarray) -> np.ndarray:
+        quantised = np.rint(vectors / self._nutrient_resolution).astype(np.uint64)
+        rng = np.random.default_rng(self._seed)
+        mult = rng.integers(1, 1 << 62, vectors.shape[1], dtype=np.int64)
+        keys = quantised @ mult.astype(np.uint64)
+        has_profile = vectors.any(axis=1)
+        pairs = self._get_bucket_pairs(keys[has_profile])
+        return np.flatnonzero(has_profile)[pairs]
+
+    def _get_bucket_pairs(self, keys: np.ndarray) -> np.ndarray:
+        """Return (i, j) pairs, i < j, of rows sharing a key.
+
+        Runs of equal keys are paired by comparing each sorted position with
+        the next `d` positions, so no Python loop over buckets is needed.
+        Buckets larger than `max_bucket_size` are skipped as uninformative.
+        """
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        sizes = np.diff(np.r_[starts, len(keys)])
+        bucket_size = np.repeat(sizes, sizes)
+        usable = (bucket_size > 1) & (bucket_size <= self._max_bucket_size)
+
+        pairs = []
+        for d in range(1, min(self._max_bucket_size, len(keys))):
+            same = usable[:-d] & (sorted_keys[:-d] == sorted_keys[d:])
+            if not same.any():
+                break
+            first = order[:-d][same]
+            second = order[d:][same]
+            pairs.append(np.stack([first, second], axis=1))
+        if not pairs:
+            return np.empty((0, 2), dtype=np.intp)
+        stacked = np.concatenate(pairs)
+        return np.sort(stacked, axis=1)
+
+    def _cluster(
+        self,
+        names: list[str],
+        signatures: np.ndarray,
+        vectors: np.ndarray,
+        pairs: np.ndarray,
+    ) -> list[DuplicateCluster]:
+        norms = np.linalg.norm(vectors, axis=1)
+        units = np.divide(
+            vectors,
+            norms[:, None],
+            out=np.zeros_like(vectors),
+            where=norms[:, None] > 0,
+        )
+
+        accepted: list[DuplicatePair] = []
+        accepted_rows: list[tuple[int, int]] = []
+        for start in range(0, len(pairs), self._chunk_size):
+            chunk = pairs[start : start + self._chunk_size]
+            first, second = chunk[:, 0], chunk[:, 1]
+            name_sim = (signatures[first] == signatures[second]).mean(axis=1)
+            nutrient_sim = np.einsum("ij,ij->i", units[first], units[second])
+            score = 0.5 * (name_sim + nutrient_sim)
+            is_duplicate = (name_sim >= self._name_threshold) & (
+                nutrient_sim >= self._nutrient_threshold
+            )
+            for pos in np.flatnonzero(is_duplicate):
+                i, j = int(first[pos]), int(second[pos])
+                accepted_rows.append((i, j))
+                accepted.append(
+                    DuplicatePair(
+                        first_name=names[i],
+                        second_name=names[j],
+                        name_similarity=float(name_sim[pos]),
+                        nutrient_similarity=float(nutrient_sim[pos]),
+                        score=float(score[pos]),
+                    )
+                )
+
+        parent = list(range(len(names)))
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for i, j in accepted_rows:
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        members: dict[int, list[int]] = {}
+        cluster_pairs: dict[int, list[DuplicatePair]] = {}
+        for (i, j), pair in zip(accepted_rows, accepted):
+            root = find(i)
+            cluster_pairs.setdefault(root, []).append(pair)
+            members.setdefault(root, [])
+        for row in range(len(names)):
+            root = find(row)
+            if root in members:
+                members[root].append(row)
+
+        clusters = [
+            DuplicateCluster(
+                names=tuple(names[row] for row in members[root]),
+                pairs=tuple(cluster_pairs[root]),
+            )
+            for root in sorted(members)
+        ]
+        clusters.sort(key=lambda cluster: -len(cluster.names))
+        return clusters
+
+
+__all__ = [
+    "DuplicatePair",
+    "DuplicateCluster",
+    "DuplicateReport",
+    "get_name_shingles",
+    "IngredientDeduplicator",
+]
@@ -0,0 +1,340 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping, Sequence
+
+import numpy as np
+
+from ..exceptions.recipes import (
+    CircularRecipeError,
+    NoIngredientQuantitiesError,
+    RecipeNotFoundError,
+)
+from ..indexes.names import FuzzyNameIndex, get_or_raise
+from .columns import NameIndex
+
+if TYPE_CHECKING:
+    from ..protocols.ingredients import Ingredient
+    from ..protocols.recipes import RecipeMap, RecipeQuantity
+
+
+@dataclass(frozen=True)
+class RecipeProfile:
+    """Per-gram profile of a recipe, expanded down to its base ingredients.
+
+    `mass_in_grams` is the mass of the recipe's composition, which makes
+    `servings` portions.
+    """
+
+    fingerprint: int
+    base_ingredient_g_per_g: Mapping[str, float]
+    nutrient_g_per_g: Mapping[str, float]
+    cost_per_gram: float
+    cals_per_gram: float
+    mass_in_grams: float
+    servings: int
+
+    @property
+    def mass_per_serving(self) -> float:
+        return self.mass_in_grams / self.servings
+
+    def per_serving(self, servings: float = 1.0) -> ScaledRecipeProfile:
+        return self.scaled(servings * self.mass_per_serving)
+
+    def scaled(self, mass_in_grams: float) -> ScaledRecipeProfile:
+        return ScaledRecipeProfile(
+            mass_in_grams=mass_in_grams,
+            base_ingredient_masses={
+                name: g_per_g * mass_in_grams
+                for name, g_per_g in self.base_ingredient_g_per_g.items()
+            },
+            nutrient_masses={
+                name: g_per_g * mass_in_grams
+                for name, g_per_g in self.nutrient_g_per_g.items()
+            },
+            total_cost=self.cost_per_gram * mass_in_grams,
+            calories=self.cals_per_gram * mass_in_grams,
+        )
+
+
+@dataclass(frozen=True)
+class ScaledRecipeProfile:
+    """A recipe profile scaled to a concrete mass, all values in grams."""
+
+    mass_in_grams: float
+    base_ingredient_masses: Mapping[str, float]
+    nutrient_masses: Mapping[str, float]
+    total_cost: float
+    calories: float
+
+
+@dataclass(frozen=True)
+class ScaledProfileBatch:
+    """Many scaled recipe profiles as arrays, one row per requested scaling."""
+
+    recipe_names: list[str]
+    nutrient_names: NameIndex
+    mass_in_grams: np.ndarray
+    nutrient_masses: np.ndarray
+    total_cost: np.ndarray
+    calories: np.ndarray
+
+
+class RecipeFlattener:
+    """Flattens nested recipes into memoized per-gram profiles.
+
+    An ingredient with `use_as_recipe` set is expanded through the recipe of
+    the same name. Each recipe is computed once and stored under a content
+    fingerprint, so unchanged recipes (and identical copies) are reused until
+    `invalidate` (or `invalidate_ingredient`) is called for them. Scaling a
+    cached profile to any quantity is then a scalar multiply. A profile is
+    dropped as soon as no recipe points at it any more, so a long run of
+    edits does not grow the cache.
+    """
+
+    def __init__(self, recipes: RecipeMap) -> None:
+        self._recipes = recipes
+        self._profiles: dict[int, RecipeProfile] = {}
+        self._fingerprints: dict[str, int] = {}
+        self._references: dict[int, int] = {}
+        self._dependents: dict[str, set[str]] = {}
+        self._sub_recipes: dict[str, set[str]] = {}
+        self._ingredient_dependents: dict[str, set[str]] = {}
+        self._base_ingredients: dict[str, set[str]] = {}
+        self._nutrient_names = NameIndex()
+        self._rows: dict[int, np.ndarray] = {}
+        self._fuzzy: tuple[int, FuzzyNameIndex] | None = None
+
+    def get_profile(self, recipe_name: str) -> RecipeProfile:
+        return self._resolve(recipe_name, [])
+
+    def get_fingerprint(self, recipe_name: str) -> int:
+        return self.get_profile(recipe_name).fingerprint
+
+    def get_quantity_profile(
+        self, recipe_quantity: RecipeQuantity
+    ) -> ScaledRecipeProfile:
+        profile = self.get_profile(recipe_quantity.recipe.name)
+        return profile.scaled(recipe_quantity.quantity.mass_in_grams)
+
+    def scale_many(
+        self,
+        recipe_names: Sequence[str],
+        *,
+        masses_in_grams: Sequence[float] | np.ndarray | None = None,
+        servings: Sequence[float] | np.ndarray | None = None,
+    ) -> ScaledProfileBatch:
+        """Scale many recipes at once, to masses or to numbers of servings.
+
+        Recipe names may repeat, so one recipe can be scaled to several
+        portion sizes in the same call.
+        """
+        if (masses_in_grams is None) == (servings is None):
+            raise ValueError("Pass exactly one of masses_in_grams and servings")
+        unique_names = list(dict.fromkeys(recipe_names))
+        profiles = [self.get_profile(name) for name in unique_names]
+        positions = NameIndex(unique_names).get_positions(recipe_names)
+
+        rows = [self._get_nutrient_row(profile) for profile in profiles]
+        n_nutrients = len(self._nutrient_names)
+        per_gram = np.zeros((len(profiles), n_nutrients + 2))
+        for i, (profile, row) in enumerate(zip(profiles, rows)):
+            per_gram[i, : len(row)] = row
+            per_gram[i, n_nutrients] = profile.cost_per_gram
+            per_gram[i, n_nutrients + 1] = profile.cals_per_gram
+        if masses_in_grams is not None:
+            masses = np.asarray(masses_in_grams, dtype=np.float64)
+        else:
+            per_serving = np.fromiter(
+                (profile.mass_per_serving for profile in profiles),
+                dtype=np.float64,
+                count=len(profiles),
+            )
+            masses = np.asarray(servings, dtype=np.float64) * per_serving[positions]
+
+        scaled = per_gram[positions] * masses[:, None]
+        return ScaledProfileBatch(
+            recipe_names=list(recipe_names),
+            nutrient_names=self._nutrient_names,
+            mass_in_grams=masses,
+            nutrient_masses=scaled[:, :n_nutrients],
+            total_cost=scaled[:, n_nutrients],
+            calories=scaled[:, n_nutrients + 1],
+        )
+
+    def invalidate(self, recipe_name: str) -> None:
+        """Forget the fingerprint of a recipe and of every recipe using it."""
+        pending = [recipe_name]
+        while pending:
+            name = pending.pop()
+            fingerprint = self._fingerprints.pop(name, None)
+            if fingerprint is not None:
+                self._release(name, fingerprint)
+                pending.extend(self._dependents.pop(name, ()))
+
+    def invalidate_ingredient(self, ingredient_name: str) -> None:
+        """Forget every recipe using the ingredient, directly or nested."""
+        for recipe_name in self._ingredient_dependents.pop(ingredient_name, ()):
+            self.invalidate(recipe_name)
+
+    def clear(self) -> None:
+        self._profiles.clear()
+        self._fingerprints.clear()
+        self._references.clear()
+        self._dependents.clear()
+        self._sub_recipes.clear()
+        self._base_ingredients.clear()
+        self._ingredient_dependents.clear()
+        self._rows.clear()
+
+    def _release(self, recipe_name: str, fingerprint: int) -> None:
+        """Unlink a forgotten recipe, dropping its profile and row if now unused."""
+        for users_by_name, names in (
+            (self._dependents, self._sub_recipes.pop(recipe_name, ())),
+            (self._ingredient_dependents, self._base_ingredients.pop(recipe_name, ())),
+        ):
+            for name in names:
+                users = users_by_name.get(name)
+                if users is not None:
+                    users.discard(recipe_name)
+                    if not users:
+                        del users_by_name[name]
+        count = self._references[fingerprint] - 1
+        if count:
+            self._references[fingerprint] = count
+        else:
+            del self._references[fingerprint]
+            del self._profiles[fingerprint]
+            self._rows.pop(fingerprint, None)
+
+    def _get_fuzzy(self) -> FuzzyNameIndex:
+        # The recipe map is not ours, so rebuild whenever its size changes.
+        if self._fuzzy is None or self._fuzzy[0] != len(self._recipes):
+            fuzzy = FuzzyNameIndex.from_names(self._recipes)
+            self._fuzzy = (len(self._recipes), fuzzy)
+        return self._fuzzy[1]
+
+    def _get_nutrient_row(self, profile: RecipeProfile) -> np.ndarray:
+        """Return the profile's nutrients per gram in column order.
+
+        Rows are cached per fingerprint and dropped with their profile. A row
+        cached before later nutrient columns existed is simply shorter, those
+        nutrients being zero.
+        """
+        row = self._rows.get(profile.fingerprint)
+        if row is None:
+            positions = [
+                self._nutrient_names.add(name) for name in profile.nutrient_g_per_g
+            ]
+            row = np.zeros(len(self._nutrient_names))
+            row[positions] = list(profile.nutrient_g_per_g.values())
+            self._rows[profile.fingerprint] = row
+        return row
+
+    def _resolve(self, recipe_name: str, stack: list[str]) -> RecipeProfile:
+        fingerprint = self._fingerprints.get(recipe_name)
+        if fingerprint is not None:
+            return self._profiles[fingerprint]
+
+        if recipe_name in stack:
+            cycle = stack[stack.index(recipe_name) :] + [recipe_name]
+            raise CircularRecipeError(recipe_names=cycle)
+
+        recipe = get_or_raise(
+            self._recipes, recipe_name, RecipeNotFoundError, names=self._get_fuzzy()
+        )
+
+        stack.append(recipe_name)
+        parts: list[tuple[str, float, int]] = []
+        sub_recipes: list[tuple[float, RecipeProfile]] = []
+        ingredients: list[tuple[float, Ingredient]] = []
+        for iq_name, iq in sorted(recipe.composition_ingredient_quantities.items()):
+            mass = iq.quantity.mass_in_grams
+            ingredient = iq.ingredient
+            if ingredient.use_as_recipe:
+                child = self._resolve(ingredient.name, stack)
+                self._dependents.setdefault(ingredient.name, set()).add(recipe_name)
+                self._sub_recipes.setdefault(recipe_name, set()).add(ingredient.name)
+                parts.append((iq_name, mass, child.fingerprint))
+                sub_recipes.append((mass, child))
+            else:
+                self._ingredient_dependents.setdefault(ingredient.name, set()).add(
+                    recipe_name
+                )
+                self._base_ingredients.setdefault(recipe_name, set()).add(
+                    ingredient.name
+                )
+                parts.append((iq_name, mass, hash(ingredient)))
+                ingredients.append((mass, ingredient))
+        stack.pop()
+
+        fingerprint = hash((recipe.servings, tuple(parts)))
+        profile = self._profiles.get(fingerprint)
+        if profile is None:
+            profile = _build_profile(
+                recipe_name=recipe_name,
+                fingerprint=fingerprint,
+                servings=recipe.servings,
+                sub_recipes=sub_recipes,
+                ingredients=ingredients,
+            )
+            self._profiles[fingerprint] = profile
+        self._fingerprints[recipe_name] = fingerprint
+        self._references[fingerprint] = self._references.get(fingerprint, 0) + 1
+        return profile
+
+
+def _build_profile(
+    *,
+    recipe_name: str,
+    fingerprint: int,
+    servings: int,
+    sub_recipes: list[tuple[float, RecipeProfile]],
+    ingredients: list[tuple[float, Ingredient]],
+) -> RecipeProfile:
+    total_mass = sum(mass for mass, _ in sub_recipes) + sum(
+        mass for mass, _ in ingredients
+    )
+    if total_mass <= 0:
+        raise NoIngredientQuantitiesError(recipe_name=recipe_name)
+
+    base: dict[str, float] = {}
+    nutrients: dict[str, float] = {}
+    cost_per_gram = 0.0
+    cals_per_gram = 0.0
+
+    for mass, ingredient in ingredients:
+        frac = mass / total_mass
+        base[ingredient.name] = base.get(ingredient.name, 0.0) + frac
+        for nutrient_name, ratio in ingredient.nutrient_ratios.items():
+            nutrients[nutrient_name] = (
+                nutrients.get(nutrient_name, 0.0) + frac * ratio.nutrient_perc
+            )
+        cost_per_gram += frac * ingredient.cost_ratio.cost_per_gram
+        cals_per_gram += frac * ingredient.calories_ratio.cals_per_gram
+
+    for mass, child in sub_recipes:
+        frac = mass / total_mass
+        for name, g_per_g in child.base_ingredient_g_per_g.items():
+            base[name] = base.get(name, 0.0) + frac * g_per_g
+        for name, g_per_g in child.nutrient_g_per_g.items():
+            nutrients[name] = nutrients.get(name, 0.0) + frac * g_per_g
+        cost_per_gram += frac * child.cost_per_gram
+        cals_per_gram += frac * child.cals_per_gram
+
+    return RecipeProfile(
+        fingerprint=fingerprint,
+        base_ingredient_g_per_g=base,
+        nutrient_g_per_g=nutrients,
+        cost_per_gram=cost_per_gram,
+        cals_per_gram=cals_per_gram,
+        mass_in_grams=total_mass,
+        servings=servings,
+    )
+
+
+__all__ = [
+    "RecipeProfile",
+    "ScaledRecipeProfile",
+    "ScaledProfileBatch",
+    "RecipeFlattener",
+]
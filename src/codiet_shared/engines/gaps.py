@@ -0,0 +1,203 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, Sequence
+
+import numpy as np
+
+from ..constants import DEFAULT_MASS_UNITS
+from ..exceptions.nutrients import UnknownNutrientError
+from ..exceptions.quantities import NegativeQuantityError, UnknownUnitError
+from ..exceptions.recipes import RecipeNotFoundError
+from ..indexes.names import get_or_raise
+from .columns import NameIndex, ProfileColumns
+
+if TYPE_CHECKING:
+    from ..dtos.recipes import RecipeQuantityDTO
+
+
+@dataclass(frozen=True)
+class PlannedQuantities:
+    """Sparse users x recipes matrix of planned grams, in CSR form.
+
+    The planned recipes of user `u` are `indices[indptr[u]:indptr[u + 1]]`
+    (recipe positions) with `grams` at the same offsets.
+    """
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    grams: np.ndarray
+
+    @classmethod
+    def from_sparse(cls, matrix: Any) -> PlannedQuantities:
+        """Wrap any CSR-like object exposing `indptr`, `indices` and `data`."""
+        return cls(
+            indptr=np.asarray(matrix.indptr, dtype=np.intp),
+            indices=np.asarray(matrix.indices, dtype=np.intp),
+            grams=np.asarray(matrix.data, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_recipe_quantity_dtos(
+        cls,
+        plans: Iterable[Sequence[RecipeQuantityDTO]],
+        recipe_names: NameIndex,
+        *,
+        mass_units: Mapping[str, float] = DEFAULT_MASS_UNITS,
+    ) -> PlannedQuantities:
+        """Build the matrix from each user's planned recipe quantities."""
+        indptr = [0]
+        indices: list[int] = []
+        grams: list[float] = []
+        for plan in plans:
+            for dto in plan:
+                recipe = get_or_raise(
+                    recipe_names, dto["recipe_name"], RecipeNotFoundError
+                )
+                grams_per_unit = mass_units.get(dto["quantity_unit_name"])
+                if grams_per_unit is None:
+                    raise UnknownUnitError(dto["quantity_unit_name"])
+                if dto["quantity_value"] < 0:
+                    raise NegativeQuantityError(dto["quantity_value"])
+                indices.append(recipe)
+                grams.append(dto["quantity_value"] * grams_per_unit)
+            indptr.append(len(indices))
+        return cls(
+            indptr=np.asarray(indptr, dtype=np.intp),
+            indices=np.asarray(indices, dtype=np.intp),
+            grams=np.asarray(grams, dtype=np.float64),
+        )
+
+    @property
+    def n_users(self) -> int:
+        return len(self.indptr) - 1
+
+
+@dataclass(frozen=True)
+class NutrientGaps:
+    """Nutrient totals against targets for the users `start` onwards.
+
+    `deltas` are totals minus targets, so shortfalls are negative.
+    `percentages` are totals as a percentage of target, NaN where the target
+    is zero.
+    """
+
+    start: int
+    totals: np.ndarray
+    deltas: np.ndarray
+    percentages: np.ndarray
+
+    @property
+    def stop(self) -> int:
+        return self.start + len(self.totals)
+
+    @property
+    def shortfalls(self) -> np.ndarray:
+        return self.deltas < 0
+
+    @property
+    def excesses(self) -> np.ndarray:
+        return self.deltas > 0
+
+
+class NutrientGapAnalyzer:
+    """Compares many users' planned meals with their nutrient targets.
+
+    Totals are a sparse-dense product of the planned grams with the recipes'
+    per-gram nutrient columns. Users are processed in chunks, so peak memory
+    depends on `chunk_size` rather than on the number of users.
+    """
+
+    def __init__(
+        self, recipes: ProfileColumns, nutrient_names: Sequence[str]
+    ) -> None:
+        for name in nutrient_names:
+            get_or_raise(recipes.nutrient_names, name, UnknownNutrientError)
+        self._nutrient_names = list(nutrient_names)
+        self._per_gram = np.ascontiguousarray(
+            recipes.nutrient_g_per_g[
+                :, recipes.nutrient_names.get_positions(nutrient_names)
+            ]
+        )
+
+    @property
+    def nutrient_names(self) -> list[str]:
+        return self._nutrient_names
+
+    def iter_gaps(
+        self,
+        plans: PlannedQuantities,
+        targets: np.ndarray,
+        *,
+        chunk_size: int = 1 << 16,
+    ) -> Iterator[NutrientGaps]:
+        """Yield gaps for consecutive chunks of at most `chunk_size` users.
+
+        `targets` holds one row per user and one column per analysed
+        nutrient, in grams.
+        """
+        expected = (plans.n_users, len(self._nutrient_names))
+        if targets.shape != expected:
+            raise ValueError(f"targets must have shape {expected}")
+        for start in range(0, plans.n_users, chunk_size):
+            stop = min(start + chunk_size, plans.n_users)
+            totals = self._get_totals(plans, start, stop)
+            chunk_targets = targets[start:stop]
+            percentages = np.full(totals.shape, np.nan)
+            np.divide(
+                100.0 * totals,
+                chunk_targets,
+                out=percentages,
+                where=chunk_targets != 0,
+            )
+            yield NutrientGaps(
+                start=start,
+                totals=totals,
+                deltas=totals - chunk_targets,
+                percentages=percentages,
+            )
+
+    def get_gaps(
+        self,
+        plans: PlannedQuantities,
+        targets: np.ndarray,
+        *,
+        chunk_size: int = 1 << 16,
+    ) -> NutrientGaps:
+        """Return the gaps of every user at once."""
+        chunks = list(self.iter_gaps(plans, targets, chunk_size=chunk_size))
+        if not chunks:
+            empty = np.empty((0, len(self._nutrient_names)))
+            return NutrientGaps(start=0, totals=empty, deltas=empty, percentages=empty)
+        return NutrientGaps(
+            start=0,
+            totals=np.concatenate([chunk.totals for chunk in chunks]),
+            deltas=np.concatenate([chunk.deltas for chunk in chunks]),
+            percentages=np.concatenate([chunk.percentages for chunk in chunks]),
+        )
+
+    def _get_totals(
+        self, plans: PlannedQuantities, start: int, stop: int
+    ) -> np.ndarray:
+        totals = np.zeros((stop - start, len(self._nutrient_names)))
+        row_ptr = plans.indptr[start : stop + 1]
+        low, high = row_ptr[0], row_ptr[-1]
+        if high == low:
+            return totals
+        contributions = (
+            self._per_gram[plans.indices[low:high]]
+            * plans.grams[low:high, None]
+        )
+        # reduceat needs strictly valid offsets, so users with an empty plan
+        # are skipped and left at zero.
+        planned = np.diff(row_ptr) > 0
+        totals[planned] = np.add.reduceat(
+            contributions, row_ptr[:-1][planned] - low, axis=0
+        )
+        return totals
+
+
+__all__ = [
+    "PlannedQuantities",
+    "NutrientGaps",
+    "NutrientGapAnalyzer",
+]
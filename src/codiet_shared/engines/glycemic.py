@@ -0,0 +1,134 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable
+
+import numpy as np
+
+from ..exceptions.ingredients import IngredientNotFoundError
+from ..exceptions.nutrients import UnknownNutrientError
+from ..indexes.names import get_or_raise
+from .columns import NameIndex, ProfileColumns
+from .recompute import recompute_recipes
+
+if TYPE_CHECKING:
+    from ..protocols.ingredients import IngredientMap
+    from ..protocols.recipes import RecipeMap
+
+DEFAULT_CARBOHYDRATE_NAME = "carbohydrate"
+
+
+@dataclass(frozen=True)
+class GlycemicLoads:
+    """Glycemic load per gram, with how much of it is actually known.
+
+    `carb_coverage` is the share of carbohydrate coming from sources with a
+    known GI (1 when there is no carbohydrate). Sources of unknown GI add
+    nothing to `gl_per_gram`, so the load is a lower bound unless complete.
+    """
+
+    names: NameIndex
+    gl_per_gram: np.ndarray
+    carb_coverage: np.ndarray
+
+    @property
+    def is_complete(self) -> np.ndarray:
+        return self.carb_coverage >= 1.0 - 1e-9
+
+    def get_loads(self, names: Iterable[str], grams: np.ndarray) -> np.ndarray:
+        """Return the glycemic load of each named quantity in grams."""
+        return self.gl_per_gram[self.names.get_positions(names)] * grams
+
+
+@dataclass(frozen=True)
+class RecipeGlycemicLoads(GlycemicLoads):
+    mass_in_grams: np.ndarray
+    servings: np.ndarray
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.gl_per_gram * self.mass_in_grams
+
+    @property
+    def per_serving(self) -> np.ndarray:
+        return self.total / self.servings
+
+
+class GlycemicLoadEngine:
+    """Derives glycemic load for the whole catalog from GI and carbohydrate.
+
+    An ingredient's load per gram is `gi / 100 * carbohydrate g/g`, with a
+    missing `gi` masked out. Recipes are rolled up in one pass through
+    `recompute_recipes` by treating the load, known-GI carbohydrate and
+    total carbohydrate as three nutrient columns.
+    """
+
+    def __init__(
+        self,
+        ingredients: IngredientMap,
+        columns: ProfileColumns,
+        *,
+        carbohydrate_name: str = DEFAULT_CARBOHYDRATE_NAME,
+    ) -> None:
+        carbs_col = get_or_raise(
+            columns.nutrient_names, carbohydrate_name, UnknownNutrientError
+        )
+        gi = np.empty(len(columns.names), dtype=np.float64)
+        for row, name in enumerate(columns.names):
+            value = get_or_raise(ingredients, name, IngredientNotFoundError).gi
+            gi[row] = np.nan if value is None else value
+
+        carbs = columns.nutrient_g_per_g[:, carbs_col]
+        has_gi = ~np.isnan(gi)
+        self._columns = columns
+        self._gl_per_gram = np.where(has_gi, np.nan_to_num(gi) / 100.0 * carbs, 0.0)
+        self._known_carbs = np.where(has_gi, carbs, 0.0)
+        self._carbs = carbs
+        self._ingredient_loads = GlycemicLoads(
+            names=columns.names,
+            gl_per_gram=self._gl_per_gram,
+            carb_coverage=_get_coverage(self._known_carbs, carbs),
+        )
+
+    @property
+    def ingredient_loads(self) -> GlycemicLoads:
+        return self._ingredient_loads
+
+    def get_recipe_loads(
+        self, recipes: RecipeMap, *, max_workers: int = 1
+    ) -> RecipeGlycemicLoads:
+        n_ingredients = len(self._columns.names)
+        load_columns = ProfileColumns(
+            names=self._columns.names,
+            nutrient_names=NameIndex(["gl", "known_carbs", "carbs"]),
+            flag_names=NameIndex(),
+            nutrient_g_per_g=np.column_stack(
+                [self._gl_per_gram, self._known_carbs, self._carbs]
+            ),
+            cost_per_gram=np.zeros(n_ingredients),
+            cals_per_gram=np.zeros(n_ingredients),
+            flags_true=np.zeros((n_ingredients, 0), dtype=bool),
+            flags_false=np.zeros((n_ingredients, 0), dtype=bool),
+        )
+        rolled = recompute_recipes(recipes, load_columns, max_workers=max_workers)
+        gl, known_carbs, carbs = rolled.nutrient_g_per_g.T
+        return RecipeGlycemicLoads(
+            names=rolled.names,
+            gl_per_gram=gl,
+            carb_coverage=_get_coverage(known_carbs, carbs),
+            mass_in_grams=rolled.mass_in_grams,
+            servings=rolled.servings,
+        )
+
+
+def _get_coverage(known_carbs: np.ndarray, carbs: np.ndarray) -> np.ndarray:
+    return np.divide(
+        known_carbs, carbs, out=np.ones_like(carbs), where=carbs > 0
+    )
+
+
+__all__ = [
+    "DEFAULT_CARBOHYDRATE_NAME",
+    "GlycemicLoads",
+    "RecipeGlycemicLoads",
+    "GlycemicLoadEngine",
+]
@@ -0,0 +1,187 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Mapping, Sequence
+
+import numpy as np
+
+from ..constants import DEFAULT_MASS_UNITS
+from ..exceptions.meal_plans import MealSlotNotFoundError
+from ..exceptions.quantities import NegativeQuantityError, UnknownUnitError
+from ..exceptions.recipes import RecipeNotFoundError
+from ..indexes.names import get_or_raise
+from .columns import NameIndex, ProfileColumns
+
+if TYPE_CHECKING:
+    from ..dtos.meal_plans import MealPlanDTO
+    from ..protocols.meal_plans import MealPlan
+
+_EMPTY = -1
+
+
+class MealPlanTotals:
+    """Vectorised nutrient, cost and calorie totals for one meal plan.
+
+    Slots form a days x meals grid holding a recipe position (-1 when empty)
+    and a mass in grams. Each recipe's per-gram nutrients, cost and calories
+    are kept as one row of a values matrix, so per-slot contributions are a
+    single gather-and-scale. Daily totals are cached and adjusted by the
+    difference when one slot is edited.
+    """
+
+    def __init__(
+        self,
+        recipes: ProfileColumns,
+        *,
+        num_days: int,
+        meal_names: Sequence[str],
+    ) -> None:
+        self._recipe_names = recipes.names
+        self._nutrient_names = recipes.nutrient_names
+        self._meal_names = NameIndex(meal_names)
+        # Columns: nutrients..., cost, calories.
+        self._values = np.column_stack(
+            [recipes.nutrient_g_per_g, recipes.cost_per_gram, recipes.cals_per_gram]
+        )
+        shape = (num_days, len(self._meal_names))
+        self._recipes = np.full(shape, _EMPTY, dtype=np.intp)
+        self._grams = np.zeros(shape, dtype=np.float64)
+        self._daily = np.zeros((num_days, self._values.shape[1]))
+
+    @classmethod
+    def from_meal_plan(
+        cls, meal_plan: MealPlan, recipes: ProfileColumns
+    ) -> MealPlanTotals:
+        totals = cls(
+            recipes, num_days=meal_plan.num_days, meal_names=meal_plan.meal_names
+        )
+        for (day, meal_name), recipe_quantity in meal_plan.slots.items():
+            totals._fill_slot(
+                day,
+                meal_name,
+                recipe_quantity.recipe.name,
+                recipe_quantity.quantity.mass_in_grams,
+            )
+        totals.recompute()
+        return totals
+
+    @classmethod
+    def from_meal_plan_dto(
+        cls,
+        meal_plan_dto: MealPlanDTO,
+        recipes: ProfileColumns,
+        *,
+        mass_units: Mapping[str, float] = DEFAULT_MASS_UNITS,
+    ) -> MealPlanTotals:
+        totals = cls(
+            recipes,
+            num_days=meal_plan_dto["num_days"],
+            meal_names=meal_plan_dto["meal_names"],
+        )
+        for slot in meal_plan_dto["slots"]:
+            recipe_quantity = slot["recipe_quantity"]
+            grams_per_unit = mass_units.get(recipe_quantity["quantity_unit_name"])
+            if grams_per_unit is None:
+                raise UnknownUnitError(recipe_quantity["quantity_unit_name"])
+            totals._fill_slot(
+                slot["day"],
+                slot["meal_name"],
+                recipe_quantity["recipe_name"],
+                recipe_quantity["quantity_value"] * grams_per_unit,
+            )
+        totals.recompute()
+        return totals
+
+    @property
+    def num_days(self) -> int:
+        return len(self._recipes)
+
+    @property
+    def meal_names(self) -> list[str]:
+        return self._meal_names.names
+
+    @property
+    def nutrient_names(self) -> list[str]:
+        return self._nutrient_names.names
+
+    def set_slot(
+        self, day: int, meal_name: str, recipe_name: str, grams: float
+    ) -> None:
+        """Fill or replace one slot, adjusting that day's totals only."""
+        old = self._get_slot_contribution(day, meal_name)
+        self._fill_slot(day, meal_name, recipe_name, grams)
+        self._daily[day] += self._get_slot_contribution(day, meal_name) - old
+
+    def clear_slot(self, day: int, meal_name: str) -> None:
+        old = self._get_slot_contribution(day, meal_name)
+        meal = self._get_meal(day, meal_name)
+        self._recipes[day, meal] = _EMPTY
+        self._grams[day, meal] = 0.0
+        self._daily[day] -= old
+
+    def recompute(self) -> None:
+        """Rebuild the daily totals from scratch, discarding rounding drift."""
+        self._daily = self.get_slot_contributions().sum(axis=1)
+
+    def get_slot_contributions(self) -> np.ndarray:
+        """Return a days x meals x values array of each slot's contribution.
+
+        The last axis holds each nutrient in grams, then cost, then calories.
+        """
+        filled = self._recipes != _EMPTY
+        contributions = np.zeros(self._recipes.shape + (self._values.shape[1],))
+        contributions[filled] = (
+            self._values[self._recipes[filled]] * self._grams[filled, None]
+        )
+        return contributions
+
+    @property
+    def daily_nutrient_masses(self) -> np.ndarray:
+        return self._daily[:, :-2]
+
+    @property
+    def daily_cost(self) -> np.ndarray:
+        return self._daily[:, -2]
+
+    @property
+    def daily_calories(self) -> np.ndarray:
+        return self._daily[:, -1]
+
+    def get_rolling_averages(self, window: int = 7) -> np.ndarray:
+        """Return trailing `window`-day means of the daily totals.
+
+        Day `d` averages days `max(0, d - window + 1)` to `d`, so the first
+        days average over the days available so far.
+        """
+        if window <= 0:
+            raise ValueError(f"window must be positive, got {window}")
+        cumulative = np.cumsum(self._daily, axis=0)
+        sums = cumulative.copy()
+        sums[window:] -= cumulative[:-window]
+        counts = np.minimum(np.arange(1, self.num_days + 1), window)
+        return sums / counts[:, None]
+
+    def _get_meal(self, day: int, meal_name: str) -> int:
+        if not 0 <= day < self.num_days or meal_name not in self._meal_names:
+            raise MealSlotNotFoundError(day=day, meal_name=meal_name)
+        return self._meal_names.get_position(meal_name)
+
+    def _fill_slot(
+        self, day: int, meal_name: str, recipe_name: str, grams: float
+    ) -> None:
+        meal = self._get_meal(day, meal_name)
+        recipe = get_or_raise(self._recipe_names, recipe_name, RecipeNotFoundError)
+        if grams < 0:
+            raise NegativeQuantityError(grams)
+        self._recipes[day, meal] = recipe
+        self._grams[day, meal] = grams
+
+    def _get_slot_contribution(self, day: int, meal_name: str) -> np.ndarray:
+        meal = self._get_meal(day, meal_name)
+        recipe = self._recipes[day, meal]
+        if recipe == _EMPTY:
+            return np.zeros(self._values.shape[1])
+        return self._values[recipe] * self._grams[day, meal]
+
+
+__all__ = [
+    "MealPlanTotals",
+]
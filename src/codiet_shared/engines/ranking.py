@@ -0,0 +1,142 @@
+from __future__ import annotations
+from typing import Callable
+
+import numpy as np
+
+from ..exceptions.nutrients import UnknownNutrientError
+from ..indexes.names import get_or_raise
+from .columns import ProfileColumns
+
+
+class Score:
+    """A score expression evaluated over whole columns at once.
+
+    Scores combine with the arithmetic operators and with plain numbers, for
+    example `nutrient("protein") / field("cost_per_gram")` for grams of
+    protein per pound spent.
+    """
+
+    __slots__ = ("_evaluate",)
+
+    def __init__(self, evaluate: Callable[[ProfileColumns], np.ndarray]) -> None:
+        self._evaluate = evaluate
+
+    def evaluate(self, columns: ProfileColumns) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.asarray(self._evaluate(columns), dtype=np.float64)
+
+    def _combine(
+        self, other: Score | float, op: Callable[[np.ndarray, np.ndarray], np.ndarray]
+    ) -> Score:
+        if isinstance(other, Score):
+            return Score(lambda c: op(self._evaluate(c), other._evaluate(c)))
+        return Score(lambda c: op(self._evaluate(c), other))
+
+    def _rcombine(
+        self, other: float, op: Callable[[np.ndarray, np.ndarray], np.ndarray]
+    ) -> Score:
+        return Score(lambda c: op(other, self._evaluate(c)))
+
+    def __add__(self, other: Score | float) -> Score:
+        return self._combine(other, np.add)
+
+    def __radd__(self, other: float) -> Score:
+        return self._rcombine(other, np.add)
+
+    def __sub__(self, other: Score | float) -> Score:
+        return self._combine(other, np.subtract)
+
+    def __rsub__(self, other: float) -> Score:
+        return self._rcombine(other, np.subtract)
+
+    def __mul__(self, other: Score | float) -> Score:
+        return self._combine(other, np.multiply)
+
+    def __rmul__(self, other: float) -> Score:
+        return self._rcombine(other, np.multiply)
+
+    def __truediv__(self, other: Score | float) -> Score:
+        return self._combine(other, np.divide)
+
+    def __rtruediv__(self, other: float) -> Score:
+        return self._rcombine(other, np.divide)
+
+    def __neg__(self) -> Score:
+        return Score(lambda c: np.negative(self._evaluate(c)))
+
+
+def nutrient(nutrient_name: str) -> Score:
+    """Grams of the nutrient per gram of each entity."""
+
+    def evaluate(columns: ProfileColumns) -> np.ndarray:
+        col = get_or_raise(columns.nutrient_names, nutrient_name, UnknownNutrientError)
+        return columns.nutrient_g_per_g[:, col]
+
+    return Score(evaluate)
+
+
+def field(field_name: str) -> Score:
+    """A per-entity array attribute of the columns, such as `cost_per_gram`."""
+    return Score(lambda columns: getattr(columns, field_name))
+
+
+def top_k(
+    scores: np.ndarray,
+    k: int,
+    *,
+    mask: np.ndarray | None = None,
+    largest: bool = True,
+) -> np.ndarray:
+    """Return the positions of the best `k` finite scores, best first.
+
+    Selection uses `argpartition`, so only the `k` winners (and any scores
+    tied with the last of them) are fully sorted. Ties are broken by
+    position to keep results deterministic.
+    """
+    keys = scores if largest else -scores
+    candidates = np.flatnonzero(mask) if mask is not None else np.arange(len(keys))
+    keys = keys[candidates]
+    finite = np.isfinite(keys)
+    if not finite.all():
+        candidates = candidates[finite]
+        keys = keys[finite]
+    if k <= 0 or len(keys) == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(keys):
+        # The partition picks arbitrary members of a tie at the k-th key, so
+        # take all of them and let the sort below choose by position.
+        kth_key = keys[np.argpartition(-keys, k - 1)[k - 1]]
+        winners = np.flatnonzero(keys >= kth_key)
+    else:
+        winners = np.arange(len(keys))
+    order = np.lexsort((candidates[winners], -keys[winners]))[:k]
+    return candidates[winners[order]]
+
+
+class Ranker:
+    """Ranks the entities of a set of columns by score expressions."""
+
+    def __init__(self, columns: ProfileColumns) -> None:
+        self._columns = columns
+
+    def rank(
+        self,
+        score: Score,
+        k: int,
+        *,
+        mask: np.ndarray | None = None,
+        largest: bool = True,
+    ) -> list[tuple[str, float]]:
+        scores = score.evaluate(self._columns)
+        positions = top_k(scores, k, mask=mask, largest=largest)
+        names = self._columns.names.names
+        return [(names[pos], float(scores[pos])) for pos in positions]
+
+
+__all__ = [
+    "Score",
+    "nutrient",
+    "field",
+    "top_k",
+    "Ranker",
+]
@@ -0,0 +1,393 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable
+
+import numpy as np
+
+from ..exceptions.ingredients import IngredientNotFoundError
+from ..exceptions.recipes import (
+    CircularRecipeError,
+    NoIngredientQuantitiesError,
+    RecipeNotFoundError,
+)
+from ..indexes.names import get_or_raise
+from .columns import NameIndex, ProfileColumns
+
+if TYPE_CHECKING:
+    from ..protocols.recipes import Recipe, RecipeMap
+
+
+@dataclass(frozen=True)
+class RecipeContributions:
+    """What each composition line adds to its recipe, per gram of recipe.
+
+    Lines are stored CSR-style: the lines of recipe `r` are rows
+    `indptr[r]:indptr[r + 1]` of `values`, whose columns are the nutrients,
+    then cost, then calories. `sources` index ingredients first and recipes
+    (for sub-recipe lines) after them, as in `source_names`.
+    """
+
+    recipe_names: NameIndex
+    source_names: list[str]
+    indptr: np.ndarray
+    sources: np.ndarray
+    values: np.ndarray
+    mass_in_grams: np.ndarray
+
+    def get_source_names(self, recipe_name: str) -> list[str]:
+        start, stop = self._get_bounds(recipe_name)
+        return [self.source_names[i] for i in self.sources[start:stop]]
+
+    def get_matrix(self, recipe_name: str, *, per_gram: bool = False) -> np.ndarray:
+        """Return the recipe's line x (nutrients, cost, calories) matrix.
+
+        Per gram of recipe this is a view into `values`; otherwise it is
+        scaled to the recipe's composition mass.
+        """
+        start, stop = self._get_bounds(recipe_name)
+        matrix = self.values[start:stop]
+        if per_gram:
+            return matrix
+        pos = self.recipe_names.get_position(recipe_name)
+        return matrix * self.mass_in_grams[pos]
+
+    def get_batch(
+        self, recipe_names: Iterable[str]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (recipe position, source, contribution in grams) rows for
+        all lines of several recipes at once."""
+        positions = self.recipe_names.get_positions(recipe_names)
+        starts = self.indptr[positions]
+        lengths = self.indptr[positions + 1] - starts
+        owners = np.repeat(positions, lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths
+        )
+        rows = np.repeat(starts, lengths) + offsets
+        return (
+            owners,
+            self.sources[rows],
+            self.values[rows] * self.mass_in_grams[owners, None],
+        )
+
+    def _get_bounds(self, recipe_name: str) -> tuple[int, int]:
+        pos = get_or_raise(self.recipe_names, recipe_name, RecipeNotFoundError)
+        return int(self.indptr[pos]), int(self.indptr[pos + 1])
+
+
+@dataclass(frozen=True)
+class RecipeColumns(ProfileColumns):
+    """Recomputed recipe profiles, plus the composition mass and servings."""
+
+    mass_in_grams: np.ndarray
+    servings: np.ndarray
+    contributions: RecipeContributions | None = None
+
+    @property
+    def nutrient_masses(self) -> np.ndarray:
+        return self.nutrient_g_per_g * self.mass_in_grams[:, None]
+
+    @property
+    def total_cost(self) -> np.ndarray:
+        return self.cost_per_gram * self.mass_in_grams
+
+    @property
+    def calories(self) -> np.ndarray:
+        return self.cals_per_gram * self.mass_in_grams
+
+
+@dataclass(frozen=True)
+class _ChunkPayload:
+    """Compact CSR description of a batch of recipes for a worker process.
+
+    `indices` refer to rows of the gathered `values`/flag arrays rather than
+    to the whole catalog, so only the rows a chunk reads are shipped.
+    """
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    fractions: np.ndarray
+    values: np.ndarray
+    flags_true: np.ndarray
+    flags_false: np.ndarray
+    keep_lines: bool
+
+
+@dataclass(frozen=True)
+class _RecipeEdges:
+    sources: np.ndarray
+    fractions: np.ndarray
+    sub_recipes: tuple[int, ...]
+
+
+def schedule_recipe_levels(recipes: RecipeMap) -> list[list[str]]:
+    """Group recipes into levels that only depend on earlier levels."""
+    names = NameIndex(recipes.keys())
+    children = [
+        _get_sub_recipe_positions(recipe, names) for recipe in recipes.values()
+    ]
+    levels = _schedule_levels(children, names)
+    return [[names.names[pos] for pos in level] for level in levels]
+
+
+def recompute_recipes(
+    recipes: RecipeMap,
+    ingredients: ProfileColumns,
+    *,
+    max_workers: int = 1,
+    chunk_size: int = 512,
+    with_contributions: bool = False,
+) -> RecipeColumns:
+    """Recompute per-gram nutrients, cost, calories and flags for every recipe.
+
+    Recipes are processed level by level so each sub-recipe is finished
+    before the recipes using it. With `max_workers > 1` the chunks of each
+    level run on a process pool; chunking does not depend on the worker
+    count, so the result is identical to the serial run. With
+    `with_contributions` the weighted lines summed into each total are kept
+    as `RecipeColumns.contributions`.
+    """
+    recipe_names = NameIndex(recipes.keys())
+    n_ingredients = len(ingredients.names)
+    n_nutrients = len(ingredients.nutrient_names)
+
+    edges: list[_RecipeEdges] = []
+    mass_in_grams = np.empty(len(recipe_names), dtype=np.float64)
+    servings = np.empty(len(recipe_names), dtype=np.float64)
+    for pos, (recipe_name, recipe) in enumerate(recipes.items()):
+        recipe_edges, mass = _extract_edges(
+            recipe_name, recipe, recipe_names, ingredients.names
+        )
+        edges.append(recipe_edges)
+        mass_in_grams[pos] = mass
+        servings[pos] = recipe.servings
+    levels = _schedule_levels([e.sub_recipes for e in edges], recipe_names)
+
+    # Ingredient rows come first in the source space, recipe rows follow.
+    n_cols = n_nutrients + 2
+    n_flags = len(ingredients.flag_names)
+    n_sources = n_ingredients + len(recipe_names)
+    values = np.zeros((n_sources, n_cols), dtype=np.float64)
+    values[:n_ingredients, :n_nutrients] = ingredients.nutrient_g_per_g
+    values[:n_ingredients, n_nutrients] = ingredients.cost_per_gram
+    values[:n_ingredients, n_nutrients + 1] = ingredients.cals_per_gram
+    flags_true = np.zeros((n_sources, n_flags), dtype=bool)
+    flags_false = np.zeros((n_sources, n_flags), dtype=bool)
+    flags_true[:n_ingredients] = ingredients.flags_true
+    flags_false[:n_ingredients] = ingredients.flags_false
+
+    line_ptr = np.zeros(len(recipe_names) + 1, dtype=np.intp)
+    np.cumsum([len(e.sources) for e in edges], out=line_ptr[1:])
+    line_values = (
+        np.empty((line_ptr[-1], n_cols), dtype=np.float64)
+        if with_contributions
+        else None
+    )
+
+    executor = ProcessPoolExecutor(max_workers) if max_workers > 1 else None
+    try:
+        for level in levels:
+            chunks = [
+                level[start : start + chunk_size]
+                for start in range(0, len(level), chunk_size)
+            ]
+            payloads = [
+                _build_payload(
+                    [edges[pos] for pos in chunk],
+                    values,
+                    flags_true,
+                    flags_false,
+                    with_contributions,
+                )
+                for chunk in chunks
+            ]
+            if executor is not None and len(payloads) > 1:
+                results = executor.map(_compute_chunk, payloads)
+            else:
+                results = map(_compute_chunk, payloads)
+            for chunk, payload, result in zip(chunks, payloads, results):
+                chunk_values, chunk_true, chunk_false, chunk_lines = result
+                rows = n_ingredients + np.asarray(chunk, dtype=np.intp)
+                values[rows] = chunk_values
+                flags_true[rows] = chunk_true
+                flags_false[rows] = chunk_false
+                if line_values is not None:
+                    for i, pos in enumerate(chunk):
+                        line_values[line_ptr[pos] : line_ptr[pos + 1]] = chunk_lines[
+                            payload.indptr[i] : payload.indptr[i + 1]
+                        ]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    contributions = None
+    if line_values is not None:
+        contributions = RecipeContributions(
+            recipe_names=recipe_names,
+            source_names=ingredients.names.names + recipe_names.names,
+            indptr=line_ptr,
+            sources=np.concatenate(
+                [e.sources for e in edges] or [np.empty(0, dtype=np.intp)]
+            ),
+            values=line_values,
+            mass_in_grams=mass_in_grams,
+        )
+
+    recipe_values = values[n_ingredients:]
+    return RecipeColumns(
+        names=recipe_names,
+        nutrient_names=ingredients.nutrient_names,
+        flag_names=ingredients.flag_names,
+        nutrient_g_per_g=recipe_values[:, :n_nutrients],
+        cost_per_gram=recipe_values[:, n_nutrients],
+        cals_per_gram=recipe_values[:, n_nutrients + 1],
+        flags_true=flags_true[n_ingredients:],
+        flags_false=flags_false[n_ingredients:],
+        mass_in_grams=mass_in_grams,
+        servings=servings,
+        contributions=contributions,
+    )
+
+
+def _get_sub_recipe_positions(
+    recipe: Recipe, recipe_names: NameIndex
+) -> tuple[int, ...]:
+    positions = []
+    for iq in recipe.composition_ingredient_quantities.values():
+        ingredient = iq.ingredient
+        if not ingredient.use_as_recipe:
+            continue
+        positions.append(
+            get_or_raise(recipe_names, ingredient.name, RecipeNotFoundError)
+        )
+    return tuple(positions)
+
+
+def _extract_edges(
+    recipe_name: str,
+    recipe: Recipe,
+    recipe_names: NameIndex,
+    ingredient_names: NameIndex,
+) -> tuple[_RecipeEdges, float]:
+    n_ingredients = len(ingredient_names)
+    sources: list[int] = []
+    masses: list[float] = []
+    sub_recipes: list[int] = []
+    for iq in recipe.composition_ingredient_quantities.values():
+        ingredient = iq.ingredient
+        if ingredient.use_as_recipe:
+            pos = get_or_raise(recipe_names, ingredient.name, RecipeNotFoundError)
+            sub_recipes.append(pos)
+            sources.append(n_ingredients + pos)
+        else:
+            sources.append(
+                get_or_raise(ingredient_names, ingredient.name, IngredientNotFoundError)
+            )
+        masses.append(iq.quantity.mass_in_grams)
+
+    mass_array = np.asarray(masses, dtype=np.float64)
+    total_mass = float(mass_array.sum())
+    if total_mass <= 0:
+        raise NoIngredientQuantitiesError(recipe_name=recipe_name)
+    recipe_edges = _RecipeEdges(
+        sources=np.asarray(sources, dtype=np.intp),
+        fractions=mass_array / total_mass,
+        sub_recipes=tuple(sub_recipes),
+    )
+    return recipe_edges, total_mass
+
+
+def _schedule_levels(
+    children: list[tuple[int, ...]], names: NameIndex
+) -> list[list[int]]:
+    """Kahn's algorithm in rounds; each round is one dependency level."""
+    remaining = [len(set(c)) for c in children]
+    dependents: list[list[int]] = [[] for _ in children]
+    for parent, parent_children in enumerate(children):
+        for child in set(parent_children):
+            dependents[child].append(parent)
+
+    levels: list[list[int]] = []
+    frontier = [pos for pos, count in enumerate(remaining) if count == 0]
+    scheduled = 0
+    while frontier:
+        levels.append(frontier)
+        scheduled += len(frontier)
+        next_frontier = []
+        for pos in frontier:
+            for parent in dependents[pos]:
+                remaining[parent] -= 1
+                if remaining[parent] == 0:
+                    next_frontier.append(parent)
+        frontier = sorted(next_frontier)
+
+    if scheduled < len(children):
+        cycle = _find_cycle(children, remaining, names)
+        raise CircularRecipeError(recipe_names=cycle)
+    return levels
+
+
+def _find_cycle(
+    children: list[tuple[int, ...]], remaining: list[int], names: NameIndex
+) -> list[str]:
+    # Every unscheduled recipe has an unscheduled child, so walking through
+    # them must eventually revisit one.
+    pos = next(p for p, count in enumerate(remaining) if count > 0)
+    path: list[int] = []
+    while pos not in path:
+        path.append(pos)
+        pos = next(c for c in children[pos] if remaining[c] > 0)
+    cycle = path[path.index(pos) :] + [pos]
+    return [names.names[p] for p in cycle]
+
+
+def _build_payload(
+    chunk_edges: list[_RecipeEdges],
+    values: np.ndarray,
+    flags_true: np.ndarray,
+    flags_false: np.ndarray,
+    keep_lines: bool,
+) -> _ChunkPayload:
+    lengths = np.fromiter((len(e.sources) for e in chunk_edges), dtype=np.intp)
+    indptr = np.zeros(len(chunk_edges) + 1, dtype=np.intp)
+    np.cumsum(lengths, out=indptr[1:])
+    sources = np.concatenate([e.sources for e in chunk_edges])
+    fractions = np.concatenate([e.fractions for e in chunk_edges])
+    unique_sources, local_indices = np.unique(sources, return_inverse=True)
+    return _ChunkPayload(
+        indptr=indptr,
+        indices=local_indices,
+        fractions=fractions,
+        values=values[unique_sources],
+        flags_true=flags_true[unique_sources],
+        flags_false=flags_false[unique_sources],
+        keep_lines=keep_lines,
+    )
+
+
+def _compute_chunk(
+    payload: _ChunkPayload,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray | None]:
+    starts = payload.indptr[:-1]
+    weighted = payload.values[payload.indices] * payload.fractions[:, None]
+    values = np.add.reduceat(weighted, starts, axis=0)
+    # A recipe flag is true only if every ingredient is known true, and false
+    # as soon as any ingredient is known false.
+    flags_true = np.logical_and.reduceat(
+        payload.flags_true[payload.indices], starts, axis=0
+    )
+    flags_false = np.logical_or.reduceat(
+        payload.flags_false[payload.indices], starts, axis=0
+    )
+    # The weighted lines are the contributions, so keeping them is free.
+    lines = weighted if payload.keep_lines else None
+    return values, flags_true, flags_false, lines
+
+
+__all__ = [
+    "RecipeContributions",
+    "RecipeColumns",
+    "schedule_recipe_levels",
+    "recompute_recipes",
+]
@@ -0,0 +1,180 @@
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Mapping
+
+import numpy as np
+
+from ..constants import DEFAULT_MASS_UNITS, GRAM_NAME
+from ..exceptions.ingredients import UndefinedIngredientUnitConvError
+from .columns import NameIndex
+
+if TYPE_CHECKING:
+    from ..dtos.ingredients import IngredientQuantityDTO
+    from ..protocols.ingredients import Ingredient
+    from ..protocols.quantities import UnitConversion
+    from ..protocols.recipes import Recipe, RecipeQuantity
+
+
+@dataclass(frozen=True)
+class ShoppingList:
+    """Consolidated ingredient quantities for one plan.
+
+    `errors` lists each ingredient and unit that could not be converted to
+    grams; those quantities are left out of `items`.
+    """
+
+    items: list[IngredientQuantityDTO]
+    errors: list[UndefinedIngredientUnitConvError]
+
+
+class ShoppingListBuilder:
+    """Consolidates the preparation ingredients of many plans at once.
+
+    Each (ingredient, unit) pair met is resolved once to a grams-per-unit
+    factor by walking the ingredient's unit conversions together with the
+    shared `unit_conversions`, and the factors are cached per ingredient.
+    Every line of every plan then becomes one entry in flat arrays, so
+    normalising and summing all plans is a multiply and a `bincount`.
+    Totals are finally expressed in each ingredient's purchase unit (its
+    standard unit unless overridden).
+    """
+
+    def __init__(
+        self,
+        *,
+        unit_conversions: Iterable[UnitConversion] = (),
+        mass_units: Mapping[str, float] = DEFAULT_MASS_UNITS,
+        purchase_units: Mapping[str, str] | None = None,
+    ) -> None:
+        self._shared_conversions = list(unit_conversions)
+        self._mass_units = mass_units
+        self._purchase_units = purchase_units or {}
+        self._grams_per_unit: dict[str, dict[str, float]] = {}
+
+    def invalidate(self, ingredient_name: str) -> None:
+        """Forget cached factors after an ingredient's conversions change."""
+        self._grams_per_unit.pop(ingredient_name, None)
+
+    def build(self, plan: Iterable[Recipe | RecipeQuantity]) -> ShoppingList:
+        return self.build_many([plan])[0]
+
+    def build_many(
+        self, plans: Iterable[Iterable[Recipe | RecipeQuantity]]
+    ) -> list[ShoppingList]:
+        ingredient_names = NameIndex()
+        ingredients: list[Ingredient] = []
+        pairs: dict[tuple[int, str], int] = {}
+        plan_ids: list[int] = []
+        pair_ids: list[int] = []
+        values: list[float] = []
+
+        n_plans = 0
+        for plan_id, plan in enumerate(plans):
+            n_plans += 1
+            for item in plan:
+                for name, iq in item.preparation_ingredient_quantities.items():
+                    row = ingredient_names.add(name)
+                    if row == len(ingredients):
+                        ingredients.append(iq.ingredient)
+                    pair = (row, iq.quantity.unit_name)
+                    plan_ids.append(plan_id)
+                    pair_ids.append(pairs.setdefault(pair, len(pairs)))
+                    values.append(iq.quantity.value)
+
+        factors = np.empty(len(pairs), dtype=np.float64)
+        for (row, unit_name), pair_id in pairs.items():
+            grams = self._get_grams_per_unit(ingredients[row]).get(unit_name)
+            factors[pair_id] = np.nan if grams is None else grams
+
+        n_ingredients = len(ingredient_names)
+        pair_array = np.asarray(pair_ids, dtype=np.intp)
+        plan_array = np.asarray(plan_ids, dtype=np.intp)
+        grams = np.asarray(values, dtype=np.float64) * factors[pair_array]
+        convertible = ~np.isnan(grams)
+        keys = plan_array * n_ingredients + np.fromiter(
+            (row for row, _ in pairs), dtype=np.intp, count=len(pairs)
+        )[pair_array]
+        totals = np.bincount(
+            keys[convertible],
+            weights=grams[convertible],
+            minlength=n_plans * n_ingredients,
+        ).reshape(n_plans, n_ingredients)
+        present = np.zeros(n_plans * n_ingredients, dtype=bool)
+        present[keys[convertible]] = True
+        present = present.reshape(n_plans, n_ingredients)
+
+        errors: list[list[UndefinedIngredientUnitConvError]] = [
+            [] for _ in range(n_plans)
+        ]
+        failed = np.unique(
+            plan_array[~convertible] * len(pairs) + pair_array[~convertible]
+        )
+        pair_keys = list(pairs)
+        for code in failed:
+            plan_id, pair_id = divmod(int(code), len(pairs))
+            row, unit_name = pair_keys[pair_id]
+            errors[plan_id].append(
+                UndefinedIngredientUnitConvError(ingredient_names.names[row], unit_name)
+            )
+
+        purchase = [self._get_purchase_unit(ingredient) for ingredient in ingredients]
+        shopping_lists = []
+        for plan_id in range(n_plans):
+            items: list[IngredientQuantityDTO] = []
+            for row in np.flatnonzero(present[plan_id]):
+                unit_name, grams_per_unit = purchase[row]
+                items.append(
+                    {
+                        "ingredient_name": ingredient_names.names[row],
+                        "quantity_unit_name": unit_name,
+                        "quantity_value": float(totals[plan_id, row] / grams_per_unit),
+                    }
+                )
+            shopping_lists.append(ShoppingList(items=items, errors=errors[plan_id]))
+        return shopping_lists
+
+    def _get_purchase_unit(self, ingredient: Ingredient) -> tuple[str, float]:
+        """Return the unit to buy the ingredient in, falling back to grams."""
+        unit_name = self._purchase_units.get(
+            ingredient.name, ingredient.standard_unit_name
+        )
+        grams = self._get_grams_per_unit(ingredient).get(unit_name)
+        if grams is None or grams <= 0:
+            return GRAM_NAME, 1.0
+        return unit_name, grams
+
+    def _get_grams_per_unit(self, ingredient: Ingredient) -> dict[str, float]:
+        cached = self._grams_per_unit.get(ingredient.name)
+        if cached is not None:
+            return cached
+
+        grams_per_unit = dict(self._mass_units)
+        conversions = [*self._shared_conversions, *ingredient.unit_conversions.values()]
+        neighbours: dict[str, list[UnitConversion]] = {}
+        for conversion in conversions:
+            for unit_name in conversion.unit_names:
+                neighbours.setdefault(unit_name, []).append(conversion)
+
+        # Breadth-first from every mass unit through the conversion graph.
+        queue = deque(grams_per_unit)
+        while queue:
+            unit_name = queue.popleft()
+            for conversion in neighbours.get(unit_name, ()):
+                for other in conversion.unit_names:
+                    if other in grams_per_unit:
+                        continue
+                    ratio = conversion.get_ratio(
+                        from_unit_name=other, to_unit_name=unit_name
+                    )
+                    grams_per_unit[other] = ratio * grams_per_unit[unit_name]
+                    queue.append(other)
+
+        self._grams_per_unit[ingredient.name] = grams_per_unit
+        return grams_per_unit
+
+
+__all__ = [
+    "ShoppingList",
+    "ShoppingListBuilder",
+]
@@ -0,0 +1,187 @@
+from __future__ import annotations
+from typing import Literal, Mapping, Sequence
+
+import numpy as np
+
+from ..exceptions.recipes import DuplicateRecipeError, RecipeNotFoundError
+from ..indexes.names import get_or_raise
+from .columns import NameIndex, ProfileColumns
+from .ranking import top_k
+
+SimilarityMetric = Literal["cosine", "euclidean"]
+
+
+class SimilarityIndex:
+    """k-nearest-neighbour search over per-100g nutrient vectors.
+
+    With the cosine metric vectors are stored unit-normalised and scored by
+    dot product (higher is closer). With the euclidean metric each nutrient
+    is scaled by the square root of its weight and scored by distance (lower
+    is closer). Setting `n_projections` buckets vectors by the signs of that
+    many random projections, and queries then only scan their own bucket,
+    falling back to a full scan when the bucket holds fewer than `k` rows.
+    """
+
+    def __init__(
+        self,
+        nutrient_names: NameIndex,
+        *,
+        metric: SimilarityMetric = "cosine",
+        weights: Mapping[str, float] | None = None,
+        n_projections: int = 0,
+        seed: int = 0,
+        block_size: int = 256,
+    ) -> None:
+        self._nutrient_names = nutrient_names
+        self._metric = metric
+        self._block_size = block_size
+        n_dims = len(nutrient_names)
+
+        scale = np.ones(n_dims, dtype=np.float64)
+        for name, weight in (weights or {}).items():
+            scale[nutrient_names.get_position(name)] = np.sqrt(weight)
+        self._scale = scale
+
+        self._names = NameIndex()
+        self._vectors = np.empty((0, n_dims), dtype=np.float64)
+        self._sq_norms = np.empty(0, dtype=np.float64)
+        self._size = 0
+
+        rng = np.random.default_rng(seed)
+        self._projections = rng.standard_normal((n_dims, n_projections))
+        self._bit_values = 1 << np.arange(n_projections, dtype=np.int64)
+        self._buckets: dict[int, list[int]] = {}
+
+    @classmethod
+    def from_columns(cls, columns: ProfileColumns, **kwargs) -> SimilarityIndex:
+        index = cls(columns.nutrient_names, **kwargs)
+        index.add(columns.names.names, columns.nutrient_g_per_g * 100.0)
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, names: Sequence[str], vectors_per_100g: np.ndarray) -> None:
+        """Insert new rows; storage grows geometrically like a list.
+
+        Nothing is inserted unless every name is new and there is one
+        vector per name.
+        """
+        batch: set[str] = set()
+        for name in names:
+            if name in self._names or name in batch:
+                raise DuplicateRecipeError(name)
+            batch.add(name)
+        prepared = self._prepare(np.atleast_2d(vectors_per_100g))
+        if len(prepared) != len(names):
+            raise ValueError(
+                f"Got {len(prepared)} vectors for {len(names)} names"
+            )
+
+        needed = self._size + len(prepared)
+        if needed > len(self._vectors):
+            capacity = max(needed, 2 * len(self._vectors), 64)
+            grown = np.empty((capacity, prepared.shape[1]), dtype=np.float64)
+            grown[: self._size] = self._vectors[: self._size]
+            self._vectors = grown
+            grown_norms = np.empty(capacity, dtype=np.float64)
+            grown_norms[: self._size] = self._sq_norms[: self._size]
+            self._sq_norms = grown_norms
+
+        rows = slice(self._size, needed)
+        self._vectors[rows] = prepared
+        self._sq_norms[rows] = np.einsum("ij,ij->i", prepared, prepared)
+        for name in names:
+            self._names.add(name)
+        if self._projections.shape[1]:
+            for pos, code in enumerate(self._codes(prepared), start=self._size):
+                self._buckets.setdefault(int(code), []).append(pos)
+        self._size = needed
+
+    def query(
+        self, vectors_per_100g: np.ndarray, k: int
+    ) -> list[list[tuple[str, float]]]:
+        """Return the `k` nearest rows for each query vector."""
+        queries = self._prepare(np.atleast_2d(vectors_per_100g))
+        return self._query_prepared(queries, k, exclude=None)
+
+    def query_names(
+        self, names: Sequence[str], k: int
+    ) -> list[list[tuple[str, float]]]:
+        """Return the `k` nearest rows to indexed rows, excluding themselves."""
+        positions = []
+        for name in names:
+            positions.append(get_or_raise(self._names, name, RecipeNotFoundError))
+        exclude = np.asarray(positions, dtype=np.intp)
+        return self._query_prepared(self._vectors[exclude], k, exclude=exclude)
+
+    def _prepare(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float64)
+        if self._metric == "cosine":
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            return np.divide(
+                vectors, norms, out=np.zeros_like(vectors), where=norms > 0
+            )
+        return vectors * self._scale
+
+    def _codes(self, prepared: np.ndarray) -> np.ndarray:
+        signs = prepared @ self._projections > 0
+        return signs @ self._bit_values
+
+    def _score(self, queries: np.ndarray, rows: np.ndarray | slice) -> np.ndarray:
+        """Return scores where larger is always closer."""
+        dots = queries @ self._vectors[rows].T
+        if self._metric == "cosine":
+            return dots
+        q_norms = np.einsum("ij,ij->i", queries, queries)
+        sq_dists = q_norms[:, None] + self._sq_norms[rows][None, :] - 2.0 * dots
+        return -np.sqrt(np.maximum(sq_dists, 0.0))
+
+    def _query_prepared(
+        self, queries: np.ndarray, k: int, exclude: np.ndarray | None
+    ) -> list[list[tuple[str, float]]]:
+        if self._projections.shape[1]:
+            return self._query_buckets(queries, k, exclude)
+
+        results: list[list[tuple[str, float]]] = []
+        all_rows = slice(0, self._size)
+        positions = np.arange(self._size)
+        for start in range(0, len(queries), self._block_size):
+            block = queries[start : start + self._block_size]
+            scores = self._score(block, all_rows)
+            if exclude is not None:
+                block_exclude = exclude[start : start + self._block_size]
+                scores[np.arange(len(block)), block_exclude] = -np.inf
+            for row_scores in scores:
+                results.append(self._top(row_scores, positions, k))
+        return results
+
+    def _query_buckets(
+        self, queries: np.ndarray, k: int, exclude: np.ndarray | None
+    ) -> list[list[tuple[str, float]]]:
+        results: list[list[tuple[str, float]]] = []
+        for i, code in enumerate(self._codes(queries)):
+            rows = np.asarray(self._buckets.get(int(code), ()), dtype=np.intp)
+            if exclude is not None:
+                rows = rows[rows != exclude[i]]
+            if len(rows) < k:
+                rows = np.arange(self._size)
+                if exclude is not None:
+                    rows = rows[rows != exclude[i]]
+            scores = self._score(queries[i : i + 1], rows)[0]
+            results.append(self._top(scores, rows, k))
+        return results
+
+    def _top(
+        self, scores: np.ndarray, rows: np.ndarray, k: int
+    ) -> list[tuple[str, float]]:
+        winners = top_k(scores, k)
+        sign = 1.0 if self._metric == "cosine" else -1.0
+        names = self._names.names
+        return [(names[rows[w]], sign * float(scores[w])) for w in winners]
+
+
+__all__ = [
+    "SimilarityMetric",
+    "SimilarityIndex",
+]
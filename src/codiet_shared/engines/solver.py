@@ -0,0 +1,182 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping
+
+import numpy as np
+
+from ..constants import GRAM_NAME
+from ..exceptions.cost import NegativeCostError
+from ..exceptions.nutrients import UnknownNutrientError
+from ..indexes.names import get_or_raise
+from .columns import ProfileColumns
+
+if TYPE_CHECKING:
+    from ..dtos.recipes import RecipeQuantityDTO
+
+
+@dataclass(frozen=True)
+class MealSolution:
+    quantities: list[RecipeQuantityDTO]
+    nutrient_totals: dict[str, float]
+    total_cost: float
+    iterations: int
+    converged: bool
+
+
+class MealSolver:
+    """Chooses recipe quantities that hit nutrient targets within a budget.
+
+    Solves the bounded, budget-constrained least-squares problem
+
+        min_x  0.5 * || D (A^T x - t) ||^2 + sparsity * sum(x)
+        s.t.   0 <= x <= max_grams,  cost . x <= budget
+
+    with accelerated projected gradient (FISTA), where `A` holds grams of
+    each nutrient per gram of recipe and `D` weights each target (by default
+    relative to its size). The projection onto the box and budget is exact,
+    found from the sorted breakpoints of the budget's Lagrange multiplier,
+    and momentum restarts whenever the objective rises. The solve stops once
+    an iteration moves `x`, or lowers the objective, by less than
+    `tolerance` relative to its size.
+    """
+
+    def __init__(self, recipes: ProfileColumns) -> None:
+        self._columns = recipes
+
+    def solve(
+        self,
+        targets: Mapping[str, float],
+        *,
+        budget: float | None = None,
+        candidates: np.ndarray | None = None,
+        weights: Mapping[str, float] | None = None,
+        max_grams: float = 500.0,
+        sparsity: float = 0.0,
+        min_grams: float = 1.0,
+        max_iterations: int = 2000,
+        tolerance: float = 1e-7,
+    ) -> MealSolution:
+        if budget is not None and budget < 0:
+            raise NegativeCostError(budget)
+        columns = self._columns
+        rows = (
+            np.flatnonzero(candidates)
+            if candidates is not None
+            else np.arange(len(columns.names))
+        )
+
+        nutrient_cols = []
+        target = np.empty(len(targets), dtype=np.float64)
+        scale = np.empty(len(targets), dtype=np.float64)
+        for i, (nutrient_name, grams) in enumerate(targets.items()):
+            col = get_or_raise(
+                columns.nutrient_names, nutrient_name, UnknownNutrientError
+            )
+            nutrient_cols.append(col)
+            target[i] = grams
+            if weights is not None and nutrient_name in weights:
+                scale[i] = weights[nutrient_name]
+            else:
+                scale[i] = 1.0 / grams if grams > 0 else 1.0
+
+        matrix = columns.nutrient_g_per_g[np.ix_(rows, nutrient_cols)] * scale
+        scaled_target = target * scale
+        cost = columns.cost_per_gram[rows]
+
+        # The Hessian `A A^T` shares its largest eigenvalue with the small
+        # targets x targets matrix `A^T A`.
+        lipschitz = np.linalg.eigvalsh(matrix.T @ matrix)[-1] if matrix.size else 0.0
+        step = 1.0 / lipschitz if lipschitz > 0 else 1.0
+
+        x = np.zeros(len(rows), dtype=np.float64)
+        y = x.copy()
+        objective = _get_objective(matrix, x, scaled_target, sparsity)
+        momentum = 1.0
+        converged = False
+        iteration = 0
+        for iteration in range(1, max_iterations + 1):
+            gradient = matrix @ (matrix.T @ y - scaled_target) + sparsity
+            x_next = _project(y - step * gradient, cost, max_grams, budget)
+            objective_next = _get_objective(matrix, x_next, scaled_target, sparsity)
+            if objective_next > objective:
+                # Adaptive restart: drop the momentum once it stops paying.
+                momentum = 1.0
+                y = x
+                continue
+            change = np.linalg.norm(x_next - x)
+            decrease = objective - objective_next
+            momentum_next = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * momentum * momentum))
+            y = x_next + ((momentum - 1.0) / momentum_next) * (x_next - x)
+            x, objective, momentum = x_next, objective_next, momentum_next
+            if change <= tolerance * max(1.0, np.linalg.norm(x)) or (
+                decrease <= tolerance * max(objective, tolerance)
+            ):
+                converged = True
+                break
+
+        names = columns.names.names
+        quantities: list[RecipeQuantityDTO] = [
+            {
+                "recipe_name": names[rows[i]],
+                "quantity_unit_name": GRAM_NAME,
+                "quantity_value": float(x[i]),
+            }
+            for i in np.flatnonzero(x >= min_grams)
+        ]
+        totals = x @ columns.nutrient_g_per_g[np.ix_(rows, nutrient_cols)]
+        return MealSolution(
+            quantities=quantities,
+            nutrient_totals={
+                name: float(total) for name, total in zip(targets, totals)
+            },
+            total_cost=float(cost @ x),
+            iterations=iteration,
+            converged=converged,
+        )
+
+
+def _get_objective(
+    matrix: np.ndarray, x: np.ndarray, target: np.ndarray, sparsity: float
+) -> float:
+    residual = matrix.T @ x - target
+    return 0.5 * float(residual @ residual) + sparsity * float(x.sum())
+
+
+def _project(
+    x: np.ndarray, cost: np.ndarray, max_grams: float, budget: float | None
+) -> np.ndarray:
+    """Project `x` onto `0 <= x <= max_grams, cost . x <= budget` exactly.
+
+    The projection is `clip(x - mu * cost)` for the smallest `mu >= 0` that
+    meets the budget. Spend as a function of `mu` is piecewise linear, with
+    a breakpoint wherever an item leaves its upper or lower bound, so the
+    sorted breakpoints locate the segment holding `mu` in one pass.
+    """
+    clipped = np.clip(x, 0.0, max_grams)
+    if budget is None or cost @ clipped <= budget:
+        return clipped
+    paid = cost > 0
+    c, v = cost[paid], x[paid]
+    # Below `(v - max_grams) / c` an item sits at max_grams; past `v / c`
+    # at zero; in between it spends `c * v - mu * c^2`.
+    points = np.concatenate(((v - max_grams) / c, v / c))
+    order = np.argsort(points)
+    points = points[order]
+    squares = c * c
+    slopes = np.cumsum(np.concatenate((-squares, squares))[order])
+    intercepts = float(c.sum()) * max_grams + np.cumsum(
+        np.concatenate((c * (v - max_grams), -c * v))[order]
+    )
+    # Spend at each breakpoint never increases along `points`.
+    k = int(np.argmax(intercepts + slopes * points <= budget))
+    if k == 0 or slopes[k - 1] == 0:
+        mu = points[k]
+    else:
+        mu = (budget - intercepts[k - 1]) / slopes[k - 1]
+    return np.clip(x - max(mu, 0.0) * cost, 0.0, max_grams)
+
+
+__all__ = [
+    "MealSolution",
+    "MealSolver",
+]
@@ -0,0 +1,127 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Collection, Mapping
+
+import numpy as np
+
+from ..exceptions.ingredients import IngredientNotFoundError
+from ..exceptions.nutrients import UnknownNutrientError
+from ..exceptions.recipes import NoIngredientQuantitiesError
+from ..indexes.names import get_or_raise
+from .columns import ProfileColumns
+from .ranking import top_k
+
+if TYPE_CHECKING:
+    from ..protocols.recipes import Recipe
+
+
+@dataclass(frozen=True)
+class Substitution:
+    ingredient_name: str
+    substitute_name: str
+    quantity_in_grams: float
+    nutrient_distance: float
+
+
+class SubstitutionEngine:
+    """Suggests flag-preserving ingredient substitutions for recipes.
+
+    Candidates must be known true for every flag that is true on the recipe;
+    this is checked against packed flag bitmasks for all ingredients at once.
+    Survivors are ranked by the weighted euclidean change they cause in the
+    recipe's per-100g nutrient profile when swapped in at the same mass.
+    """
+
+    def __init__(
+        self,
+        ingredients: ProfileColumns,
+        *,
+        weights: Mapping[str, float] | None = None,
+    ) -> None:
+        self._columns = ingredients
+        self._flag_bits = np.packbits(ingredients.flags_true, axis=1)
+        self._weights = np.ones(len(ingredients.nutrient_names), dtype=np.float64)
+        for name, weight in (weights or {}).items():
+            col = get_or_raise(ingredients.nutrient_names, name, UnknownNutrientError)
+            self._weights[col] = weight
+
+    def get_candidate_mask(self, flag_names: Collection[str]) -> np.ndarray:
+        """Return a mask of ingredients known true for all of the flags.
+
+        A flag no loaded ingredient defines, e.g. with a partial catalog,
+        cannot be known true for any of them, so the mask is all false.
+        """
+        required = np.zeros(len(self._columns.flag_names), dtype=bool)
+        for flag_name in flag_names:
+            if flag_name not in self._columns.flag_names:
+                return np.zeros(len(self._columns.names), dtype=bool)
+            required[self._columns.flag_names.get_position(flag_name)] = True
+        required_bits = np.packbits(required)
+        return np.all((self._flag_bits & required_bits) == required_bits, axis=1)
+
+    def suggest(
+        self,
+        recipe: Recipe,
+        *,
+        ingredient_names: Collection[str] | None = None,
+        k: int = 5,
+        excluded: Collection[str] = (),
+    ) -> dict[str, list[Substitution]]:
+        """Rank up to `k` substitutes for each ingredient of the recipe.
+
+        `ingredient_names` limits which ingredients are replaced (by default
+        every base ingredient in the composition), and `excluded` names
+        ingredients that must never be suggested.
+        """
+        names = self._columns.names
+        quantities = recipe.composition_ingredient_quantities
+        masses = {name: iq.quantity.mass_in_grams for name, iq in quantities.items()}
+        total_mass = sum(masses.values())
+        if total_mass <= 0:
+            raise NoIngredientQuantitiesError(recipe_name=recipe.name)
+
+        if ingredient_names is None:
+            targets = [name for name in quantities if name in names]
+        else:
+            targets = list(ingredient_names)
+            for name in targets:
+                get_or_raise(quantities, name, IngredientNotFoundError)
+                get_or_raise(names, name, IngredientNotFoundError)
+
+        true_flags = [
+            flag_name
+            for flag_name, flag in recipe.nutrient_flags.items()
+            if flag.value
+        ]
+        mask = self.get_candidate_mask(true_flags)
+        for name in excluded:
+            if name in names:
+                mask[names.get_position(name)] = False
+
+        nutrients = self._columns.nutrient_g_per_g
+        allowed = np.flatnonzero(mask)
+        suggestions: dict[str, list[Substitution]] = {}
+        for name in targets:
+            row = names.get_position(name)
+            candidates = allowed[allowed != row]
+            # Change in the recipe's grams per 100g when swapping at equal mass.
+            scale = masses[name] / total_mass * 100.0
+            deltas = (nutrients[candidates] - nutrients[row]) * scale
+            distances = np.sqrt((deltas * deltas) @ self._weights)
+            best = top_k(distances, k, largest=False)
+            suggestions[name] = [
+                Substitution(
+                    ingredient_name=name,
+                    substitute_name=names.names[candidates[pos]],
+                    quantity_in_grams=masses[name],
+                    nutrient_distance=float(distances[pos]),
+                )
+                for pos in best
+            ]
+        return suggestions
+
+
+__all__ = [
+    "Substitution",
+    "SubstitutionEngine",
+]
@@ -1,8 +1,106 @@
-from .common import *
-from .nutrients import *
-from .quantities import *
-from .calories import *
-from .cost import *
-from .ingredients import *
-from .recipes import *
-from .tags import *
+from typing import TYPE_CHECKING
+
+from ..utils import lazy_exports
+
+# Public names by submodule; each submodule is imported on first access.
+_EXPORTS = {
+    "common": (
+        "CodietException",
+        "InvalidDTOError",
+    ),
+    "nutrients": (
+        "NutrientError",
+        "UnknownNutrientError",
+        "NutrientAliasCollisionError",
+        "NutrientAliasCollisionsError",
+        "ExistingNutrientError",
+        "NutrientAttrError",
+        "NutrientFlagError",
+        "NutrientRatioError",
+        "UndefinedNutrientRatioError",
+        "DuplicateNutrientRatioError",
+        "UnknownNutrientFlagError",
+        "UndefinedNutrientFlagError",
+        "ExcludedNutrientError",
+        "FalseFlagWithTrueChildError",
+        "NonZeroNutrientWithZeroAncError",
+        "NonZeroParentNutrientWithFullZeroChildrenError",
+        "ChildNutrientsExceedParentError",
+        "ParentNutrientExceedsChildSumError",
+        "NutrientRatiosExceedOneError",
+        "NutrientMassError",
+        "UndefinedNutrientMassError",
+    ),
+    "quantities": (
+        "UnitError",
+        "UnknownUnitError",
+        "QuantityError",
+        "NegativeQuantityError",
+        "ZeroQuantityError",
+        "UnitConversionError",
+        "UnitConversionNotFoundError",
+        "DuplicateUnitConversionError",
+        "UndefinedUnitConversionError",
+        "UnitConversionOverconstrainedError",
+    ),
+    "calories": (
+        "CaloriesError",
+        "NegativeCaloriesError",
+        "IncompleteCaloricNutrientsError",
+    ),
+    "cost": (
+        "CostError",
+        "NegativeCostError",
+    ),
+    "ingredients": (
+        "IngredientError",
+        "IngredientDTOError",
+        "UnnamedIngredientError",
+        "NoIngredientDescriptionError",
+        "IngredientNotFoundError",
+        "DuplicateIngredientError",
+        "DuplicateIngredientQuantityError",
+        "UndefinedIngredientQuantityError",
+        "UndefinedIngredientUnitConvError",
+    ),
+    "recipes": (
+        "RecipeError",
+        "UnnamedRecipeError",
+        "NoRecipeDescriptionError",
+        "NoTypicalServiceSizeError",
+        "NoCookingTimeError",
+        "RecipeNotFoundError",
+        "DuplicateRecipeError",
+        "NoIngredientQuantitiesError",
+        "CircularRecipeError",
+    ),
+    "tags": (
+        "TagError",
+        "UnknownTagError",
+        "TagNotFoundError",
+        "DuplicateTagError",
+        "CircularTagError",
+    ),
+    "meal_plans": (
+        "MealPlanError",
+        "MealSlotNotFoundError",
+    ),
+    "users": (
+        "UserError",
+        "UserNotFoundError",
+    ),
+}
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .common import *
+    from .nutrients import *
+    from .quantities import *
+    from .calories import *
+    from .cost import *
+    from .ingredients import *
+    from .recipes import *
+    from .tags import *
+    from .meal_plans import *
+    from .users import *
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Sequence
 
 
 class CodietException(Exception):
@@ -23,6 +23,14 @@ class InvalidDTOError(CodietException):
         return f"Invalid DTO: {self.dto}"
 
 
+def format_suggestions(suggestions: Sequence[str]) -> str:
+    """Return a ' Did you mean ...?' hint, or "" if there are no suggestions."""
+    if not suggestions:
+        return ""
+    quoted = ", ".join(f"'{s}'" for s in suggestions)
+    return f" Did you mean: {quoted}?"
+
+
 __all__ = [
     "CodietException",
     "InvalidDTOError",
@@ -1,7 +1,7 @@
 from __future__ import annotations
-from typing import Any
+from typing import Any, Sequence
 
-from .common import CodietException
+from .common import CodietException, format_suggestions
 
 
 class IngredientError(CodietException):
@@ -44,12 +44,16 @@ class NoIngredientDescriptionError(IngredientError):
 class IngredientNotFoundError(IngredientError):
     """Indicates that an ingredient with this namewas not found in the repository."""
 
-    def __init__(self, ingredient_name: str):
+    def __init__(self, ingredient_name: str, *, suggestions: Sequence[str] = ()):
         self.ingredient_name = ingredient_name
+        self.suggestions = list(suggestions)
 
     @property
     def message(self) -> str:
-        return f"Ingredient '{self.ingredient_name}' not found in repository"
+        return (
+            f"Ingredient '{self.ingredient_name}' not found in repository."
+            f"{format_suggestions(self.suggestions)}"
+        )
 
 
 class DuplicateIngredientError(IngredientError):
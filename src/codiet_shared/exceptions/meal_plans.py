@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from .common import CodietException
+
+
+class MealPlanError(CodietException):
+    """Base class for all meal plan exceptions."""
+
+
+class MealSlotNotFoundError(MealPlanError):
+    """Raised when a day or meal is outside the meal plan."""
+
+    def __init__(self, *, day: int, meal_name: str) -> None:
+        self.day = day
+        self.meal_name = meal_name
+
+    @property
+    def message(self) -> str:
+        return f"The meal plan has no slot for {self.meal_name} on day {self.day}."
+
+
+__all__ = [
+    "MealPlanError",
+    "MealSlotNotFoundError",
+]
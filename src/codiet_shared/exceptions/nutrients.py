@@ -1,7 +1,7 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, Collection
+from typing import TYPE_CHECKING, Collection, Sequence
 
-from ..exceptions.common import CodietException
+from ..exceptions.common import CodietException, format_suggestions
 from ..utils import sig_fig_fmt
 
 if TYPE_CHECKING:
@@ -21,23 +21,43 @@ class NutrientError(CodietException):
 class UnknownNutrientError(NutrientError):
     """A nutrient is unknown to the system."""
 
-    def __init__(self, key: str) -> None:
+    def __init__(self, key: str, *, suggestions: Sequence[str] = ()) -> None:
         self.key: str = key
+        self.suggestions = list(suggestions)
 
     @property
     def message(self) -> str:
-        return f"The nutrient {self.key} is unknown to the system."
+        return (
+            f"The nutrient {self.key} is unknown to the system."
+            f"{format_suggestions(self.suggestions)}"
+        )
 
 
 class NutrientAliasCollisionError(NutrientError):
     """An alias collides with another nutrient name or alias."""
 
-    def __init__(self, alias: str):
+    def __init__(self, alias: str, *, nutrient_names: Sequence[str] = ()):
         self.alias = alias
+        self.nutrient_names = list(nutrient_names)
+
+    @property
+    def message(self) -> str:
+        message = f"The alias {self.alias} collides with another nutrient name or alias."
+        if self.nutrient_names:
+            message += f" Claimed by: {', '.join(self.nutrient_names)}."
+        return message
+
+
+class NutrientAliasCollisionsError(NutrientError):
+    """Several aliases collide with other nutrient names or aliases."""
+
+    def __init__(self, collisions: Sequence[NutrientAliasCollisionError]):
+        self.collisions = list(collisions)
 
     @property
     def message(self) -> str:
-        return f"The alias {self.alias} collides with another nutrient name or alias."
+        details = "\n".join(collision.message for collision in self.collisions)
+        return f"{len(self.collisions)} nutrient alias collision(s):\n{details}"
 
 
 class ExistingNutrientError(NutrientError):
@@ -311,6 +331,7 @@ __all__ = [
     "NutrientError",
     "UnknownNutrientError",
     "NutrientAliasCollisionError",
+    "NutrientAliasCollisionsError",
     "ExistingNutrientError",
     "NutrientAttrError",
     "NutrientFlagError",
@@ -1,7 +1,7 @@
 from __future__ import annotations
-from typing import Hashable
+from typing import Hashable, Sequence
 
-from .common import CodietException
+from .common import CodietException, format_suggestions
 
 
 class RecipeError(CodietException):
@@ -52,12 +52,16 @@ class NoCookingTimeError(RecipeError):
 class RecipeNotFoundError(RecipeError):
     """Raised when a recipe is not found."""
 
-    def __init__(self, key: Hashable):
+    def __init__(self, key: Hashable, *, suggestions: Sequence[str] = ()):
         self.key: Hashable = key
+        self.suggestions = list(suggestions)
 
     @property
     def message(self) -> str:
-        return f"Recipe with key '{self.key}' not found."
+        return (
+            f"Recipe with key '{self.key}' not found."
+            f"{format_suggestions(self.suggestions)}"
+        )
 
 
 class DuplicateRecipeError(RecipeError):
@@ -82,6 +86,18 @@ class NoIngredientQuantitiesError(RecipeError):
         return f"The recipe '{self.recipe_name}' has no ingredient quantities."
 
 
+class CircularRecipeError(RecipeError):
+    """Raised when a recipe contains itself through its sub-recipes."""
+
+    def __init__(self, *, recipe_names: Sequence[str]) -> None:
+        self.recipe_names = tuple(recipe_names)
+
+    @property
+    def message(self) -> str:
+        cycle = " -> ".join(self.recipe_names)
+        return f"The recipe '{self.recipe_names[0]}' contains itself: {cycle}."
+
+
 __all__ = [
     "RecipeError",
     "UnnamedRecipeError",
@@ -91,4 +107,5 @@ __all__ = [
     "RecipeNotFoundError",
     "DuplicateRecipeError",
     "NoIngredientQuantitiesError",
+    "CircularRecipeError",
 ]
@@ -1,4 +1,7 @@
+from typing import Sequence
+
 from codiet_shared.exceptions import CodietException
+from codiet_shared.exceptions.common import format_suggestions
 
 
 class TagError(CodietException):
@@ -17,12 +20,16 @@ class UnknownTagError(TagError):
 
 
 class TagNotFoundError(TagError):
-    def __init__(self, key: str) -> None:
+    def __init__(self, key: str, *, suggestions: Sequence[str] = ()) -> None:
         self.key: str = key
+        self.suggestions = list(suggestions)
 
     @property
     def message(self) -> str:
-        return f"The tag {self.key} was not found on the entity."
+        return (
+            f"The tag {self.key} was not found on the entity."
+            f"{format_suggestions(self.suggestions)}"
+        )
 
 
 class DuplicateTagError(TagError):
@@ -34,9 +41,25 @@ class DuplicateTagError(TagError):
         return f"The tag {self.key} already exists on the entity."
 
 
+class CircularTagError(TagError):
+    """Raised when a tag would become its own ancestor."""
+
+    def __init__(self, *, tag_name: str, parent_name: str) -> None:
+        self.tag_name = tag_name
+        self.parent_name = parent_name
+
+    @property
+    def message(self) -> str:
+        return (
+            f"The tag {self.parent_name} cannot be a parent of {self.tag_name} "
+            f"because it is already a descendant of it."
+        )
+
+
 __all__ = [
     "TagError",
     "UnknownTagError",
     "TagNotFoundError",
     "DuplicateTagError",
+    "CircularTagError",
 ]
@@ -0,0 +1,29 @@
+from __future__ import annotations
+from typing import Sequence
+
+from .common import CodietException, format_suggestions
+
+
+class UserError(CodietException):
+    """Base class for all user exceptions."""
+
+
+class UserNotFoundError(UserError):
+    """Raised when a user is not found."""
+
+    def __init__(self, key: str, *, suggestions: Sequence[str] = ()) -> None:
+        self.key = key
+        self.suggestions = list(suggestions)
+
+    @property
+    def message(self) -> str:
+        return (
+            f"User with key '{self.key}' not found."
+            f"{format_suggestions(self.suggestions)}"
+        )
+
+
+__all__ = [
+    "UserError",
+    "UserNotFoundError",
+]
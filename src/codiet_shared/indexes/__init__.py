@@ -0,0 +1,5 @@
+from .recipes import *
+from .tags import *
+from .ranges import *
+from .names import *
+from .nutrients import *
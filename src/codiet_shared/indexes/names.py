@@ -0,0 +1,282 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, Collection, Iterable, Mapping, TypeVar
+import unicodedata
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ..dtos.nutrients import NutrientDTO
+    from ..dtos.quantities import UnitDTO
+    from ..exceptions.common import CodietException
+
+_V = TypeVar("_V")
+
+
+def normalise_name(name: str) -> str:
+    """Return the NFKC-normalised, casefolded, whitespace-collapsed name."""
+    return " ".join(unicodedata.normalize("NFKC", name).casefold().split())
+
+
+def get_trigrams(term: str) -> set[str]:
+    padded = f"  {term} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> int | None:
+    """Return the Levenshtein distance of `a` and `b` if within `max_distance`.
+
+    Only a diagonal band of the DP table is evaluated, and evaluation stops
+    as soon as every cell in the band exceeds the bound.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+    too_far = max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        lo = max(1, i - max_distance)
+        hi = min(len(b), i + max_distance)
+        current = [too_far] * (len(b) + 1)
+        current[0] = i if i <= max_distance else too_far
+        for j in range(lo, hi + 1):
+            cost = 0 if char_a == b[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + cost,
+            )
+        if min(current[lo - 1 : hi + 1]) > max_distance:
+            return None
+        previous = current
+    distance = previous[len(b)]
+    return distance if distance <= max_distance else None
+
+
+def _get_codes(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+def _get_edit_distances(query: str, terms: np.ndarray) -> np.ndarray:
+    """Return the Levenshtein distance of `query` to each row of `terms`.
+
+    `terms` holds the code points of equal-length terms. The DP runs one
+    query character at a time over all terms and columns at once; within a
+    row, insertions are a running minimum of `cell - column`.
+    """
+    n_terms, length = terms.shape
+    columns = np.arange(length + 1)
+    previous = np.broadcast_to(columns, (n_terms, length + 1))
+    for i, code in enumerate(_get_codes(query).tolist(), start=1):
+        current = np.empty((n_terms, length + 1), dtype=np.intp)
+        current[:, 0] = i
+        np.minimum(
+            previous[:, 1:] + 1, previous[:, :-1] + (terms != code), out=current[:, 1:]
+        )
+        previous = np.minimum.accumulate(current - columns, axis=1) + columns
+    return previous[:, length]
+
+
+class FuzzyNameIndex:
+    """Fuzzy lookup of entity names and aliases for "did you mean" hints.
+
+    Terms are casefolded and indexed by their trigrams. A query only runs
+    the bounded edit distance against terms sharing enough trigrams with it
+    to possibly be within `max_distance` edits, and every alias resolves to
+    the name of the entity it belongs to.
+    """
+
+    def __init__(self) -> None:
+        self._terms: list[str] = []
+        self._canonical: list[str] = []
+        self._term_ids: dict[str, int] = {}
+        self._postings: dict[str, list[int]] = {}
+        self._frozen: dict[str, np.ndarray] = {}
+        self._lengths: list[int] = []
+        self._trigram_counts: list[int] = []
+        self._by_length: dict[int, list[int]] = {}
+        self._length_codes: dict[int, np.ndarray] = {}
+        self._length_rows: list[int] = []
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> FuzzyNameIndex:
+        index = cls()
+        for name in names:
+            index.add(name)
+        return index
+
+    @classmethod
+    def from_nutrient_dtos(
+        cls, nutrient_dtos: Iterable[NutrientDTO]
+    ) -> FuzzyNameIndex:
+        index = cls()
+        for dto in nutrient_dtos:
+            index.add(dto["name"], aliases=dto["aliases"])
+        return index
+
+    @classmethod
+    def from_unit_dtos(cls, unit_dtos: Iterable[UnitDTO]) -> FuzzyNameIndex:
+        index = cls()
+        for dto in unit_dtos:
+            index.add(dto["name"], aliases=dto["aliases"])
+        return index
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add(self, name: str, *, aliases: Collection[str] = ()) -> None:
+        for term in (name, *aliases):
+            normalised = normalise_name(term)
+            if normalised in self._term_ids:
+                continue
+            term_id = len(self._terms)
+            self._term_ids[normalised] = term_id
+            self._terms.append(normalised)
+            self._canonical.append(name)
+            self._lengths.append(len(normalised))
+            same_length = self._by_length.setdefault(len(normalised), [])
+            self._length_rows.append(len(same_length))
+            same_length.append(term_id)
+            self._length_codes.pop(len(normalised), None)
+            trigrams = get_trigrams(normalised)
+            self._trigram_counts.append(len(trigrams))
+            for trigram in trigrams:
+                self._postings.setdefault(trigram, []).append(term_id)
+                self._frozen.pop(trigram, None)
+
+    def get_suggestions(
+        self, query: str, *, k: int = 5, max_distance: int = 2
+    ) -> list[str]:
+        """Return up to `k` entity names near `query`, closest first."""
+        normalised = normalise_name(query)
+        ranked = [
+            (distance, self._canonical[term_id])
+            for distance, term_id in self._get_near_terms(normalised, max_distance)
+        ]
+        ranked.sort()
+
+        suggestions: list[str] = []
+        for _, name in ranked:
+            if name not in suggestions:
+                suggestions.append(name)
+                if len(suggestions) == k:
+                    break
+        return suggestions
+
+    def _get_near_terms(
+        self, normalised: str, max_distance: int
+    ) -> list[tuple[int, int]]:
+        """Return (distance, term id) for terms within `max_distance` edits.
+
+        Only the postings of the query's trigrams, or the terms of nearby
+        lengths, are touched, never the whole index.
+        """
+        size = len(normalised)
+        # Each edit destroys at most three of the query's trigrams.
+        trigrams = get_trigrams(normalised)
+        min_shared = len(trigrams) - 3 * max_distance
+        if min_shared <= 0:
+            # Too short for the bound to prune anything, so score every term
+            # of a nearby length, one vectorised pass per length.
+            near: list[tuple[int, int]] = []
+            for length in range(max(size - max_distance, 0), size + max_distance + 1):
+                term_ids = self._by_length.get(length)
+                if term_ids is None:
+                    continue
+                distances = _get_edit_distances(
+                    normalised, self._get_length_codes(length)
+                )
+                hits = np.flatnonzero(distances <= max_distance).tolist()
+                near.extend((int(distances[i]), term_ids[i]) for i in hits)
+            return near
+
+        postings = [self._get_posting(t) for t in trigrams if t in self._postings]
+        if len(postings) < min_shared:
+            return []
+        term_ids, shared = np.unique(np.concatenate(postings), return_counts=True)
+        keep = shared >= min_shared
+        # The bound holds from the term's side too: each edit also destroys
+        # at most three of the term's own trigrams.
+        term_ids, shared = term_ids[keep], shared[keep]
+        counts = self._get_term_values(self._trigram_counts, term_ids)
+        lengths = self._get_term_values(self._lengths, term_ids)
+        fits = (shared >= counts - 3 * max_distance) & (
+            np.abs(lengths - size) <= max_distance
+        )
+        term_ids, lengths = term_ids[fits], lengths[fits]
+        rows = self._get_term_values(self._length_rows, term_ids)
+        # Many names can share most trigrams, e.g. numbered variants, so the
+        # survivors are scored one vectorised pass per length.
+        near = []
+        for length in np.unique(lengths).tolist():
+            same = lengths == length
+            same_length = term_ids[same]
+            codes = self._get_length_codes(length)[rows[same]]
+            distances = _get_edit_distances(normalised, codes)
+            hits = np.flatnonzero(distances <= max_distance)
+            near.extend(
+                zip(distances[hits].tolist(), same_length[hits].tolist())
+            )
+        return near
+
+    def _get_length_codes(self, length: int) -> np.ndarray:
+        """Return the code points of every term of `length`, one row each."""
+        codes = self._length_codes.get(length)
+        if codes is None:
+            term_ids = self._by_length[length]
+            joined = "".join(self._terms[term_id] for term_id in term_ids)
+            codes = _get_codes(joined).reshape(len(term_ids), length)
+            self._length_codes[length] = codes
+        return codes
+
+    @staticmethod
+    def _get_term_values(values: list[int], term_ids: np.ndarray) -> np.ndarray:
+        return np.fromiter(
+            map(values.__getitem__, term_ids.tolist()),
+            dtype=np.intp,
+            count=len(term_ids),
+        )
+
+    def _get_posting(self, trigram: str) -> np.ndarray:
+        posting = self._frozen.get(trigram)
+        if posting is None:
+            posting = np.asarray(self._postings[trigram], dtype=np.intp)
+            self._frozen[trigram] = posting
+        return posting
+
+
+def get_or_raise(
+    mapping: Mapping[str, _V],
+    name: str,
+    error_type: Callable[..., CodietException],
+    *,
+    names: FuzzyNameIndex | None = None,
+    k: int = 5,
+) -> _V:
+    """Return `mapping[name]`, or raise `error_type` with "did you mean" hints.
+
+    Suggestions come from `names` if given, then from the mapping's own
+    `get_fuzzy_index()` if it keeps one (as `NameIndex` does), and otherwise
+    from an index built over the mapping's keys there and then. Callers that
+    miss repeatedly on a plain mapping should keep and pass their own index.
+    """
+    try:
+        return mapping[name]
+    except KeyError:
+        pass
+    if names is None:
+        get_fuzzy_index = getattr(mapping, "get_fuzzy_index", None)
+        if get_fuzzy_index is not None:
+            names = get_fuzzy_index()
+        else:
+            names = FuzzyNameIndex.from_names(mapping)
+    raise error_type(name, suggestions=names.get_suggestions(name, k=k))
+
+
+__all__ = [
+    "normalise_name",
+    "get_trigrams",
+    "bounded_edit_distance",
+    "FuzzyNameIndex",
+    "get_or_raise",
+]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable
+
+from ..exceptions.nutrients import (
+    ExistingNutrientError,
+    NutrientAliasCollisionError,
+    NutrientAliasCollisionsError,
+    UnknownNutrientError,
+)
+from .names import FuzzyNameIndex, get_or_raise, normalise_name
+
+if TYPE_CHECKING:
+    from ..dtos.nutrients import NutrientDTO
+
+
+class NutrientAliasIndex:
+    """Resolves nutrient names and aliases to canonical nutrient names.
+
+    Lookups are a single dict access on the normalised term. Every alias
+    collision in the input is collected while building and reported together.
+    """
+
+    def __init__(
+        self, terms: dict[str, str], aliases: dict[str, list[str]]
+    ) -> None:
+        self._terms = terms
+        self._aliases = aliases
+        self._fuzzy: FuzzyNameIndex | None = None
+
+    @classmethod
+    def from_nutrient_dtos(
+        cls, nutrient_dtos: Iterable[NutrientDTO]
+    ) -> NutrientAliasIndex:
+        terms: dict[str, str] = {}
+        aliases: dict[str, list[str]] = {}
+        claims: dict[str, list[str]] = {}
+        for dto in nutrient_dtos:
+            name = dto["name"]
+            if name in aliases:
+                raise ExistingNutrientError(name)
+            aliases[name] = list(dto["aliases"])
+            own_terms = (normalise_name(t) for t in (name, *dto["aliases"]))
+            for term in dict.fromkeys(own_terms):
+                owner = terms.setdefault(term, name)
+                if owner != name:
+                    claims.setdefault(term, [owner]).append(name)
+
+        if claims:
+            raise NutrientAliasCollisionsError(
+                [
+                    NutrientAliasCollisionError(term, nutrient_names=names)
+                    for term, names in claims.items()
+                ]
+            )
+        return cls(terms, aliases)
+
+    def __len__(self) -> int:
+        return len(self._aliases)
+
+    def __contains__(self, name_or_alias: object) -> bool:
+        return (
+            isinstance(name_or_alias, str)
+            and normalise_name(name_or_alias) in self._terms
+        )
+
+    def find(self, name_or_alias: str) -> str | None:
+        return self._terms.get(normalise_name(name_or_alias))
+
+    def resolve(self, name_or_alias: str) -> str:
+        """Return the canonical nutrient name, with suggestions if unknown."""
+        nutrient_name = self.find(name_or_alias)
+        if nutrient_name is None:
+            raise UnknownNutrientError(
+                name_or_alias,
+                suggestions=self._get_fuzzy().get_suggestions(name_or_alias),
+            )
+        return nutrient_name
+
+    def get_aliases(self, nutrient_name: str) -> list[str]:
+        return get_or_raise(
+            self._aliases, nutrient_name, UnknownNutrientError, names=self._get_fuzzy()
+        )
+
+    def _get_fuzzy(self) -> FuzzyNameIndex:
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyNameIndex()
+            for name, aliases in self._aliases.items():
+                self._fuzzy.add(name, aliases=aliases)
+        return self._fuzzy
+
+
+__all__ = [
+    "NutrientAliasIndex",
+]
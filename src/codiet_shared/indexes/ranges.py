@@ -0,0 +1,173 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Mapping
+
+import numpy as np
+
+from ..exceptions.nutrients import UnknownNutrientError
+from .names import get_or_raise
+
+if TYPE_CHECKING:
+    from ..engines.columns import NameIndex, ProfileColumns
+    from ..engines.recompute import RecipeColumns
+    from ..protocols.recipes import RecipeMap
+
+
+class RangeIndex:
+    """A sorted index over one numeric column.
+
+    Range predicates are resolved with binary search to a contiguous run of
+    the sort order, so no per-row comparison is needed. NaN values never
+    match a predicate.
+    """
+
+    def __init__(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        self._order = np.argsort(values, kind="stable")
+        self._sorted = values[self._order]
+        self._ranks = np.empty_like(self._order)
+        self._ranks[self._order] = np.arange(len(values))
+        self._n_valid = len(values) - int(np.count_nonzero(np.isnan(values)))
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def order(self) -> np.ndarray:
+        return self._order
+
+    @property
+    def ranks(self) -> np.ndarray:
+        return self._ranks
+
+    def where(
+        self,
+        *,
+        gt: float | None = None,
+        ge: float | None = None,
+        lt: float | None = None,
+        le: float | None = None,
+    ) -> RangeSelection:
+        valid = self._sorted[: self._n_valid]
+        start, stop = 0, self._n_valid
+        if ge is not None:
+            start = max(start, int(np.searchsorted(valid, ge, side="left")))
+        if gt is not None:
+            start = max(start, int(np.searchsorted(valid, gt, side="right")))
+        if le is not None:
+            stop = min(stop, int(np.searchsorted(valid, le, side="right")))
+        if lt is not None:
+            stop = min(stop, int(np.searchsorted(valid, lt, side="left")))
+        return RangeSelection(self, start, max(start, stop))
+
+
+class RangeSelection:
+    """The rows of a `RangeIndex` whose sort rank lies in `[start, stop)`."""
+
+    __slots__ = ("index", "start", "stop")
+
+    def __init__(self, index: RangeIndex, start: int, stop: int) -> None:
+        self.index = index
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    @property
+    def positions(self) -> np.ndarray:
+        return np.sort(self.index.order[self.start : self.stop])
+
+    def contains(self, positions: np.ndarray) -> np.ndarray:
+        ranks = self.index.ranks[positions]
+        return (ranks >= self.start) & (ranks < self.stop)
+
+
+def intersect_ranges(*selections: RangeSelection) -> np.ndarray:
+    """Return the sorted row positions matching every selection.
+
+    Only the smallest selection is materialised; the others are tested by
+    rank lookup on the surviving candidates.
+    """
+    if not selections:
+        raise ValueError("intersect_ranges needs at least one selection")
+    ordered = sorted(selections, key=len)
+    first = ordered[0]
+    candidates = first.index.order[first.start : first.stop]
+    for selection in ordered[1:]:
+        if len(candidates) == 0:
+            break
+        candidates = candidates[selection.contains(candidates)]
+    return np.sort(candidates)
+
+
+class CatalogRangeIndex:
+    """Range indexes over nutrient-per-100g and scalar attribute columns.
+
+    Indexes are built lazily per column on first use, so rebuilding after a
+    catalog update only pays for the columns that are actually queried.
+    """
+
+    def __init__(
+        self,
+        columns: ProfileColumns,
+        attributes: Mapping[str, np.ndarray],
+    ) -> None:
+        self._columns = columns
+        self._attributes = dict(attributes)
+        self._nutrient_indexes: dict[str, RangeIndex] = {}
+        self._attribute_indexes: dict[str, RangeIndex] = {}
+
+    @classmethod
+    def from_recipes(
+        cls, recipes: RecipeMap, columns: RecipeColumns
+    ) -> CatalogRangeIndex:
+        cooking_time = np.fromiter(
+            (recipes[name].cooking_time for name in columns.names),
+            dtype=np.float64,
+            count=len(columns.names),
+        )
+        return cls(
+            columns,
+            {
+                "total_cost": columns.total_cost,
+                "calories": columns.calories,
+                "cooking_time": cooking_time,
+            },
+        )
+
+    @property
+    def names(self) -> NameIndex:
+        return self._columns.names
+
+    def nutrient(self, nutrient_name: str) -> RangeIndex:
+        index = self._nutrient_indexes.get(nutrient_name)
+        if index is None:
+            col = get_or_raise(
+                self._columns.nutrient_names, nutrient_name, UnknownNutrientError
+            )
+            index = RangeIndex(self._columns.nutrient_g_per_g[:, col] * 100.0)
+            self._nutrient_indexes[nutrient_name] = index
+        return index
+
+    def attribute(self, attribute_name: str) -> RangeIndex:
+        index = self._attribute_indexes.get(attribute_name)
+        if index is None:
+            index = RangeIndex(self._attributes[attribute_name])
+            self._attribute_indexes[attribute_name] = index
+        return index
+
+    def set_attribute(self, attribute_name: str, values: np.ndarray) -> None:
+        self._attributes[attribute_name] = values
+        self._attribute_indexes.pop(attribute_name, None)
+
+    def select(self, *selections: RangeSelection) -> list[str]:
+        names = self._columns.names.names
+        return [names[pos] for pos in intersect_ranges(*selections)]
+
+
+__all__ = [
+    "RangeIndex",
+    "RangeSelection",
+    "intersect_ranges",
+    "CatalogRangeIndex",
+]
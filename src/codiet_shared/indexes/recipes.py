@@ -0,0 +1,241 @@
+from __future__ import annotations
+from collections import defaultdict
+from itertools import chain, repeat
+from typing import TYPE_CHECKING, Hashable, Iterable, Iterator
+
+from ..exceptions.recipes import DuplicateRecipeError, RecipeNotFoundError
+from .names import FuzzyNameIndex, get_or_raise
+
+if TYPE_CHECKING:
+    from ..protocols.recipes import Recipe
+    from .tags import TagClosure
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Yield the positions of the set bits of `bits`, lowest first."""
+    for pos, char in enumerate(reversed(bin(bits))):
+        if char == "1":
+            yield pos
+        elif char == "b":
+            return
+
+
+class RecipeSet:
+    """An immutable set of indexed recipes, backed by an integer bitmap.
+
+    Sets from the same index combine with `&`, `|`, `-` and `~`, where `~` is
+    the complement within the recipes currently in the index. Combining sets
+    from different indexes raises `ValueError`, as their ids do not match.
+    """
+
+    __slots__ = ("_index", "_bits")
+
+    def __init__(self, index: RecipeIndex, bits: int) -> None:
+        self._index = index
+        self._bits = bits
+
+    @property
+    def bits(self) -> int:
+        return self._bits
+
+    @property
+    def names(self) -> list[str]:
+        return [self._index.get_recipe_name(i) for i in iter_bits(self._bits)]
+
+    def __and__(self, other: RecipeSet) -> RecipeSet:
+        return RecipeSet(self._index, self._bits & self._get_bits(other))
+
+    def __or__(self, other: RecipeSet) -> RecipeSet:
+        return RecipeSet(self._index, self._bits | self._get_bits(other))
+
+    def __sub__(self, other: RecipeSet) -> RecipeSet:
+        return RecipeSet(self._index, self._bits & ~self._get_bits(other))
+
+    def __invert__(self) -> RecipeSet:
+        return RecipeSet(self._index, self._index.all().bits & ~self._bits)
+
+    def __contains__(self, recipe_name: object) -> bool:
+        recipe_id = self._index.find_recipe_id(recipe_name)
+        return recipe_id is not None and bool(self._bits >> recipe_id & 1)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return self._bits.bit_count()
+
+    def __bool__(self) -> bool:
+        return self._bits != 0
+
+    def __repr__(self) -> str:
+        return f"RecipeSet({self.names})"
+
+    def _get_bits(self, other: RecipeSet) -> int:
+        if other._index is not self._index:
+            raise ValueError("Cannot combine RecipeSets from different indexes")
+        return other._bits
+
+
+class RecipeIndex:
+    """Inverted index of recipes by tag, ingredient and nutrient flag value.
+
+    Each key maps to a bitmap posting list over dense recipe ids. Ids of
+    removed recipes are recycled, so the bitmaps stay as short as the catalog.
+    Each `add_recipe` rewrites the bitmaps it touches, so build large indexes
+    with `from_recipes`.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._names: list[str | None] = []
+        self._free_ids: list[int] = []
+        self._keys: list[frozenset[Hashable]] = []
+        self._postings: dict[Hashable, int] = {}
+        self._live = 0
+        self._fuzzy: FuzzyNameIndex | None = None
+
+    @classmethod
+    def from_recipes(cls, recipes: Iterable[Recipe]) -> RecipeIndex:
+        """Build an index over many recipes at once.
+
+        Posting lists are gathered as id lists and each is packed into its
+        bitmap in one step, instead of growing it one bit at a time.
+        """
+        index = cls()
+        postings: defaultdict[Hashable, list[int]] = defaultdict(list)
+        for recipe_id, recipe in enumerate(recipes):
+            if recipe.name in index._ids:
+                raise DuplicateRecipeError(recipe.name)
+            index._ids[recipe.name] = recipe_id
+            index._names.append(recipe.name)
+            keys = _get_index_keys(recipe)
+            index._keys.append(keys)
+            for key in keys:
+                postings[key].append(recipe_id)
+        index._postings = {key: _pack_bits(ids) for key, ids in postings.items()}
+        index._live = (1 << len(index._names)) - 1
+        return index
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, recipe_name: object) -> bool:
+        return recipe_name in self._ids
+
+    def add_recipe(self, recipe: Recipe) -> None:
+        if recipe.name in self._ids:
+            raise DuplicateRecipeError(recipe.name)
+        if self._free_ids:
+            recipe_id = self._free_ids.pop()
+            self._names[recipe_id] = recipe.name
+        else:
+            recipe_id = len(self._names)
+            self._names.append(recipe.name)
+            self._keys.append(frozenset())
+        self._ids[recipe.name] = recipe_id
+
+        keys = _get_index_keys(recipe)
+        bit = 1 << recipe_id
+        for key in keys:
+            self._postings[key] = self._postings.get(key, 0) | bit
+        self._keys[recipe_id] = keys
+        self._live |= bit
+        if self._fuzzy is not None:
+            self._fuzzy.add(recipe.name)
+
+    def remove_recipe(self, recipe_name: str) -> None:
+        recipe_id = get_or_raise(
+            self._ids, recipe_name, RecipeNotFoundError, names=self._get_fuzzy()
+        )
+        del self._ids[recipe_name]
+        # Fuzzy indexes cannot drop a name, so rebuild on the next miss.
+        self._fuzzy = None
+        mask = ~(1 << recipe_id)
+        for key in self._keys[recipe_id]:
+            bits = self._postings[key] & mask
+            if bits:
+                self._postings[key] = bits
+            else:
+                del self._postings[key]
+        self._keys[recipe_id] = frozenset()
+        self._names[recipe_id] = None
+        self._free_ids.append(recipe_id)
+        self._live &= mask
+
+    def update_recipe(self, recipe: Recipe) -> None:
+        if recipe.name in self._ids:
+            self.remove_recipe(recipe.name)
+        self.add_recipe(recipe)
+
+    def find_recipe_id(self, recipe_name: object) -> int | None:
+        return self._ids.get(recipe_name)  # type: ignore[arg-type]
+
+    def get_recipe_name(self, recipe_id: int) -> str:
+        """Return the name of the recipe holding `recipe_id`.
+
+        Raises `KeyError` if no recipe holds it, e.g. after a removal.
+        """
+        name = self._names[recipe_id] if 0 <= recipe_id < len(self._names) else None
+        if name is None:
+            raise KeyError(recipe_id)
+        return name
+
+    def all(self) -> RecipeSet:
+        return RecipeSet(self, self._live)
+
+    def none(self) -> RecipeSet:
+        return RecipeSet(self, 0)
+
+    def tagged(self, tag_name: str) -> RecipeSet:
+        return RecipeSet(self, self._postings.get(("tag", tag_name), 0))
+
+    def tagged_or_descendant(
+        self, tag_name: str, closure: TagClosure
+    ) -> RecipeSet:
+        bits = 0
+        for name in closure.get_descendants(tag_name):
+            bits |= self._postings.get(("tag", name), 0)
+        return RecipeSet(self, bits)
+
+    def containing(self, ingredient_name: str) -> RecipeSet:
+        key = ("ingredient", ingredient_name)
+        return RecipeSet(self, self._postings.get(key, 0))
+
+    def flagged(self, flag_name: str, flag_value: bool = True) -> RecipeSet:
+        key = ("flag", flag_name, flag_value)
+        return RecipeSet(self, self._postings.get(key, 0))
+
+
+    def _get_fuzzy(self) -> FuzzyNameIndex:
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyNameIndex.from_names(self._ids)
+        return self._fuzzy
+
+def _pack_bits(ids: list[int]) -> int:
+    """Return the bitmap with the bits at the ascending `ids` set."""
+    packed = bytearray((ids[-1] >> 3) + 1)
+    for recipe_id in ids:
+        packed[recipe_id >> 3] |= 1 << (recipe_id & 7)
+    return int.from_bytes(packed, "little")
+
+
+def _get_index_keys(recipe: Recipe) -> frozenset[Hashable]:
+    # Pairing names with a repeated tag via `zip` builds the key tuples in C.
+    return frozenset(
+        chain(
+            zip(repeat("tag"), recipe.tags),
+            zip(repeat("ingredient"), recipe.preparation_ingredient_quantities),
+            zip(repeat("ingredient"), recipe.composition_ingredient_quantities),
+            (
+                ("flag", flag_name, flag.value)
+                for flag_name, flag in recipe.nutrient_flags.items()
+            ),
+        )
+    )
+
+
+__all__ = [
+    "iter_bits",
+    "RecipeSet",
+    "RecipeIndex",
+]
@@ -0,0 +1,148 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Collection, Iterable
+
+from ..exceptions.tags import CircularTagError, DuplicateTagError, UnknownTagError
+from .recipes import iter_bits
+
+if TYPE_CHECKING:
+    from ..dtos.tags import TagDTO
+    from ..protocols.tags import HasTags
+
+
+class TagClosure:
+    """Precomputed transitive closure of the tag hierarchy.
+
+    Every tag gets a dense id, and both its ancestor and descendant sets are
+    kept as integer bitsets over those ids. Both sets include the tag itself,
+    so "descendant of dessert" also matches "dessert".
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+        self._parents: list[tuple[int, ...]] = []
+        self._ancestors: list[int] = []
+        self._descendants: list[int] = []
+
+    @classmethod
+    def from_tag_dtos(cls, tag_dtos: Iterable[TagDTO]) -> TagClosure:
+        closure = cls()
+        pending = list(tag_dtos)
+        for dto in pending:
+            closure._register(dto["name"])
+        for dto in pending:
+            closure._parents[closure._ids[dto["name"]]] = closure._get_ids(
+                dto["parents"]
+            )
+        for tag_id in range(len(closure._names)):
+            closure._resolve_ancestors(tag_id, set())
+        for tag_id, ancestors in enumerate(closure._ancestors):
+            for ancestor_id in iter_bits(ancestors):
+                closure._descendants[ancestor_id] |= 1 << tag_id
+        return closure
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, tag_name: object) -> bool:
+        return tag_name in self._ids
+
+    def add_tag(self, tag_dto: TagDTO) -> None:
+        parent_ids = self._get_ids(tag_dto["parents"])
+        tag_id = self._register(tag_dto["name"])
+        self._ancestors[tag_id] = 1 << tag_id
+        self._set_parents(tag_id, parent_ids)
+
+    def update_tag(self, tag_dto: TagDTO) -> None:
+        """Apply a change to the parents of an existing tag."""
+        tag_id = self._get_id(tag_dto["name"])
+        self._set_parents(tag_id, self._get_ids(tag_dto["parents"]))
+
+    def get_ancestors(self, tag_name: str) -> set[str]:
+        return self._get_names(self._ancestors[self._get_id(tag_name)])
+
+    def get_descendants(self, tag_name: str) -> set[str]:
+        return self._get_names(self._descendants[self._get_id(tag_name)])
+
+    def get_descendant_bits(self, tag_name: str) -> int:
+        return self._descendants[self._get_id(tag_name)]
+
+    def is_tag_or_descendant(self, tag_name: str, ancestor_name: str) -> bool:
+        ancestor_id = self._get_id(ancestor_name)
+        return bool(self._ancestors[self._get_id(tag_name)] >> ancestor_id & 1)
+
+    def has_tag_or_descendant(self, entity: HasTags, tag_name: str) -> bool:
+        descendants = self._descendants[self._get_id(tag_name)]
+        for name in entity.tags:
+            tag_id = self._ids.get(name)
+            if tag_id is not None and descendants >> tag_id & 1:
+                return True
+        return False
+
+    def _register(self, tag_name: str) -> int:
+        if tag_name in self._ids:
+            raise DuplicateTagError(tag_name)
+        tag_id = len(self._names)
+        self._ids[tag_name] = tag_id
+        self._names.append(tag_name)
+        self._parents.append(())
+        self._ancestors.append(0)
+        self._descendants.append(1 << tag_id)
+        return tag_id
+
+    def _get_id(self, tag_name: str) -> int:
+        tag_id = self._ids.get(tag_name)
+        if tag_id is None:
+            raise UnknownTagError(tag_name)
+        return tag_id
+
+    def _get_ids(self, tag_names: Collection[str]) -> tuple[int, ...]:
+        return tuple(self._get_id(name) for name in tag_names)
+
+    def _get_names(self, bits: int) -> set[str]:
+        return {self._names[tag_id] for tag_id in iter_bits(bits)}
+
+    def _resolve_ancestors(self, tag_id: int, visiting: set[int]) -> int:
+        if self._ancestors[tag_id]:
+            return self._ancestors[tag_id]
+        visiting.add(tag_id)
+        ancestors = 1 << tag_id
+        for parent_id in self._parents[tag_id]:
+            if parent_id in visiting:
+                raise CircularTagError(
+                    tag_name=self._names[tag_id], parent_name=self._names[parent_id]
+                )
+            ancestors |= self._resolve_ancestors(parent_id, visiting)
+        visiting.discard(tag_id)
+        self._ancestors[tag_id] = ancestors
+        return ancestors
+
+    def _set_parents(self, tag_id: int, parent_ids: tuple[int, ...]) -> None:
+        # Only the tag itself and its descendants can gain or lose ancestors;
+        # the descendant set is unaffected by changing the tag's own parents.
+        affected = self._descendants[tag_id]
+        for parent_id in parent_ids:
+            if affected >> parent_id & 1:
+                raise CircularTagError(
+                    tag_name=self._names[tag_id], parent_name=self._names[parent_id]
+                )
+
+        self._parents[tag_id] = parent_ids
+        previous = {x: self._ancestors[x] for x in iter_bits(affected)}
+        for x in previous:
+            self._ancestors[x] = 0
+        for x in previous:
+            self._resolve_ancestors(x, set())
+
+        for x, old_ancestors in previous.items():
+            new_ancestors = self._ancestors[x]
+            bit = 1 << x
+            for ancestor_id in iter_bits(old_ancestors & ~new_ancestors):
+                self._descendants[ancestor_id] &= ~bit
+            for ancestor_id in iter_bits(new_ancestors & ~old_ancestors):
+                self._descendants[ancestor_id] |= bit
+
+
+__all__ = [
+    "TagClosure",
+]
@@ -0,0 +1,238 @@
+"""Opt-in call counters and timers for hot paths.
+
+Functions marked `@instrumented` (the DTO guards, protocol `__hash__` and
+`__eq__`, `HasUnitConversions.get_unit_conversion` and `sig_fig_fmt`) are
+left untouched while instrumentation is off, so it costs nothing. Turn it
+on by setting `CODIET_INSTRUMENTATION=1` before importing the package, or
+by calling `enable()`, which swaps a counting wrapper into every
+`codiet_shared` module and class holding one of those functions. Names
+imported elsewhere before `enable()` keep the plain function.
+
+Each thread counts into its own table, so wrappers never contend for a
+lock; the tables of finished threads are folded into one when a snapshot is
+taken or another thread starts counting. A reset records the totals so far
+rather than clearing tables other threads are writing to, so no call is
+lost. Process pool workers inherit the setting through the environment
+variable, and forked workers start with empty tables; return
+`snapshot(reset=True)` from the worker and `merge` it in the parent to
+include their counts.
+"""
+from __future__ import annotations
+from functools import wraps
+from time import perf_counter_ns
+from typing import Any, Callable, Mapping, TypeVar
+import os
+import sys
+import threading
+
+ENV_VAR = "CODIET_INSTRUMENTATION"
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+_PACKAGE = __name__.rpartition(".")[0]
+
+_originals: dict[str, Callable[..., Any]] = {}
+_wrappers: dict[str, Callable[..., Any]] = {}
+_local = threading.local()
+_thread_counts: list[tuple[threading.Thread, dict[str, list[int]]]] = []
+_merged: dict[str, list[int]] = {}
+_reset_totals: dict[str, list[int]] = {}
+_lock = threading.Lock()
+_enabled = os.environ.get(ENV_VAR, "").lower() in ("1", "true", "yes", "on")
+
+
+def instrumented(func: _F) -> _F:
+    """Register `func` for instrumentation, wrapping it if already enabled."""
+    name = _get_metric_name(func)
+    _originals[name] = func
+    return _get_wrapper(name) if _enabled else func
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    global _enabled
+    with _lock:
+        if _enabled:
+            return
+        _enabled = True
+        os.environ[ENV_VAR] = "1"
+        _swap({id(f): _get_wrapper(name) for name, f in _originals.items()})
+
+
+def disable() -> None:
+    global _enabled
+    with _lock:
+        if not _enabled:
+            return
+        _enabled = False
+        os.environ.pop(ENV_VAR, None)
+        _swap({id(_get_wrapper(name)): f for name, f in _originals.items()})
+
+
+def snapshot(*, reset: bool = False) -> dict[str, dict[str, float | int]]:
+    """Return calls and seconds per instrumented function, summed over threads.
+
+    Functions never called are left out.
+    """
+    global _reset_totals
+    totals: dict[str, list[int]] = {}
+    with _lock:
+        _prune_threads()
+        for counts in [*(counts for _, counts in _thread_counts), _merged]:
+            _add_counts(totals, counts)
+        since_reset = {}
+        for name, (calls, ns) in totals.items():
+            base_calls, base_ns = _reset_totals.get(name, (0, 0))
+            since_reset[name] = (calls - base_calls, ns - base_ns)
+        if reset:
+            _reset_totals = totals
+    return {
+        name: {"calls": calls, "seconds": ns / 1e9}
+        for name, (calls, ns) in sorted(since_reset.items())
+        if calls
+    }
+
+
+def reset() -> None:
+    snapshot(reset=True)
+
+
+def merge(other: Mapping[str, Mapping[str, float | int]]) -> None:
+    """Add a snapshot taken in another process to this process's counts."""
+    with _lock:
+        for name, values in other.items():
+            total = _merged.setdefault(name, [0, 0])
+            total[0] += int(values["calls"])
+            total[1] += round(values["seconds"] * 1e9)
+
+
+def to_prometheus(
+    counts: Mapping[str, Mapping[str, float | int]] | None = None,
+) -> str:
+    """Render a snapshot (by default the current one) as Prometheus text."""
+    counts = snapshot() if counts is None else counts
+    lines = []
+    for metric, key, help_text in (
+        ("calls_total", "calls", "Calls to instrumented functions."),
+        ("seconds_total", "seconds", "Wall time spent in instrumented functions."),
+    ):
+        full_name = f"{_PACKAGE}_{metric}"
+        lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} counter")
+        for name, values in counts.items():
+            lines.append(f'{full_name}{{function="{name}"}} {values[key]}')
+    return "\n".join(lines) + "\n"
+
+
+def _get_metric_name(func: Callable[..., Any]) -> str:
+    module = func.__module__.removeprefix(f"{_PACKAGE}.")
+    return f"{module}.{func.__qualname__}"
+
+
+def _get_counts() -> dict[str, list[int]]:
+    try:
+        return _local.counts
+    except AttributeError:
+        counts = _local.counts = {}
+        with _lock:
+            _prune_threads()
+            _thread_counts.append((threading.current_thread(), counts))
+        return counts
+
+
+def _prune_threads() -> None:
+    """Fold the tables of finished threads into `_merged`, under `_lock`.
+
+    A finished thread no longer writes to its table, so it can be read
+    without racing the wrappers.
+    """
+    live = []
+    for thread, counts in _thread_counts:
+        if thread.is_alive():
+            live.append((thread, counts))
+        else:
+            _add_counts(_merged, counts)
+    _thread_counts[:] = live
+
+
+def _clear_after_fork() -> None:
+    """Start a forked child with empty tables and a fresh lock.
+
+    The child would otherwise report the parent's counts as its own, and
+    `merge` would add them to the parent twice.
+    """
+    global _local, _lock
+    _local = threading.local()
+    _lock = threading.Lock()
+    _thread_counts.clear()
+    _merged.clear()
+    _reset_totals.clear()
+
+
+def _add_counts(totals: dict[str, list[int]], counts: dict[str, list[int]]) -> None:
+    for name, (calls, ns) in list(counts.items()):
+        total = totals.setdefault(name, [0, 0])
+        total[0] += calls
+        total[1] += ns
+
+
+def _get_wrapper(name: str) -> Callable[..., Any]:
+    wrapper = _wrappers.get(name)
+    if wrapper is not None:
+        return wrapper
+    func = _originals[name]
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = perf_counter_ns() - start
+            counts = _get_counts()
+            entry = counts.get(name)
+            if entry is None:
+                entry = counts[name] = [0, 0]
+            entry[0] += 1
+            entry[1] += elapsed
+
+    _wrappers[name] = wrapper
+    return wrapper
+
+
+def _swap(replacements: dict[int, Callable[..., Any]]) -> None:
+    """Rebind every package-level reference to a replaced function.
+
+    Covers module globals (including names re-exported by packages) and the
+    methods of classes defined in the package.
+    """
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not (
+            module_name == _PACKAGE or module_name.startswith(f"{_PACKAGE}.")
+        ):
+            continue
+        for attr, value in list(vars(module).items()):
+            if id(value) in replacements:
+                setattr(module, attr, replacements[id(value)])
+            elif isinstance(value, type) and value.__module__ == module_name:
+                for member, method in list(vars(value).items()):
+                    if id(method) in replacements:
+                        setattr(value, member, replacements[id(method)])
+
+
+os.register_at_fork(after_in_child=_clear_after_fork)
+
+
+__all__ = [
+    "ENV_VAR",
+    "instrumented",
+    "is_enabled",
+    "enable",
+    "disable",
+    "snapshot",
+    "reset",
+    "merge",
+    "to_prometheus",
+]
@@ -1,7 +1,87 @@
-from .quantities import *
-from .calories import *
-from .cost import *
-from .ingredients import *
-from .nutrients import *
-from .recipes import *
-from .tags import *
+from typing import TYPE_CHECKING
+
+from ..utils import lazy_exports
+
+# Public names by submodule; each submodule is imported on first access.
+_EXPORTS = {
+    "conformance": (
+        "register_implementation",
+        "implements",
+        "conforms",
+        "clear_conformance_cache",
+    ),
+    "quantities": (
+        "UnitType",
+        "UnitSystem",
+        "Unit",
+        "UnitMap",
+        "Quantity",
+        "IsQuantified",
+        "UnitConversion",
+        "UnitConversionKey",
+        "UnitConversionKeys",
+        "UnitConversionMap",
+        "HasUnitConversions",
+        "HasStandardUnit",
+    ),
+    "calories": (
+        "CaloriesRatio",
+        "HasCaloriesRatio",
+        "HasCalories",
+    ),
+    "cost": (
+        "CostRatio",
+        "HasCostRatio",
+        "HasCost",
+    ),
+    "ingredients": (
+        "Ingredient",
+        "IngredientMap",
+        "IngredientQuantity",
+        "IngredientQuantityMap",
+        "HasIngredientQuantities",
+    ),
+    "nutrients": (
+        "Nutrient",
+        "NutrientMap",
+        "NutrientFlagDefinition",
+        "NutrientFlagDefinitionMap",
+        "NutrientFlag",
+        "NutrientFlagMap",
+        "NutrientRatio",
+        "NutrientRatioMap",
+        "NutrientAttrs",
+        "HasNutrientAttrs",
+        "NutrientMass",
+        "NutrientMassMap",
+        "HasNutrientMasses",
+    ),
+    "recipes": (
+        "Recipe",
+        "RecipeMap",
+        "RecipeQuantity",
+        "RecipeQuantityMap",
+    ),
+    "tags": (
+        "Tag",
+        "TagMap",
+        "HasTags",
+    ),
+    "meal_plans": (
+        "MealSlotKey",
+        "MealPlan",
+    ),
+}
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .conformance import *
+    from .quantities import *
+    from .calories import *
+    from .cost import *
+    from .ingredients import *
+    from .nutrients import *
+    from .recipes import *
+    from .tags import *
+    from .meal_plans import *
@@ -0,0 +1,62 @@
+from __future__ import annotations
+from threading import Lock
+from typing import Any, Callable, TypeVar
+
+_T = TypeVar("_T", bound=type)
+
+_registered: dict[type, set[type]] = {}
+_results: dict[tuple[type, type], bool] = {}
+_lock = Lock()
+
+
+def register_implementation(protocol: type, cls: type) -> None:
+    """Declare that instances of `cls` (and its subclasses) implement `protocol`.
+
+    Registered classes skip the structural check entirely.
+    """
+    with _lock:
+        _registered.setdefault(protocol, set()).add(cls)
+        _results.clear()
+
+
+def implements(*protocols: type) -> Callable[[_T], _T]:
+    """Class decorator form of `register_implementation`."""
+
+    def decorate(cls: _T) -> _T:
+        for protocol in protocols:
+            register_implementation(protocol, cls)
+        return cls
+
+    return decorate
+
+
+def conforms(obj: Any, protocol: type) -> bool:
+    """Cached `isinstance(obj, protocol)` for runtime-checkable protocols.
+
+    The structural check is done once per concrete class and protocol and
+    the result reused, so it assumes every instance of a class has the same
+    members. Classes registered with `register_implementation` always conform.
+    """
+    key = (protocol, type(obj))
+    result = _results.get(key)
+    if result is None:
+        cls = type(obj)
+        result = any(
+            issubclass(cls, registered) for registered in _registered.get(protocol, ())
+        ) or isinstance(obj, protocol)
+        _results[key] = result
+    return result
+
+
+def clear_conformance_cache() -> None:
+    """Forget cached results, e.g. after monkeypatching members onto a class."""
+    with _lock:
+        _results.clear()
+
+
+__all__ = [
+    "register_implementation",
+    "implements",
+    "conforms",
+    "clear_conformance_cache",
+]
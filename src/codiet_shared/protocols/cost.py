@@ -1,8 +1,10 @@
 from __future__ import annotations
 from typing import Protocol, runtime_checkable
 
+from ..instrumentation import instrumented
 from .quantities import IsQuantified
 from ..dtos.cost import CostRatioDTO
+from .conformance import conforms
 
 
 @runtime_checkable
@@ -18,11 +20,13 @@ class CostRatio(Protocol):
     def __repr__(self) -> str:
         return self.__str__()
 
+    @instrumented
     def __hash__(self) -> int:
         return hash(self.cost_per_gram)
 
+    @instrumented
     def __eq__(self, other) -> bool:
-        if not isinstance(other, CostRatio):
+        if not conforms(other, CostRatio):
             return NotImplemented
         return hash(self) == hash(other)
 
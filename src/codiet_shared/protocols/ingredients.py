@@ -1,12 +1,14 @@
 from __future__ import annotations
 from typing import Mapping, Optional, Protocol, runtime_checkable
 
+from ..instrumentation import instrumented
 from ..exceptions.ingredients import UndefinedIngredientQuantityError
 from ..dtos.ingredients import IngredientDTO, IngredientQuantityDTO
 from .calories import HasCaloriesRatio
 from .cost import HasCostRatio, HasCost
 from .nutrients import HasNutrientAttrs, HasNutrientMasses
 from .quantities import HasUnitConversions
+from .conformance import conforms
 
 
 @runtime_checkable
@@ -36,6 +38,7 @@ class Ingredient(
 
     def to_dto(self) -> IngredientDTO: ...
 
+    @instrumented
     def __hash__(self) -> int:
         return hash(
             (
@@ -52,8 +55,9 @@ class Ingredient(
             )
         )
 
+    @instrumented
     def __eq__(self, other) -> bool:
-        if not isinstance(other, Ingredient):
+        if not conforms(other, Ingredient):
             return NotImplemented
         return hash(self) == hash(other)
 
@@ -72,6 +76,7 @@ class IngredientQuantity(HasNutrientMasses, HasCost, Protocol):
 
     def to_dto(self) -> IngredientQuantityDTO: ...
 
+    @instrumented
     def __hash__(self) -> int:
         return hash(
             (
@@ -83,8 +88,9 @@ class IngredientQuantity(HasNutrientMasses, HasCost, Protocol):
             )
         )
 
+    @instrumented
     def __eq__(self, other) -> bool:
-        if not isinstance(other, IngredientQuantity):
+        if not conforms(other, IngredientQuantity):
             return NotImplemented
         return hash(self) == hash(other)
 
@@ -0,0 +1,55 @@
+from __future__ import annotations
+from typing import Protocol, Mapping, runtime_checkable, TYPE_CHECKING
+
+from ..instrumentation import instrumented
+from .conformance import conforms
+
+if TYPE_CHECKING:
+    from ..dtos.meal_plans import MealPlanDTO
+    from .recipes import RecipeQuantity
+
+
+MealSlotKey = tuple[int, str]
+
+
+@runtime_checkable
+class MealPlan(Protocol):
+    @property
+    def uid(self) -> int | None: ...
+
+    @property
+    def name(self) -> str: ...
+
+    @property
+    def num_days(self) -> int: ...
+
+    @property
+    def meal_names(self) -> list[str]: ...
+
+    @property
+    def slots(self) -> Mapping[MealSlotKey, RecipeQuantity]: ...
+
+    @instrumented
+    def __hash__(self) -> int:
+        return hash(
+            (
+                self.name,
+                self.num_days,
+                tuple(self.meal_names),
+                frozenset((key, hash(rq)) for key, rq in self.slots.items()),
+            )
+        )
+
+    @instrumented
+    def __eq__(self, other) -> bool:
+        if not conforms(other, MealPlan):
+            return NotImplemented
+        return hash(self) == hash(other)
+
+    def to_dto(self) -> MealPlanDTO: ...
+
+
+__all__ = [
+    "MealSlotKey",
+    "MealPlan",
+]
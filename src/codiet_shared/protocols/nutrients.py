@@ -3,6 +3,7 @@ from typing import Protocol, runtime_checkable, Optional, Collection, Mapping
 
 from pygraph import TreeNode, GraphNode
 
+from ..instrumentation import instrumented
 from ..exceptions.nutrients import (
     UndefinedNutrientFlagError,
     UndefinedNutrientRatioError,
@@ -10,6 +11,7 @@ from ..exceptions.nutrients import (
 )
 from ..protocols.quantities import IsQuantified
 from ..dtos.nutrients import NutrientFlagDTO, NutrientRatioDTO, NutrientMassDTO
+from .conformance import conforms
 from ..utils import sig_fig_fmt
 
 
@@ -30,6 +32,7 @@ class Nutrient(TreeNode, Protocol):
     def has_zero_calories(self) -> bool:
         return self.calories_per_gram == 0.0
 
+    @instrumented
     def __hash__(self) -> int:
         return hash(
             (
@@ -39,8 +42,9 @@ class Nutrient(TreeNode, Protocol):
             )
         )
 
+    @instrumented
     def __eq__(self, other) -> bool:
-        if not isinstance(other, Nutrient):
+        if not conforms(other, Nutrient):
             return NotImplemented
         return (
             super().__eq__(other)
@@ -83,11 +87,13 @@ class NutrientFlag(GraphNode, Protocol):
     def is_false(self) -> bool:
         return not self.value
 
+    @instrumented
     def __hash__(self):
         return hash((self.name, self.value, self.definition))
 
+    @instrumented
     def __eq__(self, other):
-        if not isinstance(other, NutrientFlag):
+        if not conforms(other, NutrientFlag):
             return NotImplemented
         return hash(self) == hash(other)
 
@@ -137,11 +143,13 @@ class NutrientRatio(Protocol):
     def __repr__(self) -> str:
         return self.__str__()
 
+    @instrumented
     def __hash__(self) -> int:
         return hash((self.nutrient, self.nutrient_perc))
 
+    @instrumented
     def __eq__(self, other) -> bool:
-        if not isinstance(other, NutrientRatio):
+        if not conforms(other, NutrientRatio):
             return NotImplemented
         return hash(self) == hash(other)
 
@@ -162,8 +170,9 @@ class NutrientAttrs(Protocol):
     def update_nutrient_ratios(self, new_ratios: NutrientRatioMap) -> None: ...
     def update_nutrient_flags(self, new_flags: NutrientFlagMap) -> None: ...
 
+    @instrumented
     def __eq__(self, other: object) -> bool:
-        if not isinstance(other, NutrientAttrs):
+        if not conforms(other, NutrientAttrs):
             return False
         return (
             self.nutrient_ratios == other.nutrient_ratios
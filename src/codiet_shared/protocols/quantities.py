@@ -3,8 +3,10 @@ from typing import Protocol, runtime_checkable, Mapping, Collection, Optional
 from enum import Enum
 from math import isclose
 
+from ..instrumentation import instrumented
 from ..exceptions.quantities import UndefinedUnitConversionError
 from ..dtos.quantities import QuantityDTO, UnitConversionDTO
+from .conformance import conforms
 
 
 class UnitType(Enum):
@@ -75,11 +77,13 @@ class Quantity(Protocol):
     def __repr__(self) -> str:
         return self.__str__()
 
+    @instrumented
     def __hash__(self) -> int:
         return hash((self.unit, self.value))
 
+    @instrumented
     def __eq__(self, other) -> bool:
-        if not isinstance(other, Quantity):
+        if not conforms(other, Quantity):
             return NotImplemented
         return hash(self) == hash(other)
 
@@ -116,10 +120,12 @@ class UnitConversion(Protocol):
 
     def to_dto(self) -> UnitConversionDTO: ...
 
+    @instrumented
     def __hash__(self) -> int:
         (u1, v1), (u2, v2) = self.canonical_unit_value_pairs
         return hash((u1, float(v1), u2, float(v2)))
 
+    @instrumented
     def __eq__(self, other) -> bool:
         if not (hasattr(other, "unit_names") and hasattr(other, "get_ratio")):
             return NotImplemented
@@ -157,6 +163,7 @@ class HasUnitConversions(Protocol):
         if not self.unit_conversion_is_defined(key=key):
             raise UndefinedUnitConversionError(key)
 
+    @instrumented
     def get_unit_conversion(self, key: UnitConversionKey) -> UnitConversion:
         self.assert_unit_conversion_defined(key)
         return self.unit_conversions[key]
@@ -1,11 +1,13 @@
 from __future__ import annotations
 from typing import Protocol, Mapping, runtime_checkable, TYPE_CHECKING
 
+from ..instrumentation import instrumented
 from .quantities import HasStandardUnit, HasUnitConversions
 from .nutrients import HasNutrientMasses
 from .tags import HasTags
 from .cost import HasCost, HasCostRatio
 from .calories import HasCalories, HasCaloriesRatio
+from .conformance import conforms
 
 if TYPE_CHECKING:
     from ..dtos.recipes import RecipeDTO, RecipeQuantityDTO
@@ -47,8 +49,9 @@ class Recipe(
     @property
     def cooking_time(self) -> int: ...
 
+    @instrumented
     def __eq__(self, other) -> bool:
-        if not isinstance(other, Recipe):
+        if not conforms(other, Recipe):
             return NotImplemented
         return hash(self) == hash(other)
 
@@ -82,6 +85,7 @@ class RecipeQuantity(HasNutrientMasses, HasCost, HasCalories, Protocol):
     @property
     def composition_ingredient_quantities(self) -> IngredientQuantityMap: ...
 
+    @instrumented
     def __hash__(self) -> int:
         return hash((self.recipe.name, self.quantity))
 
@@ -24,7 +24,13 @@ class HasTags(Protocol):
 
     def assert_has_tag(self, tag_name: str) -> None:
         if not self.has_tag(tag_name):
-            raise TagNotFoundError(tag_name)
+            # Imported here so protocols stay free of numpy until a miss.
+            from ..indexes.names import FuzzyNameIndex
+
+            names = FuzzyNameIndex.from_names(self.tags)
+            raise TagNotFoundError(
+                tag_name, suggestions=names.get_suggestions(tag_name)
+            )
 
     def get_tag(self, tag_name: str) -> Tag:
         self.assert_has_tag(tag_name)
@@ -1,6 +1,13 @@
 from __future__ import annotations
+from typing import Any, Callable, Mapping, Sequence
+import importlib
+import sys
 import zlib
 
+from .instrumentation import instrumented
+
+
+@instrumented
 def sig_fig_fmt(val: float, sig_figs: int = 4) -> float:
     if val == 0:
         return 0.0
@@ -9,3 +16,30 @@ def sig_fig_fmt(val: float, sig_figs: int = 4) -> float:
 
 def create_pseudo_uid(value: str) -> int:
     return int(zlib.crc32(value.encode("utf-8")) & 0x7FFFFFFF)
+
+
+def lazy_exports(
+    package: str, exports: Mapping[str, Sequence[str]]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]], list[str]]:
+    """Return `__getattr__`, `__dir__` and `__all__` for a lazy package.
+
+    `exports` maps each submodule to its public names. A name (or submodule)
+    is imported on first attribute access (PEP 562) and then set on the
+    package, so later lookups are ordinary attribute reads.
+    """
+    owners = {name: module for module, names in exports.items() for name in names}
+
+    def __getattr__(name: str) -> Any:
+        if name in exports:
+            return importlib.import_module(f"{package}.{name}")
+        module = owners.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f"{package}.{module}"), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*vars(sys.modules[package]), *owners})
+
+    return __getattr__, __dir__, list(owners)